@@ -41,6 +41,7 @@ class Translator {
     ];
     this.fallbackLanguage = 'en';
     this.loadingPromises = new Map();
+    this.bundleManifestPromise = null;
   }
 
   /**
@@ -48,6 +49,20 @@ class Translator {
    */
   async init() {
     console.log('Translator initializing...');
+
+    // Pages written by localization/prerender.py already contain the translated text.
+    // The URL picked the language, so the visitor's stored choice is left as it is
+    const prerenderedLanguage = document.documentElement.getAttribute('data-prerendered-lang');
+    if (prerenderedLanguage) {
+      const translation = await this.loadLanguage(prerenderedLanguage);
+      this.currentLanguage = prerenderedLanguage;
+      this.updateLanguageSelector(prerenderedLanguage);
+      this.updateTypedText(translation);
+      this.renderLanguageSelector();
+      console.log('Translator initialization complete (pre-rendered:', prerenderedLanguage + ')');
+      return;
+    }
+
     const savedLanguage = localStorage.getItem('language') || this.fallbackLanguage;
     console.log('Saved language:', savedLanguage);
     await this.setLanguage(savedLanguage);
@@ -91,14 +106,39 @@ class Translator {
     }
   }
 
+  /**
+   * Load the bundle manifest written by localization/bundle_locales.py (once)
+   */
+  loadBundleManifest() {
+    if (!this.bundleManifestPromise) {
+      const basePath = window.translatorBasePath || '';
+      // The manifest is tiny and must always be revalidated; the bundles it points to are immutable
+      this.bundleManifestPromise = fetch(basePath + 'assets/js/i18n/dist/manifest.json', { cache: 'no-cache' })
+        .then(response => (response.ok ? response.json() : {}))
+        .catch(() => ({}));
+    }
+    return this.bundleManifestPromise;
+  }
+
+  /**
+   * Resolve the URL of a language file: the content-hashed bundle if available, else the raw locale
+   */
+  async getLanguageFileUrl(langCode) {
+    const basePath = window.translatorBasePath || '';
+    const manifest = await this.loadBundleManifest();
+    if (manifest[langCode] && manifest[langCode].file) {
+      return basePath + `assets/js/i18n/dist/${manifest[langCode].file}`;
+    }
+    return basePath + `assets/js/i18n/locales/${langCode}.json`;
+  }
+
   /**
    * Fetch language file from server
    */
   async fetchLanguageFile(langCode) {
     try {
       // Use absolute path if available, fallback to relative path
-      const basePath = window.translatorBasePath || '';
-      const localeUrl = basePath + `assets/js/i18n/locales/${langCode}.json`;
+      const localeUrl = await this.getLanguageFileUrl(langCode);
       
       console.log(`Attempting to fetch: ${localeUrl}`);
       const response = await fetch(localeUrl);
@@ -439,6 +479,16 @@ class Translator {
     }
   }
 
+  /**
+   * URL of the current page in another language: its pre-rendered copy, or the root page for English
+   */
+  getLanguageUrl(langCode) {
+    const basePath = window.translatorBasePath || '';
+    const page = window.location.pathname.split('/').pop();
+    const directory = langCode === this.fallbackLanguage ? '' : `${langCode}/`;
+    return basePath + directory + page + window.location.search + window.location.hash;
+  }
+
   /**
    * Apply translations to DOM elements
    */
@@ -590,14 +640,13 @@ class Translator {
     dropdown.value = this.currentLanguage;
     
     // Add change event listener
-    dropdown.addEventListener('change', async (e) => {
+    dropdown.addEventListener('change', (e) => {
       e.preventDefault();
       const selectedLang = e.target.value;
       console.log('Language dropdown changed to:', selectedLang);
-      const success = await this.setLanguage(selectedLang);
-      if (success) {
-        console.log('Language changed successfully to:', selectedLang);
-      }
+      localStorage.setItem('language', selectedLang);
+      // Load the pre-rendered page of the new language instead of rewriting this one
+      window.location.assign(this.getLanguageUrl(selectedLang));
     });
     
     // Clear existing content and add new elements
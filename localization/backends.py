@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Translation and review backends
+
+Every provider implements the same three calls:
+
+    translate(text, source, target, timeout_ms)        -> str
+    translate_batch(texts, source, target, timeout_ms) -> [str]
+    review(translations, prompt, system_prompt, model) -> {key: value}
+
+plus review_stream(), which yields the reviewed (key, value) fields as
+they arrive (backends without streaming yield review() in one go), and
+get_backend() hands out one shared instance per backend and process,
+so the SDK client (and its keep-alive connection pool) is built once and
+reused by every thread.
+
+Backends:
+    lara    Lara SDK (LARA_ACCESS_KEY_ID / LARA_ACCESS_KEY_SECRET)
+    openai  OpenAI chat completions (OPENAI_API_KEY). Reviews are streamed
+            and parsed incrementally, with structured output (a JSON
+            schema of the requested keys) or JSON mode where the model
+            supports it.
+    local   Deterministic offline stand-in with configurable latency and
+            injected failures, for developing and measuring without
+            credentials or network. Configured with keyword arguments or
+            LOCAL_BACKEND_LATENCY_MS, LOCAL_BACKEND_SEGMENT_MS,
+            LOCAL_BACKEND_ERROR_RATE, LOCAL_BACKEND_THROTTLE_RATE,
+            LOCAL_BACKEND_RATE_LIMIT and LOCAL_BACKEND_SEED.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+TEMPERATURE = 0.1
+
+# Model name prefixes that accept a strict JSON schema, or at least JSON mode, as response_format
+STRUCTURED_OUTPUT_MODELS = ("gpt-4o", "gpt-4.1", "o1", "o3", "o4")
+JSON_MODE_MODELS = ("gpt-4-turbo", "gpt-3.5-turbo")
+# Larger payloads fall back to JSON mode instead of a schema with one property per key
+MAX_SCHEMA_PROPERTIES = 100
+
+
+def parse_json_response(content):
+    """Parse a JSON object from a chat response, with or without a ```json fence"""
+    content = content.strip()
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    return json.loads(content)
+
+
+class JSONObjectStream:
+    """
+    Incremental parser for a JSON object that arrives in pieces: feed() returns every
+    top-level (key, value) member completed by the new text, so fields can be used
+    before the response ends. Text before the opening brace (e.g. a ```json fence)
+    and after the closing one is ignored; malformed members are skipped and counted
+    in `invalid`, and `done` tells whether the object was closed.
+    """
+
+    def __init__(self):
+        self.done = False
+        self.invalid = 0
+        self._member = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        members = []
+        for char in text:
+            if self.done:
+                break
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+                    self._finish(members)
+                    continue
+            elif char == "," and self._depth == 1:
+                self._finish(members)
+                continue
+            self._member.append(char)
+        return members
+
+    def _finish(self, members):
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return
+        try:
+            member = json.loads("{" + text + "}")
+        except ValueError:
+            member = None
+        if isinstance(member, dict) and len(member) == 1:
+            members.extend(member.items())
+        else:
+            self.invalid += 1
+
+
+def review_response_format(model, translations):
+    """
+    response_format for a review: a strict schema requiring every key with the shape of
+    its current value where the model supports structured output, else JSON mode, else None
+    """
+    if model.startswith(STRUCTURED_OUTPUT_MODELS) and len(translations) <= MAX_SCHEMA_PROPERTIES:
+        properties = {}
+        for key, value in translations.items():
+            if isinstance(value, str):
+                properties[key] = {"type": "string"}
+            elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+                properties[key] = {"type": "array", "items": {"type": "string"}}
+            else:
+                break
+        else:
+            return {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "review",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": properties,
+                        "required": list(properties),
+                        "additionalProperties": False,
+                    },
+                },
+            }
+    if model.startswith(STRUCTURED_OUTPUT_MODELS + JSON_MODE_MODELS):
+        return {"type": "json_object"}
+    return None
+
+
+class Backend:
+    """Interface shared by all backends"""
+
+    name = None
+
+    def translate(self, text, source, target, timeout_ms=5000):
+        return self.translate_batch([text], source, target, timeout_ms=timeout_ms)[0]
+
+    def translate_batch(self, texts, source, target, timeout_ms=5000):
+        raise NotImplementedError(f"{self.name} backend cannot translate")
+
+    def review(self, translations, prompt, system_prompt, model):
+        raise NotImplementedError(f"{self.name} backend cannot review")
+
+    def review_stream(self, translations, prompt, system_prompt, model):
+        """Yield reviewed (key, value) fields as they arrive"""
+        yield from self.review(translations, prompt, system_prompt, model).items()
+
+
+class LaraBackend(Backend):
+    """Lara SDK; one Translator per process"""
+
+    name = "lara"
+
+    def __init__(self):
+        # Imported lazily so modules that only import helpers never pay for the SDK
+        from lara_sdk import Credentials, Translator
+
+        access_key_id = os.getenv("LARA_ACCESS_KEY_ID")
+        access_key_secret = os.getenv("LARA_ACCESS_KEY_SECRET")
+
+        if not access_key_id or not access_key_secret:
+            raise ValueError("Please set LARA_ACCESS_KEY_ID and LARA_ACCESS_KEY_SECRET")
+
+        credentials = Credentials(access_key_id=access_key_id, access_key_secret=access_key_secret)
+        self.client = Translator(credentials)
+
+    def _translate(self, content, source, target, timeout_ms):
+        return self.client.translate(
+            content,
+            source=source,
+            target=target,
+            content_type='text/plain',
+            timeout_ms=timeout_ms,
+            use_cache=False
+        ).translation
+
+    def translate(self, text, source, target, timeout_ms=5000):
+        return self._translate(text, source, target, timeout_ms)
+
+    def translate_batch(self, texts, source, target, timeout_ms=5000):
+        translations = self._translate(list(texts), source, target, timeout_ms)
+        if isinstance(translations, str):
+            translations = [translations]
+        translations = [getattr(item, "text", item) for item in translations]
+
+        if len(translations) != len(texts):
+            raise ValueError(f"expected {len(texts)} segments, got {len(translations)}")
+        return translations
+
+
+class OpenAIBackend(Backend):
+    """OpenAI chat completions; one client (and connection pool) per process"""
+
+    name = "openai"
+    translate_model = "gpt-4o-mini"
+
+    def __init__(self):
+        # Imported lazily: the SDK is slow to import and only needed for actual requests
+        from openai import OpenAI
+
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("Please set OPENAI_API_KEY")
+        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+
+    def _request(self, system_prompt, prompt, model, timeout_ms=None, response_format=None):
+        request = dict(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=TEMPERATURE
+        )
+        if timeout_ms:
+            request["timeout"] = timeout_ms / 1000
+        if response_format:
+            request["response_format"] = response_format
+        return request
+
+    def complete(self, system_prompt, prompt, model, timeout_ms=None, response_format=None):
+        response = self.client.chat.completions.create(
+            **self._request(system_prompt, prompt, model, timeout_ms, response_format))
+        return response.choices[0].message.content
+
+    def stream(self, system_prompt, prompt, model, timeout_ms=None, response_format=None):
+        """Yield the text of a chat completion as it is generated"""
+        request = self._request(system_prompt, prompt, model, timeout_ms, response_format)
+        for chunk in self.client.chat.completions.create(stream=True, **request):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def translate_batch(self, texts, source, target, timeout_ms=5000):
+        segments = {str(i): text for i, text in enumerate(texts)}
+        prompt = f"""Translate every value of this JSON object from {source} to {target}.
+Keep the keys, any HTML markup and placeholders such as {{count}} unchanged. Return ONLY the JSON:
+
+{json.dumps(segments, ensure_ascii=False, indent=2)}
+"""
+        content = self.complete("You are an expert translator. Return only JSON.", prompt,
+                                self.translate_model, timeout_ms=timeout_ms)
+        translated = parse_json_response(content)
+
+        missing = [key for key in segments if not isinstance(translated.get(key), str)]
+        if missing:
+            raise ValueError(f"expected {len(texts)} segments, {len(missing)} missing")
+        return [translated[key] for key in segments]
+
+    def review(self, translations, prompt, system_prompt, model):
+        return dict(self.review_stream(translations, prompt, system_prompt, model))
+
+    def review_stream(self, translations, prompt, system_prompt, model):
+        parser = JSONObjectStream()
+        for text in self.stream(system_prompt, prompt, model,
+                                response_format=review_response_format(model, translations)):
+            yield from parser.feed(text)
+
+
+class LocalBackendError(Exception):
+    """Injected failure of the local backend, shaped like an SDK HTTP error"""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LocalBackend(Backend):
+    """
+    Deterministic offline backend. "Translations" are the source text tagged
+    with the target language; reviews return their input unchanged. Each call
+    sleeps latency_ms plus segment_ms per segment, and fails with a 503 or a 429
+    at the given rates (drawn from a seeded generator, so runs are repeatable).
+    With a `rate_limit`, requests beyond that many per second are answered
+    with a 429, like a provider enforcing a quota.
+    """
+
+    name = "local"
+
+    def __init__(self, latency_ms=0.0, segment_ms=0.0, error_rate=0.0, throttle_rate=0.0, rate_limit=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.segment_ms = segment_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._window = []  # start times of the requests admitted in the last second
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            latency_ms=float(os.getenv("LOCAL_BACKEND_LATENCY_MS", "0")),
+            segment_ms=float(os.getenv("LOCAL_BACKEND_SEGMENT_MS", "0")),
+            error_rate=float(os.getenv("LOCAL_BACKEND_ERROR_RATE", "0")),
+            throttle_rate=float(os.getenv("LOCAL_BACKEND_THROTTLE_RATE", "0")),
+            rate_limit=float(os.getenv("LOCAL_BACKEND_RATE_LIMIT", "0")),
+            seed=int(os.getenv("LOCAL_BACKEND_SEED", "0")),
+        )
+
+    def _over_quota(self):
+        """Sliding one-second window; call with the lock held"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        self._window = [started for started in self._window if now - started < 1.0]
+        if len(self._window) >= self.rate_limit:
+            return True
+        self._window.append(now)
+        return False
+
+    def _request(self, segments):
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            over_quota = self._over_quota()
+
+        if over_quota:
+            raise LocalBackendError(429, "Rate limit exceeded (injected)")
+
+        delay = self.latency_ms + self.segment_ms * segments
+        if delay:
+            time.sleep(delay / 1000)
+
+        if roll < self.throttle_rate:
+            raise LocalBackendError(429, "Too many requests (injected)")
+        if roll < self.throttle_rate + self.error_rate:
+            raise LocalBackendError(503, "Service unavailable (injected)")
+
+    def translate_batch(self, texts, source, target, timeout_ms=5000):
+        self._request(len(texts))
+        return [f"[{target}] {text}" for text in texts]
+
+    def review(self, translations, prompt, system_prompt, model):
+        self._request(len(translations))
+        return dict(translations)
+
+
+BACKENDS = {
+    "lara": LaraBackend,
+    "openai": OpenAIBackend,
+    "local": LocalBackend.from_env,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name):
+    """Return the shared instance of a backend, creating it on first use"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name} (choose from {', '.join(BACKENDS)})")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
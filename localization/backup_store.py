@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Content-addressed backups of the locale files
+
+Every merge run records the locale files it is about to change as one
+backup run. File contents are stored once, gzip-compressed, under their
+sha256 (localization/backups/objects/ab/abcd….json.gz), so a language
+that did not change since the previous run costs nothing but an index
+entry. localization/backups/index.json lists the runs:
+
+    {"runs": [{"id": "20250531_101500", "created_at": "...", "note": "merge",
+               "languages": {"it": "<sha256>", ...}}, ...]}
+
+Old runs are pruned by count and/or age, and blobs no run references
+any more are deleted. Any language can be rolled back to the content it
+had in any run; the current content is backed up first, so a rollback
+can itself be undone.
+
+Usage:
+    python backup_store.py --list
+    python backup_store.py --list --lang it
+    python backup_store.py --rollback it                    # to the most recent different version
+    python backup_store.py --rollback it --run 20250531_101500
+    python backup_store.py --prune --keep-runs 20 --keep-days 90
+    python backup_store.py --import-legacy                  # move old <lang>_<timestamp>.json copies in
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from file_utils import atomic_write_json, atomic_write_text
+from path_utils import get_locales_dir, get_localization_dir
+
+INDEX_NAME = "index.json"
+OBJECTS_DIR = "objects"
+RUN_ID_FORMAT = "%Y%m%d_%H%M%S"
+DEFAULT_KEEP_RUNS = 50
+LEGACY_BACKUP = re.compile(r"^(?P<lang>[a-z]{2,3}(?:-[A-Za-z]+)?)_(?P<timestamp>\d{8}_\d{6})\.json$")
+
+
+def get_backups_dir():
+    """Get the absolute path to the backup store"""
+    return get_localization_dir() / "backups"
+
+
+def blob_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class BackupRun:
+    """
+    Locale files backed up by one merge run. Thread-safe; each add() is recorded
+    in the index right away, so a file is never rewritten before its backup is listed.
+    A run that never backed anything up leaves no trace.
+    """
+
+    def __init__(self, store, note=None):
+        self.store = store
+        self.note = note
+        self.created_at = datetime.now()
+        self.id = None
+        self.languages = {}
+        self._lock = threading.Lock()
+
+    def add(self, lang, file_path):
+        """Store the current content of a locale file; returns its hash"""
+        digest = self.store.put_blob(Path(file_path).read_bytes())
+        with self._lock:
+            self.languages[lang] = digest
+            self.id = self.store.save_run(self.id, self.created_at, dict(sorted(self.languages.items())), self.note)
+        return digest
+
+
+class BackupStore:
+    """Deduplicated, gzip-compressed locale snapshots grouped into runs"""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else get_backups_dir()
+        self.objects_dir = self.root / OBJECTS_DIR
+        self.index_path = self.root / INDEX_NAME
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.json.gz"
+
+    def put_blob(self, data):
+        """Store bytes under their hash (a no-op if already stored); returns the hash"""
+        digest = blob_hash(data)
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # mtime=0 keeps identical content byte-identical on disk
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            tmp_path = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(compressed)
+            tmp_path.replace(path)
+        return digest
+
+    def get_blob(self, digest):
+        return gzip.decompress(self._object_path(digest).read_bytes())
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"runs": []}
+
+    def runs(self, lang=None):
+        """Runs oldest first; with `lang`, only runs that backed up that language"""
+        runs = self.load_index()["runs"]
+        return [run for run in runs if lang is None or lang in run["languages"]]
+
+    def begin_run(self, note=None):
+        return BackupRun(self, note)
+
+    def save_run(self, run_id, created_at, languages, note=None):
+        """Add a run to the index (run_id None) or replace its languages; returns its id"""
+        with self._lock:
+            index = self.load_index()
+            runs = [run for run in index["runs"] if run["id"] != run_id]
+
+            if run_id is None:
+                ids = {run["id"] for run in runs}
+                run_id = base_id = created_at.strftime(RUN_ID_FORMAT)
+                suffix = 2
+                while run_id in ids:
+                    run_id = f"{base_id}_{suffix}"
+                    suffix += 1
+
+            runs.append({
+                "id": run_id,
+                "created_at": created_at.isoformat(timespec="seconds"),
+                "note": note,
+                "languages": languages,
+            })
+            index["runs"] = sorted(runs, key=lambda run: (run["created_at"], run["id"]))
+            atomic_write_json(index, self.index_path)
+            return run_id
+
+    def prune(self, keep_runs=DEFAULT_KEEP_RUNS, keep_days=None):
+        """
+        Drop runs beyond the newest `keep_runs` and runs older than `keep_days`,
+        then delete blobs no remaining run references. Returns (runs removed, blobs removed).
+        """
+        with self._lock:
+            index = self.load_index()
+            runs = index["runs"]
+            kept = runs[-keep_runs:] if keep_runs else list(runs)
+            if keep_days is not None:
+                cutoff = datetime.now() - timedelta(days=keep_days)
+                kept = [run for run in kept if datetime.fromisoformat(run["created_at"]) >= cutoff]
+
+            removed_runs = len(runs) - len(kept)
+            if removed_runs:
+                index["runs"] = kept
+                atomic_write_json(index, self.index_path)
+
+            referenced = {digest for run in kept for digest in run["languages"].values()}
+            removed_blobs = 0
+            for path in self.objects_dir.glob("*/*.json.gz"):
+                if path.name.removesuffix(".json.gz") not in referenced:
+                    path.unlink()
+                    removed_blobs += 1
+
+        return removed_runs, removed_blobs
+
+    def find_version(self, lang, run_id=None, current=None):
+        """
+        The run to roll `lang` back to: `run_id`, or else the most recent run whose
+        content differs from `current` (bytes). Returns the run, or None.
+        """
+        runs = self.runs(lang)
+        if run_id is not None:
+            return next((run for run in runs if run["id"] == run_id), None)
+
+        current_hash = blob_hash(current) if current is not None else None
+        return next((run for run in reversed(runs) if run["languages"][lang] != current_hash), None)
+
+    def rollback(self, lang, run_id=None, locales_dir=None):
+        """
+        Restore a locale file to its content in a run (see find_version).
+        The current file is backed up first. Returns the run restored from, or None.
+        """
+        locale_file = (locales_dir or get_locales_dir()) / f"{lang}.json"
+        current = locale_file.read_bytes() if locale_file.exists() else None
+        run = self.find_version(lang, run_id, current)
+        if run is None:
+            return None
+
+        if current is not None:
+            self.begin_run(note=f"before rollback of {lang} to {run['id']}").add(lang, locale_file)
+
+        atomic_write_text(self.get_blob(run["languages"][lang]).decode("utf-8"), locale_file)
+        return run
+
+    def import_legacy(self):
+        """Move <lang>_<timestamp>.json copies from the old flat layout into the store; returns the count"""
+        grouped = {}
+        for path in sorted(self.root.glob("*.json")):
+            match = LEGACY_BACKUP.match(path.name)
+            if match:
+                grouped.setdefault(match["timestamp"], []).append((match["lang"], path))
+
+        imported = 0
+        for timestamp, files in sorted(grouped.items()):
+            languages = {lang: self.put_blob(path.read_bytes()) for lang, path in files}
+            self.save_run(None, datetime.strptime(timestamp, RUN_ID_FORMAT), dict(sorted(languages.items())), "legacy import")
+            for _, path in files:
+                path.unlink()
+            imported += len(files)
+        return imported
+
+    def size(self):
+        """(number of blobs, total compressed bytes)"""
+        blobs = list(self.objects_dir.glob("*/*.json.gz"))
+        return len(blobs), sum(path.stat().st_size for path in blobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, prune and roll back locale backups")
+    parser.add_argument("--list", action="store_true", help="List backup runs")
+    parser.add_argument("--lang", help="With --list, only runs that include this language")
+    parser.add_argument("--rollback", metavar="LANG", help="Restore a locale file from a backup run")
+    parser.add_argument("--run", help="With --rollback, the run id to restore (default: the most recent different version)")
+    parser.add_argument("--prune", action="store_true", help="Apply the retention policy and delete unreferenced blobs")
+    parser.add_argument("--keep-runs", type=int, default=DEFAULT_KEEP_RUNS, help=f"Runs to keep when pruning (default: {DEFAULT_KEEP_RUNS})")
+    parser.add_argument("--keep-days", type=float, help="When pruning, also drop runs older than this")
+    parser.add_argument("--import-legacy", action="store_true", help="Move old <lang>_<timestamp>.json backups into the store")
+
+    args = parser.parse_args()
+    store = BackupStore()
+
+    if args.import_legacy:
+        print(f"📥 Imported {store.import_legacy()} legacy backups")
+
+    if args.rollback:
+        run = store.rollback(args.rollback, args.run)
+        if run is None:
+            print(f"❌ No backup of {args.rollback} to roll back to" + (f" in run {args.run}" if args.run else ""))
+            sys.exit(1)
+        print(f"⏪ Restored {args.rollback}.json from run {run['id']} ({run['created_at']})")
+
+    if args.prune:
+        removed_runs, removed_blobs = store.prune(args.keep_runs, args.keep_days)
+        print(f"🧹 Removed {removed_runs} runs and {removed_blobs} unreferenced blobs")
+
+    if args.list or not (args.import_legacy or args.rollback or args.prune):
+        runs = store.runs(args.lang)
+        for run in runs:
+            note = f"  ({run['note']})" if run.get("note") else ""
+            print(f"  {run['id']}  {len(run['languages'])} languages: {', '.join(run['languages'])}{note}")
+        blobs, size = store.size()
+        print(f"📋 {len(runs)} runs, {blobs} stored versions ({size / 1024:.0f} KiB) in {store.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Pack translation segments into multi-segment provider requests"""
+
+from collections import namedtuple
+
+from translation_memory import normalize_text
+
+# Keys whose values are kept verbatim in every language
+PRESERVED_KEYS = {"multilingual-typed"}
+
+# One translatable string: `index` is None for plain string values,
+# or the position inside a list value
+Segment = namedtuple("Segment", ["key", "index", "text"])
+
+
+def flatten_segments(items):
+    """Turn {key: value} into a flat list of translatable string segments"""
+    segments = []
+
+    for key, value in items.items():
+        if key in PRESERVED_KEYS:
+            continue
+
+        if isinstance(value, str):
+            segments.append(Segment(key, None, value))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, str):
+                    segments.append(Segment(key, index, item))
+
+    return segments
+
+
+def dedupe_segments(segments):
+    """
+    Collapse segments whose normalized text is identical.
+    Returns (unique, copies): `unique` keeps the first segment for each text,
+    in order, and `copies` maps each of those to the later segments that
+    reuse its translation.
+    """
+    first = {}
+    unique = []
+    copies = {}
+
+    for segment in segments:
+        text = normalize_text(segment.text)
+        if text in first:
+            copies.setdefault(first[text], []).append(segment)
+        else:
+            first[text] = segment
+            unique.append(segment)
+
+    return unique, copies
+
+
+def pack_batches(segments, max_segments=50, max_chars=4000):
+    """
+    Group segments into batches of at most `max_segments` segments and
+    `max_chars` characters. A single segment longer than the character
+    budget still gets a batch of its own.
+    """
+    batches = []
+    current = []
+    current_chars = 0
+
+    for segment in segments:
+        size = len(segment.text)
+        if current and (len(current) >= max_segments or current_chars + size > max_chars):
+            batches.append(current)
+            current = []
+            current_chars = 0
+
+        current.append(segment)
+        current_chars += size
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def rebuild_content(items, translations):
+    """
+    Map translated segments back onto {key: value}.
+    `translations` is {(key, index): text}; anything not in it keeps its source value.
+    """
+    rebuilt = {}
+
+    for key, value in items.items():
+        if isinstance(value, str):
+            rebuilt[key] = translations.get((key, None), value)
+        elif isinstance(value, list):
+            rebuilt[key] = [translations.get((key, index), item) for index, item in enumerate(value)]
+        else:
+            rebuilt[key] = value
+
+    return rebuilt
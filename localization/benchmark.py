@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks of the localization scripts
+
+Runs the real entry points (translate_website.py, review_with_gpt.py and
+run_all.py) as separate processes against the local backend (see
+backends.py), sweeping the number of source keys and target languages.
+Each sweep point gets a throwaway copy of the project: a synthetic en.json
+with the requested number of keys (the real keys first, then numbered
+variants of the real strings), the site pages, translator.js and these
+scripts, so nothing in the repository is touched.
+
+For every (entry point, keys, languages) run it records wall time,
+provider requests per second, p50/p95/p99 provider call latency and peak
+RSS, and writes them to localization/benchmarks/<commit>.json. Pass an
+earlier results file with --compare to see the deltas; with
+--max-regression the run exits 1 when any wall time got slower than that.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --keys 100,1000 --languages 1,8 --entry-points translate
+    python benchmark.py --latency-ms 80 --segment-ms 1 --throttle-rate 0.05 --rate-limit 20
+    python benchmark.py --compare benchmarks/1a2b3c4d5e6f.json --max-regression 0.2
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import IMPORTANT_FIELDS
+from path_utils import get_locales_dir, get_localization_dir, get_project_root
+from prerender import PAGES, SOURCE_LANGUAGE
+from telemetry import percentile
+
+DEFAULT_KEYS = "100,1000,10000"
+DEFAULT_LANGUAGES = "1,8,31"
+ENTRY_POINTS = ("translate", "run_all", "review")
+STATS_ENV = "BENCHMARK_STATS_FILE"
+
+
+def synthetic_source(source, count):
+    """First `count` keys: IMPORTANT_FIELDS, the other real keys, then numbered variants of real strings"""
+    ordered = [key for key in IMPORTANT_FIELDS if key in source]
+    ordered += [key for key in source if key not in ordered]
+
+    result = {key: source[key] for key in ordered[:count]}
+    strings = [value for value in source.values() if isinstance(value, str)]
+    index = 0
+    while len(result) < count:
+        result[f"bench-{index}"] = f"{strings[index % len(strings)]} ({index})"
+        index += 1
+    return result
+
+
+def target_languages(count):
+    """The first `count` site languages other than the source"""
+    languages = sorted(path.stem for path in get_locales_dir().glob("*.json") if path.stem != SOURCE_LANGUAGE)
+    if count > len(languages):
+        raise ValueError(f"Only {len(languages)} target languages are available, {count} requested")
+    return languages[:count]
+
+
+def prepare_workspace(workspace, keys, languages):
+    """Lay out a minimal copy of the project with a synthetic source locale"""
+    root = get_project_root()
+    localization_dir = workspace / "localization"
+    locales_dir = workspace / "assets" / "js" / "i18n" / "locales"
+    localization_dir.mkdir(parents=True)
+    locales_dir.mkdir(parents=True)
+
+    for script in get_localization_dir().glob("*.py"):
+        shutil.copy2(script, localization_dir / script.name)
+    for page in PAGES:
+        if (root / page).exists():
+            shutil.copy2(root / page, workspace / page)
+    shutil.copy2(root / "assets" / "js" / "i18n" / "translator.js", workspace / "assets" / "js" / "i18n" / "translator.js")
+
+    with open(get_locales_dir() / f"{SOURCE_LANGUAGE}.json", 'r', encoding='utf-8') as f:
+        source = synthetic_source(json.load(f), keys)
+    write_json(source, locales_dir / f"{SOURCE_LANGUAGE}.json")
+
+    # Existing target locales, so review and run_all do not depend on a translate run
+    for lang in languages:
+        write_json({key: f"[{lang}] {value}" if isinstance(value, str) else value for key, value in source.items()},
+                   locales_dir / f"{lang}.json")
+
+    subprocess.run([sys.executable, "extract_fields.py"], cwd=localization_dir,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return localization_dir
+
+
+def write_json(data, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def entry_point_command(entry_point, languages, workers, rate):
+    """Script and arguments for one entry point, always on the local backend"""
+    langs = ",".join(languages)
+    if entry_point == "translate":
+        return ["translate_website.py", "--backend", "local", "--languages", langs,
+                "--workers", str(workers), "--rate", str(rate), "--no-cache"]
+    if entry_point == "review":
+        return ["review_with_gpt.py", langs, "--backend", "local", "--workers", str(workers), "--no-cache"]
+    if entry_point == "run_all":
+        return ["run_all.py", langs, "--backend", "local", "--workers", str(workers), "--force", "--no-cache"]
+    raise ValueError(f"Unknown entry point: {entry_point} (choose from {', '.join(ENTRY_POINTS)})")
+
+
+def run_entry_point(localization_dir, entry_point, languages, workers, rate, backend_env):
+    """Run one entry point in a child process; returns its measurements"""
+    script, *arguments = entry_point_command(entry_point, languages, workers, rate)
+    stats_file = localization_dir / f".benchmark_{entry_point}.json"
+    log_file = localization_dir / f"benchmark_{entry_point}.log"
+    env = dict(os.environ, **backend_env, **{STATS_ENV: str(stats_file)})
+
+    with open(log_file, 'w', encoding='utf-8') as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "benchmark.py", "--child", script, *arguments],
+            cwd=localization_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        # wait4 reports the peak RSS of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    try:
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+    except FileNotFoundError:
+        stats = {"latencies_ms": [], "requests": 0}
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    latencies = stats["latencies_ms"]
+
+    result = {
+        "exit_code": process.returncode,
+        "wall_s": round(wall, 3),
+        "requests": stats["requests"],
+        "requests_per_s": round(stats["requests"] / wall, 2) if wall else None,
+        "latency_ms": {
+            name: round(value, 2) if value is not None else None
+            for name, value in (("p50", percentile(latencies, 0.50)),
+                                ("p95", percentile(latencies, 0.95)),
+                                ("p99", percentile(latencies, 0.99)))
+        },
+        "peak_rss_mb": round(peak_rss / 2 ** 20, 1),
+    }
+    if process.returncode:
+        with open(log_file, 'r', encoding='utf-8') as f:
+            result["log_tail"] = f.read().splitlines()[-10:]
+    return result
+
+
+def child_main(script, arguments):
+    """
+    Inside the child: time every call into the shared local backend,
+    then run the entry point exactly as `python <script> ...` would.
+    """
+    import backends
+
+    backend = backends.get_backend("local")
+    latencies = []
+    lock = threading.Lock()
+
+    def timed(fn):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+        return wrapper
+
+    backend.translate_batch = timed(backend.translate_batch)
+    backend.review = timed(backend.review)
+
+    def dump():
+        with lock:
+            write_json({"latencies_ms": latencies, "requests": backend.requests}, os.environ[STATS_ENV])
+
+    atexit.register(dump)
+    sys.argv = [script, *arguments]
+    runpy.run_path(script, run_name="__main__")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=get_project_root(), capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_key(result):
+    return (result["entry_point"], result["keys"], result["languages"])
+
+
+def compare_results(results, baseline, max_regression=None):
+    """Print wall time and throughput deltas against a baseline; returns the regressed runs"""
+    previous = {run_key(result): result for result in baseline["results"]}
+    regressions = []
+
+    print(f"\n📊 Compared with {(baseline.get('commit') or 'unknown')[:12]}:")
+    for result in results:
+        before = previous.get(run_key(result))
+        if before is None or not before["wall_s"]:
+            continue
+        change = result["wall_s"] / before["wall_s"] - 1
+        regressed = max_regression is not None and change > max_regression
+        if regressed:
+            regressions.append(result)
+        print(f"  {'❌' if regressed else '  '} {result['entry_point']:<9} {result['keys']:>6} keys "
+              f"{result['languages']:>2} langs: {before['wall_s']:.2f}s → {result['wall_s']:.2f}s ({change:+.0%}), "
+              f"{before['requests_per_s']} → {result['requests_per_s']} req/s")
+    return regressions
+
+
+def parse_counts(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child_main(sys.argv[2], sys.argv[3:])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the localization scripts against the local backend")
+    parser.add_argument("--keys", default=DEFAULT_KEYS, help=f"Comma-separated source key counts (default: {DEFAULT_KEYS})")
+    parser.add_argument("--languages", default=DEFAULT_LANGUAGES, help=f"Comma-separated target language counts (default: {DEFAULT_LANGUAGES})")
+    parser.add_argument("--entry-points", default=",".join(ENTRY_POINTS), help=f"Comma-separated entry points (default: {','.join(ENTRY_POINTS)})")
+    parser.add_argument("--workers", type=int, default=8, help="--workers passed to every entry point (default: 8)")
+    parser.add_argument("--rate", type=float, default=0, help="Client-side --rate for translate_website.py (default: 0 = unlimited)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Simulated latency per request (default: 20)")
+    parser.add_argument("--segment-ms", type=float, default=0.2, help="Simulated latency per segment (default: 0.2)")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests failing with a 503 (default: 0)")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of requests failing with a 429 (default: 0)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Provider quota in requests per second (default: 0 = none)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected failures (default: 0)")
+    parser.add_argument("--output", help="Results file (default: localization/benchmarks/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, help="With --compare, exit 1 if any wall time grew by more than this fraction")
+
+    args = parser.parse_args()
+
+    entry_points = [name.strip() for name in args.entry_points.split(',') if name.strip()]
+    unknown = [name for name in entry_points if name not in ENTRY_POINTS]
+    if unknown:
+        print(f"❌ Unknown entry points: {', '.join(unknown)} (choose from {', '.join(ENTRY_POINTS)})")
+        sys.exit(1)
+
+    backend_env = {
+        "LOCAL_BACKEND_LATENCY_MS": str(args.latency_ms),
+        "LOCAL_BACKEND_SEGMENT_MS": str(args.segment_ms),
+        "LOCAL_BACKEND_ERROR_RATE": str(args.error_rate),
+        "LOCAL_BACKEND_THROTTLE_RATE": str(args.throttle_rate),
+        "LOCAL_BACKEND_RATE_LIMIT": str(args.rate_limit),
+        "LOCAL_BACKEND_SEED": str(args.seed),
+    }
+
+    print("⏱️  Localization benchmark")
+    print(f"Backend: local ({args.latency_ms} ms + {args.segment_ms} ms/segment, "
+          f"{args.error_rate:.0%} errors, {args.throttle_rate:.0%} throttled, quota {args.rate_limit or 'none'} req/s)")
+
+    results = []
+    for key_count in parse_counts(args.keys):
+        for language_count in parse_counts(args.languages):
+            languages = target_languages(language_count)
+            with tempfile.TemporaryDirectory(prefix="l10n-bench-") as workspace:
+                localization_dir = prepare_workspace(Path(workspace), key_count, languages)
+                for entry_point in entry_points:
+                    result = {"entry_point": entry_point, "keys": key_count, "languages": language_count}
+                    result.update(run_entry_point(localization_dir, entry_point, languages,
+                                                  args.workers, args.rate, backend_env))
+                    results.append(result)
+
+                    latency = result["latency_ms"]
+                    status = "✅" if result["exit_code"] == 0 else f"❌ exit {result['exit_code']}"
+                    print(f"  {status} {entry_point:<9} {key_count:>6} keys {language_count:>2} langs: "
+                          f"{result['wall_s']:.2f}s, {result['requests']} requests ({result['requests_per_s']} req/s), "
+                          f"p50/p95/p99 {latency['p50']}/{latency['p95']}/{latency['p99']} ms, "
+                          f"{result['peak_rss_mb']} MB peak")
+                    for line in result.get("log_tail", []):
+                        print(f"      {line}")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "workers": args.workers,
+            "rate": args.rate,
+            "latency_ms": args.latency_ms,
+            "segment_ms": args.segment_ms,
+            "error_rate": args.error_rate,
+            "throttle_rate": args.throttle_rate,
+            "rate_limit": args.rate_limit,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else get_localization_dir() / "benchmarks" / f"{(commit or 'unknown')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_json(report, output)
+    print(f"\n✅ Results saved to {output}")
+
+    failed = [result for result in results if result["exit_code"]]
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare_results(results, json.load(f), args.max_regression)
+
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Minimal build-graph executor with content-hash up-to-date checks
+
+Each node declares its input and output files and the nodes it depends
+on. A node is skipped when its inputs and outputs still hash to what they
+were after its last successful run; independent nodes run in parallel.
+
+Hashes are recorded once the whole graph has finished, so a stage that
+writes back into an upstream input (merge rewriting the locale that
+extract read) does not invalidate the chain on the next run.
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from file_utils import atomic_write_json
+from path_utils import get_localization_dir
+
+STATE_NAME = ".build_state.json"
+
+
+def file_hash(path):
+    """sha256 of a file's content, or None if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class Node:
+    """One unit of work: `action()` turns `inputs` into `outputs`"""
+
+    def __init__(self, name, action, inputs=(), outputs=(), deps=()):
+        self.name = name
+        self.action = action
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.deps = list(deps)
+
+    def snapshot(self):
+        """Current content hashes of every input and output"""
+        return {str(path): file_hash(path) for path in self.inputs + self.outputs}
+
+
+class BuildGraph:
+    """Dependency graph of nodes, executed with up-to-date checks"""
+
+    def __init__(self, state_path=None):
+        self.state_path = state_path or get_localization_dir() / STATE_NAME
+        self.nodes = {}
+        self.durations = {}  # node name -> seconds its action took (nodes that ran)
+
+    def add(self, node):
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate node: {node.name}")
+        self.nodes[node.name] = node
+        return node
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _run_node(self, node):
+        started = time.perf_counter()
+        try:
+            node.action()
+        finally:
+            self.durations[node.name] = time.perf_counter() - started
+
+    def is_up_to_date(self, node, state):
+        recorded = state.get(node.name)
+        if recorded is None:
+            return False
+        current = node.snapshot()
+        return all(value is not None for value in current.values()) and current == recorded
+
+    def run(self, workers=4, force=False):
+        """
+        Execute the graph. A node runs once all its deps succeeded, if `force`
+        is set or any of its files changed since its last successful run.
+        Returns {node name: "ran" | "skipped" | "failed" | "blocked"}.
+        """
+        for node in self.nodes.values():
+            missing = [dep for dep in node.deps if dep not in self.nodes]
+            if missing:
+                raise ValueError(f"{node.name} depends on unknown nodes: {', '.join(missing)}")
+
+        state = self.load_state()
+        status = {}
+        pending = dict(self.nodes)
+
+        def ready(node):
+            return all(dep in status for dep in node.deps)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            running = {}
+
+            while pending or running:
+                # Skipped/blocked nodes can unlock others, so schedule until nothing changes
+                progress = True
+                while progress:
+                    progress = False
+                    for name, node in list(pending.items()):
+                        if not ready(node):
+                            continue
+                        del pending[name]
+                        progress = True
+
+                        if any(status[dep] in ("failed", "blocked") for dep in node.deps):
+                            status[name] = "blocked"
+                            continue
+
+                        # Deps have finished, so a dep that rewrote our inputs shows up as a hash change
+                        if not force and self.is_up_to_date(node, state):
+                            status[name] = "skipped"
+                            print(f"  ⏭️  {name} is up to date")
+                            continue
+
+                        running[executor.submit(self._run_node, node)] = node
+
+                if not running:
+                    if pending:
+                        raise ValueError(f"Dependency cycle between: {', '.join(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        future.result()
+                        status[node.name] = "ran"
+                    except Exception as e:
+                        print(f"  ❌ {node.name} failed: {e}")
+                        status[node.name] = "failed"
+                        state.pop(node.name, None)
+
+        # Record final hashes for every node that is now consistent
+        for name, result in status.items():
+            if result in ("ran", "skipped"):
+                state[name] = self.nodes[name].snapshot()
+        atomic_write_json(state, self.state_path, sort_keys=True)
+
+        return status
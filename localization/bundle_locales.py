@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Build minified, content-hashed locale bundles for translator.js
+
+For every assets/js/i18n/locales/<lang>.json this writes
+assets/js/i18n/dist/<lang>.<hash>.json plus precompressed .gz (and .br,
+if the optional `brotli` package is installed) siblings, and a
+manifest.json mapping each language to its current bundle. Because the
+filename changes whenever the content does, bundles can be cached by
+browsers forever; only the small manifest has to be revalidated.
+
+Usage:
+    python bundle_locales.py
+    python bundle_locales.py --languages "en,it,es"
+    python bundle_locales.py --live-only   # drop keys no page or script uses
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+
+from file_utils import atomic_write_json
+from key_usage import live_keys
+from locale_store import LocaleStore
+from path_utils import get_bundles_dir, get_locales_dir
+
+try:
+    import brotli
+except ImportError:  # Optional: only needed for .br siblings
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+
+
+def minify(translations):
+    """Compact JSON encoding with stable output for identical content"""
+    return json.dumps(translations, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_if_changed(file_path, data):
+    """Write bytes unless the file already holds exactly them"""
+    if file_path.exists() and file_path.read_bytes() == data:
+        return False
+    file_path.write_bytes(data)
+    return True
+
+
+def bundle_language(lang, translations, bundles_dir):
+    """Write the hashed bundle (and compressed siblings) for one language; returns its manifest entry"""
+    data = minify(translations)
+    file_name = f"{lang}.{content_hash(data)}.json"
+    bundle_file = bundles_dir / file_name
+
+    write_if_changed(bundle_file, data)
+    # mtime=0 keeps the gzip output byte-identical across runs
+    gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+    write_if_changed(bundles_dir / f"{file_name}.gz", gzipped)
+
+    entry = {"file": file_name, "bytes": len(data), "gzip_bytes": len(gzipped)}
+
+    if brotli:
+        compressed = brotli.compress(data, quality=11)
+        write_if_changed(bundles_dir / f"{file_name}.br", compressed)
+        entry["br_bytes"] = len(compressed)
+
+    return entry
+
+
+def remove_stale_bundles(bundles_dir, manifest):
+    """Delete bundles that are no longer referenced by the manifest"""
+    current = {entry["file"] for entry in manifest.values()}
+    removed = 0
+    for bundle_file in bundles_dir.glob("*.*.json*"):
+        base_name = bundle_file.name.removesuffix(".gz").removesuffix(".br")
+        if base_name not in current:
+            bundle_file.unlink()
+            removed += 1
+    return removed
+
+
+def bundle_locales(languages=None, locales_dir=None, bundles_dir=None, keys=None, store=None):
+    """
+    Bundle `languages` (default: every locale file) and update the manifest.
+    `keys`, when given, restricts every bundle to those keys. Locales are read
+    from `store` (a LocaleStore, opened on demand).
+    Returns the manifest.
+    """
+    locales_dir = locales_dir or get_locales_dir()
+    store = store or LocaleStore.open(locales_dir)
+    bundles_dir = bundles_dir or get_bundles_dir()
+    bundles_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = bundles_dir / MANIFEST_NAME
+
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob("*.json"))
+
+    for lang in languages:
+        translations = store.locale(lang)
+        if keys is not None:
+            translations = {key: value for key, value in translations.items() if key in keys}
+        manifest[lang] = bundle_language(lang, translations, bundles_dir)
+
+    # Languages whose locale file was deleted drop out of the manifest
+    manifest = {lang: entry for lang, entry in sorted(manifest.items())
+                if (locales_dir / f"{lang}.json").exists()}
+
+    atomic_write_json(manifest, manifest_file, indent=None, separators=(',', ':'))
+    remove_stale_bundles(bundles_dir, manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build content-hashed locale bundles for translator.js")
+    parser.add_argument("--languages", help="Comma-separated languages (default: all locale files)")
+    parser.add_argument("--live-only", action="store_true", help="Only bundle keys referenced by a page or script (see key_usage.py)")
+
+    args = parser.parse_args()
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+
+    print("📦 Bundling locales...")
+    print(f"📁 Output directory: {get_bundles_dir()}")
+    if not brotli:
+        print("ℹ️  brotli not installed, skipping .br files (pip install brotli)")
+
+    keys = None
+    if args.live_only:
+        keys = live_keys()
+        print(f"🔍 Bundling only the {len(keys)} keys referenced by pages and scripts")
+
+    manifest = bundle_locales(languages, keys=keys)
+    for lang, entry in manifest.items():
+        if languages is None or lang in languages:
+            print(f"  {lang}: {entry['file']} ({entry['bytes']} B, {entry['gzip_bytes']} B gzip)")
+
+    print(f"✅ Wrote {get_bundles_dir() / MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
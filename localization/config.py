@@ -21,7 +21,7 @@ IMPORTANT_FIELDS = [
     "about-role", "current-role", "startup-role",
 
     # Locations and personal data
-    "birth-place", "city", "university", "location", "languages", "focus"
+    "birth-place", "city", "university", "location", "languages", "focus",
 
     # Focus
     "focus-production-title", "focus-production-desc", "tag-realtime", "tag-quality", "tag-data",
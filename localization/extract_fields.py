@@ -1,13 +1,50 @@
 #!/usr/bin/env python3
-"""Extract important fields from translation files"""
+"""
+Extract important fields from translation files
+
+Fields whose source text is exactly a glossary term (see glossary.py) are
+left out: translate_website.py already resolves them locally, so a GPT
+review could only spend tokens on them or break them.
+"""
 
 import json
 from pathlib import Path
 
 from config import IMPORTANT_FIELDS
+from glossary import Glossary, text_values
+from locale_store import LocaleStore
 from path_utils import get_locales_dir, get_localization_dir
 
 
+def glossary_resolved(source_value, glossary, lang):
+    """True if every string of a source value is exactly a glossary term"""
+    texts = text_values(source_value)
+    return bool(texts) and all(glossary.resolve(text, lang) is not None for text in texts)
+
+
+def extract_important_fields(all_translations, fields=IMPORTANT_FIELDS, source_translations=None, glossary=None,
+                             lang=None):
+    """
+    Extract only important fields, in IMPORTANT_FIELDS order. With a `glossary` and
+    the `source_translations`, fields whose source is a glossary term are skipped.
+    """
+    important = {}
+    for key in fields:
+        if key not in all_translations:
+            continue
+        if glossary and source_translations and key in source_translations and \
+                glossary_resolved(source_translations[key], glossary, lang):
+            continue
+        important[key] = all_translations[key]
+    return important
+
+
+def save_important_fields(important, output_file):
+    """Save extracted fields for review"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(important, f, ensure_ascii=False, indent=2)
+
+
 def main():
     print("🔍 Extracting important fields...")
 
@@ -19,25 +56,23 @@ def main():
     print(f"📁 Using locales directory: {locales_dir}")
     print(f"📁 Output directory: {output_dir}")
 
-    # Process each language file
-    for json_file in locales_dir.glob("*.json"):
-        lang = json_file.stem
+    # Process each language (all of them come from one locale store snapshot)
+    store = LocaleStore.open(locales_dir)
+    source_translations = store.locale("en")
+    glossary = Glossary.load()
+    for lang in store.languages:
         print(f"Processing {lang}.json...")
 
         # Load original translations
-        with open(json_file, 'r', encoding='utf-8') as f:
-            all_translations = json.load(f)
+        all_translations = store.locale(lang)
 
         # Extract only important fields
-        important = {}
-        for key in IMPORTANT_FIELDS:
-            if key in all_translations:
-                important[key] = all_translations[key]
+        important = extract_important_fields(all_translations, source_translations=source_translations,
+                                             glossary=glossary, lang=lang)
 
         # Save extracted fields
         output_file = output_dir / f"{lang}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(important, f, ensure_ascii=False, indent=2)
+        save_important_fields(important, output_file)
 
         print(f"  → Saved {len(important)} fields to {output_file}")
 
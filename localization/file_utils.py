@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""File helpers shared by the localization scripts"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_text(text, file_path):
+    """
+    Write text so readers only ever see the old or the new file:
+    write a temp file in the same directory, fsync it, then rename over the target.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_json(data, file_path, **dump_kwargs):
+    """Atomically write JSON (UTF-8, 2-space indent unless overridden)"""
+    dump_kwargs.setdefault("ensure_ascii", False)
+    dump_kwargs.setdefault("indent", 2)
+    atomic_write_text(json.dumps(data, **dump_kwargs), file_path)
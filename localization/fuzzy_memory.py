@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Fuzzy matching over the translation memory
+
+Finds previously translated source strings that are close to a new one,
+so a lightly edited string does not have to be translated from scratch.
+Similarity is the Jaccard index of character trigrams. The index is an
+inverted trigram → entry map with prefix filtering: a string can only
+reach similarity `t` with the query if it shares one of the query's
+rarest |q| - ceil(t·|q|) + 1 trigrams, so a lookup touches a handful of
+short posting lists instead of every entry.
+
+Matches at or above `reuse_threshold` are reused as the translation;
+matches at or above `hint_threshold` are kept as hints for the GPT
+reviewer (localization/fuzzy_hints.json). Reused matches are recorded
+as hints too, flagged "reused", since the old translation of an edited
+source (a changed number, a dropped negation) was never checked against
+the new text. Hints of list items are kept per item:
+
+    {lang: {key: {"source", "translation", "similarity"[, "reused": true]}}}
+    {lang: {key: {"items": {"<index>": {...}}}}}
+"""
+
+import json
+import math
+import threading
+from collections import defaultdict, namedtuple
+
+from file_utils import atomic_write_json
+from path_utils import get_localization_dir
+from translation_memory import normalize_text
+
+HINTS_NAME = "fuzzy_hints.json"
+
+FuzzyMatch = namedtuple("FuzzyMatch", ["similarity", "source", "translation"])
+
+
+def trigrams(text):
+    """Character trigrams of normalized text (short strings are their own gram)"""
+    padded = f" {normalize_text(text)} "
+    if len(padded) < 3:
+        return {padded}
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Trigram index over (source, translation) pairs of one language pair"""
+
+    def __init__(self, threshold=0.7):
+        self.threshold = threshold
+        self.entries = []  # (grams, source, translation)
+        self.postings = defaultdict(list)
+        self.seen = set()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, source, translation):
+        text = normalize_text(source)
+        if text in self.seen:
+            return
+        self.seen.add(text)
+
+        grams = trigrams(text)
+        entry_id = len(self.entries)
+        self.entries.append((grams, source, translation))
+        for gram in grams:
+            self.postings[gram].append(entry_id)
+
+    def query(self, text, threshold=None):
+        """Best FuzzyMatch with similarity >= threshold, or None"""
+        threshold = self.threshold if threshold is None else threshold
+        grams = trigrams(text)
+        size = len(grams)
+
+        # Rarest grams first; any match must contain at least one of the prefix
+        ordered = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        prefix = ordered[:size - math.ceil(threshold * size) + 1]
+
+        candidates = set()
+        for gram in prefix:
+            candidates.update(self.postings.get(gram, ()))
+
+        best = None
+        for entry_id in candidates:
+            entry_grams, source, translation = self.entries[entry_id]
+            # Length filter: Jaccard >= t needs t·|q| <= |s| <= |q| / t
+            if not threshold * size <= len(entry_grams) or threshold * len(entry_grams) > size:
+                continue
+            overlap = len(grams & entry_grams)
+            similarity = overlap / (size + len(entry_grams) - overlap)
+            if similarity >= threshold and (best is None or similarity > best.similarity):
+                best = FuzzyMatch(similarity, source, translation)
+
+        return best
+
+
+class FuzzyMatcher:
+    """Lazily built per-language-pair fuzzy indexes over a TranslationMemory"""
+
+    def __init__(self, memory, reuse_threshold=0.95, hint_threshold=0.7):
+        self.memory = memory
+        self.reuse_threshold = reuse_threshold
+        self.hint_threshold = hint_threshold
+        self.reused = 0
+        self.hinted = 0
+        self.hints = {}  # {lang: {key: hint}}
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _build(self, source_lang, target_lang):
+        index = FuzzyIndex(self.hint_threshold)
+        for source, translation in self.memory.entries(source_lang, target_lang):
+            index.add(source, translation)
+        return index
+
+    def index(self, source_lang, target_lang):
+        with self._lock:
+            pair = (source_lang, target_lang)
+            if pair not in self._indexes:
+                self._indexes[pair] = self._build(source_lang, target_lang)
+            return self._indexes[pair]
+
+    def refresh(self, source_lang, target_langs):
+        """Rebuild the indexes of these language pairs, picking up memory entries stored since they were built"""
+        for target_lang in target_langs:
+            index = self._build(source_lang, target_lang)
+            with self._lock:
+                self._indexes[(source_lang, target_lang)] = index
+
+    def match(self, text, source_lang, target_lang):
+        """
+        Returns (translation to reuse or None, FuzzyMatch to record as a hint or None);
+        a reused match is returned as the hint as well.
+        Exact matches are the memory's job, so they are never reported here.
+        """
+        found = self.index(source_lang, target_lang).query(text)
+        if found is None or normalize_text(found.source) == normalize_text(text):
+            return None, None
+        if found.similarity >= self.reuse_threshold:
+            with self._lock:
+                self.reused += 1
+            return found.translation, found
+        with self._lock:
+            self.hinted += 1
+        return None, found
+
+    def add_hint(self, lang, key, found, index=None, reused=False):
+        """Remember a close match of a value (or of list item `index`) for the reviewer"""
+        hint = {
+            "source": found.source,
+            "translation": found.translation,
+            "similarity": round(found.similarity, 3),
+        }
+        if reused:
+            hint["reused"] = True
+        with self._lock:
+            language_hints = self.hints.setdefault(lang, {})
+            if index is None:
+                language_hints[key] = hint
+            else:
+                language_hints.setdefault(key, {"items": {}})["items"][str(index)] = hint
+
+
+def get_hints_path():
+    """Get the absolute path to the reviewer hints file"""
+    return get_localization_dir() / HINTS_NAME
+
+
+def load_hints(path=None):
+    """{lang: {key: {"source", "translation", "similarity"}}}"""
+    try:
+        with open(path or get_hints_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def update_language_hints(lang, hints, translated_keys, path=None):
+    """Replace the hints of keys that were just translated in one language"""
+    path = path or get_hints_path()
+    all_hints = load_hints(path)
+    language_hints = {key: hint for key, hint in all_hints.get(lang, {}).items() if key not in translated_keys}
+    language_hints.update(hints)
+    if language_hints:
+        all_hints[lang] = language_hints
+    else:
+        all_hints.pop(lang, None)
+    atomic_write_json(all_hints, path, sort_keys=True)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Glossary / termbase for the locale files
+
+localization/glossary.json lists terms that must survive translation:
+
+    {
+      "do_not_translate": {"*": ["PyTorch", "Docker", ...], "ja": ["..."]},
+      "forced": {"it": {"machine translation": "traduzione automatica"}}
+    }
+
+"do_not_translate" terms ("*" applies to every language) must appear
+verbatim, with the same case, in every translation of a string that
+contains them. "forced" terms must be rendered with the given target
+term (matched case-insensitively, since sentence case may change).
+
+A source string that is exactly a glossary term is resolved locally by
+translate_website.py and never sent to the provider. All other strings
+are checked after translation and before a review is merged: the terms
+of a language are compiled once into an Aho-Corasick automaton
+(TermMatcher), so every string is scanned in a single pass however
+large the glossary grows. Terms match across scripts and with inflection
+suffixes ("Pythons", "Translatednél"), so declined forms are not drift.
+Source strings that are exactly a glossary term are also left out of the
+GPT review (see extract_fields.py).
+
+Usage:
+    python glossary.py --check                       # every locale against en.json
+    python glossary.py --check --languages es,it,fr --report glossary_report.json
+"""
+
+import argparse
+import json
+import sys
+import unicodedata
+from collections import deque, namedtuple
+
+from file_utils import atomic_write_json
+from locale_store import LocaleStore
+from path_utils import get_localization_dir
+
+ALL_LANGUAGES = "*"
+
+# A term the translation of `key` should contain but does not: `term` was found in the
+# source, `expected` is what the translation must contain (the term itself when do-not-translate)
+Violation = namedtuple("Violation", ["key", "term", "expected"])
+
+
+def get_glossary_file():
+    """Get the absolute path to the glossary"""
+    return get_localization_dir() / "glossary.json"
+
+
+def fold_case(text):
+    """Lower-case `text` without changing its length, so match offsets stay valid"""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters (e.g. "İ") lower-case to two; leave those alone
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def script(char):
+    """Rough Unicode script of a character: the first word of its name (LATIN, CYRILLIC, CJK, ...)"""
+    return unicodedata.name(char, "").split(" ", 1)[0]
+
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def joined_before(previous, first):
+    """
+    Whether `previous` glues onto a term starting with `first`: only a letter or digit
+    of the same script does ("NumPy" is not inside "ReNumPy", but is in "のNumPy")
+    """
+    if not (is_word_char(previous) and is_word_char(first)):
+        return False
+    return previous == "_" or script(previous) == script(first)
+
+
+def joined_after(last, following):
+    """
+    Whether `following` glues onto a term ending with `last`. Letters never do, since
+    inflected forms keep the term ("Pythons", "Translatednél", "Dockerin"); digits and
+    underscores do ("GPT4" is not "GPT")
+    """
+    return is_word_char(last) and is_word_char(following) and not following.isalpha()
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of terms: finds every occurrence of
+    every term in one left-to-right pass. Matching ignores case; terms listed in
+    `case_sensitive` must also match exactly. A match must not continue a word of
+    the same script before it, and may only be followed by letters (an inflection
+    suffix) or a non-word character (see joined_before / joined_after).
+    """
+
+    def __init__(self, terms, case_sensitive=()):
+        self.terms = list(dict.fromkeys(term for term in terms if term))
+        self.case_sensitive = set(case_sensitive)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for term in self.terms:
+            node = 0
+            for char in fold_case(term):
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = child
+            self._out[node].append(term)
+
+        # Breadth-first, so every failure link points to an already finished node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def finditer(self, text):
+        """Yield (start, end, term) for every occurrence, in order of their end"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for position, char in enumerate(fold_case(text)):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for term in out[node]:
+                end = position + 1
+                start = end - len(term)
+                if term in self.case_sensitive and text[start:end] != term:
+                    continue
+                if start > 0 and joined_before(text[start - 1], term[0]):
+                    continue
+                if end < len(text) and joined_after(term[-1], text[end]):
+                    continue
+                yield start, end, term
+
+    def find(self, text):
+        """The set of terms occurring in `text`"""
+        return {term for _, _, term in self.finditer(text)}
+
+
+def text_values(value):
+    """The strings of a locale value (a string or a list of them)"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+class Glossary:
+    """Per-language do-not-translate and forced terms, with compiled matchers"""
+
+    def __init__(self, do_not_translate=None, forced=None):
+        self.do_not_translate = {lang: list(terms) for lang, terms in (do_not_translate or {}).items()}
+        self.forced = {lang: dict(terms) for lang, terms in (forced or {}).items()}
+        self._matchers = {}
+
+    @classmethod
+    def load(cls, file_path=None):
+        """Load a glossary file; a missing file is an empty glossary"""
+        try:
+            with open(file_path or get_glossary_file(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls(data.get("do_not_translate"), data.get("forced"))
+
+    def __bool__(self):
+        return any(self.do_not_translate.values()) or any(self.forced.values())
+
+    def __len__(self):
+        return sum(len(terms) for terms in self.do_not_translate.values()) + \
+            sum(len(terms) for terms in self.forced.values())
+
+    def terms(self, lang):
+        """{source term: expected target term} for a language; forced entries win"""
+        terms = {term: term for term in self.do_not_translate.get(ALL_LANGUAGES, [])}
+        terms.update({term: term for term in self.do_not_translate.get(lang, [])})
+        terms.update(self.forced.get(ALL_LANGUAGES, {}))
+        terms.update(self.forced.get(lang, {}))
+        return terms
+
+    def _compiled(self, lang):
+        """(terms, source matcher, target matcher) of a language, compiled on first use"""
+        if lang not in self._matchers:
+            terms = self.terms(lang)
+            invariant = [term for term, expected in terms.items() if term == expected]
+            self._matchers[lang] = (
+                terms,
+                TermMatcher(terms, case_sensitive=invariant),
+                TermMatcher(set(terms.values()), case_sensitive=invariant),
+            )
+        return self._matchers[lang]
+
+    def resolve(self, text, lang):
+        """The translation of `text` if it is exactly a glossary term, else None"""
+        terms = self._compiled(lang)[0]
+        stripped = text.strip()
+        if stripped in terms:
+            return text.replace(stripped, terms[stripped])
+        # Forced terms also resolve regardless of case ("Machine translation")
+        folded = fold_case(stripped)
+        for term, expected in self.forced.get(lang, {}).items():
+            if fold_case(term) == folded:
+                return text.replace(stripped, expected)
+        return None
+
+    def check(self, source, translation, lang):
+        """[(term, expected)] the translation of `source` is missing"""
+        terms, source_matcher, target_matcher = self._compiled(lang)
+        if not source_matcher:
+            return []
+        required = source_matcher.find(source)
+        if not required:
+            return []
+        found = target_matcher.find(translation)
+        return [(term, terms[term]) for term in sorted(required) if terms[term] not in found]
+
+    def check_locale(self, source_translations, translations, lang, keys=None):
+        """
+        Check every (or every given) key of a locale against the source.
+        List values are compared item by item. Returns a list of Violations.
+        """
+        violations = []
+        for key in keys if keys is not None else translations:
+            if key not in source_translations or key not in translations:
+                continue
+            sources, targets = text_values(source_translations[key]), text_values(translations[key])
+            for source, translation in zip(sources, targets):
+                for term, expected in self.check(source, translation, lang):
+                    violations.append(Violation(key, term, expected))
+        return violations
+
+    def guard_review(self, source_translations, original, reviewed, lang):
+        """
+        Drop reviewed values that lose a glossary term the current value still has.
+        Returns (accepted {key: value}, rejected {key: [Violation, ...]}).
+        """
+        accepted, rejected = {}, {}
+        for key, value in reviewed.items():
+            source = source_translations.get(key)
+            if source is None or key not in original or original[key] == value:
+                accepted[key] = value
+                continue
+            introduced = [violation for violation in self.check_locale({key: source}, {key: value}, lang)
+                          if violation not in self.check_locale({key: source}, {key: original[key]}, lang)]
+            if introduced:
+                rejected[key] = introduced
+            else:
+                accepted[key] = value
+        return accepted, rejected
+
+
+def format_violation(violation):
+    if violation.term == violation.expected:
+        return f"{violation.key}: '{violation.term}' must stay untranslated"
+    return f"{violation.key}: '{violation.term}' must be translated as '{violation.expected}'"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every locale against the glossary")
+    parser.add_argument("--check", action="store_true", help="Check the locale files (the default action)")
+    parser.add_argument("--languages", help="Comma-separated languages (default: every locale file)")
+    parser.add_argument("--source", default="en", help="Source language (default: en)")
+    parser.add_argument("--glossary", help="Glossary file (default: localization/glossary.json)")
+    parser.add_argument("--report", help="Also write the violations as JSON")
+
+    args = parser.parse_args()
+    glossary = Glossary.load(args.glossary)
+    store = LocaleStore.open()
+    source_translations = store.locale(args.source)
+
+    if args.languages:
+        languages = [lang.strip() for lang in args.languages.split(',') if lang.strip()]
+    else:
+        languages = [lang for lang in store.languages if lang != args.source]
+
+    print(f"📖 Checking {len(languages)} locales against {len(glossary)} glossary terms")
+    report = {}
+    for lang in languages:
+        violations = glossary.check_locale(source_translations, store.locale(lang), lang)
+        if violations:
+            report[lang] = [violation._asdict() for violation in violations]
+            print(f"  ❌ {lang}: {len(violations)} violations")
+            for violation in violations:
+                print(f"     {format_violation(violation)}")
+
+    if args.report:
+        atomic_write_json(report, args.report)
+        print(f"📄 Report: {args.report}")
+
+    if report:
+        print(f"❌ {sum(len(violations) for violations in report.values())} glossary violations in {len(report)} locales")
+        sys.exit(1)
+    print("✅ All locales follow the glossary")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Append-only journal of completed translations
+
+translate_website.py appends every translated segment as soon as its
+request finishes. If a run crashes or is interrupted, `--resume` replays
+the journal so nothing that was already paid for is requested again.
+Each entry carries a fingerprint of its source text, so entries are only
+reused while the source string is unchanged.
+"""
+
+import json
+import os
+import threading
+
+from path_utils import get_localization_dir
+from source_manifest import fingerprint
+
+JOURNAL_NAME = "translation_journal.jsonl"
+
+
+def get_journal_path():
+    """Get the absolute path to the translation journal"""
+    return get_localization_dir() / JOURNAL_NAME
+
+
+class TranslationJournal:
+    """JSON-lines journal of (language, key, list index, value) results"""
+
+    def __init__(self, path=None, resume=False):
+        self.path = path or get_journal_path()
+        self.completed = {}
+        self._lock = threading.Lock()
+
+        if resume:
+            self._replay()
+        elif os.path.exists(self.path):
+            # A fresh run starts a fresh journal
+            os.unlink(self.path)
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # The last line may be torn if the process died mid-write
+                        continue
+                    self.completed[(entry["lang"], entry["key"], entry["index"])] = (entry["source"], entry["value"])
+        except FileNotFoundError:
+            pass
+
+    def __len__(self):
+        return len(self.completed)
+
+    def lookup(self, lang, segment):
+        """Return the journaled translation of a segment, if its source text is unchanged"""
+        entry = self.completed.get((lang, segment.key, segment.index))
+        if entry is None or entry[0] != fingerprint(segment.text):
+            return None
+        return entry[1]
+
+    def append(self, lang, segments, translations):
+        """Durably record translated segments for a language"""
+        lines = []
+        for segment, value in zip(segments, translations):
+            source = fingerprint(segment.text)
+            self.completed[(lang, segment.key, segment.index)] = (source, value)
+            lines.append(json.dumps({
+                "lang": lang,
+                "key": segment.key,
+                "index": segment.index,
+                "source": source,
+                "value": value,
+            }, ensure_ascii=False))
+
+        with self._lock:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self, discard=False):
+        """Close the journal; `discard` removes it once the run has fully completed"""
+        with self._lock:
+            self._file.close()
+        if discard and os.path.exists(self.path):
+            os.unlink(self.path)
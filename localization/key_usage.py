@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Index which translation keys the site actually uses
+
+Scans the HTML pages for data-translate attributes and the site's JS
+(including inline scripts) for key lookups (translation['key'], getTranslation('key'),
+setAttribute('data-translate', 'key')) in one pass, and builds a map of
+key → places it is used. Against the source locale and
+config.IMPORTANT_FIELDS that gives:
+
+  unused     keys in the source locale nothing references
+  missing    keys referenced by a page or script but absent from the source
+  malformed  keys that are not lowercase-dash names (e.g. two entries
+             glued together by a missing comma)
+
+translate_website.py --live-only and bundle_locales.py --live-only use
+live_keys() to skip unused keys.
+
+Usage:
+    python key_usage.py
+    python key_usage.py --json
+    python key_usage.py --strict   # exit 1 if anything is missing or malformed
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from html.parser import HTMLParser
+
+from config import IMPORTANT_FIELDS
+from locale_store import LocaleStore
+from path_utils import get_project_root
+
+SOURCE_LANGUAGE = "en"
+KEY_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+# Key lookups in the site's scripts
+JS_KEY_PATTERNS = [
+    re.compile(r"\w*[Tt]ranslation\w*\[\s*['\"]([^'\"]+)['\"]\s*\]"),
+    re.compile(r"getTranslation\(\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"setAttribute\(\s*['\"]data-translate['\"]\s*,\s*['\"]([^'\"]+)['\"]"),
+]
+
+
+class TranslateAttributeParser(HTMLParser):
+    """Collects (key, line) for every data-translate attribute"""
+
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name == "data-translate":
+                self.keys.append((value or "", self.getpos()[0]))
+
+    handle_startendtag = handle_starttag
+
+
+def html_files(root=None):
+    """Source pages at the project root (pre-rendered /<lang>/ copies are skipped)"""
+    root = root or get_project_root()
+    return sorted(root.glob("*.html"))
+
+
+def js_files(root=None):
+    """The site's own scripts; vendor code and built bundles are skipped"""
+    root = root or get_project_root()
+    js_dir = root / "assets" / "js"
+    return sorted(path for path in js_dir.rglob("*.js") if "dist" not in path.relative_to(js_dir).parts)
+
+
+def scan_script(text, file_name, usage):
+    """Record key lookups in JS source (a script file or a page with inline scripts)"""
+    for line_number, line in enumerate(text.splitlines(), 1):
+        for pattern in JS_KEY_PATTERNS:
+            for match in pattern.finditer(line):
+                usage[match.group(1)].append((file_name, line_number))
+
+
+def index_usage(root=None):
+    """Scan pages and scripts once; returns {key: [(relative file, line), ...]}"""
+    root = root or get_project_root()
+    usage = defaultdict(list)
+
+    for path in html_files(root):
+        text = path.read_text(encoding='utf-8')
+        file_name = str(path.relative_to(root))
+        parser = TranslateAttributeParser()
+        parser.feed(text)
+        parser.close()
+        for key, line in parser.keys:
+            usage[key].append((file_name, line))
+        scan_script(text, file_name, usage)
+
+    for path in js_files(root):
+        scan_script(path.read_text(encoding='utf-8'), str(path.relative_to(root)), usage)
+
+    return dict(usage)
+
+
+def is_well_formed(key):
+    return bool(KEY_PATTERN.match(key))
+
+
+def is_glued(key, source):
+    """True if `key` is two source keys run together, e.g. a list entry missing its comma"""
+    return key not in source and any(key[:i] in source and key[i:] in source for i in range(1, len(key)))
+
+
+def is_malformed(key, source):
+    return not is_well_formed(key) or is_glued(key, source)
+
+
+def analyze(source=None, usage=None, important_fields=IMPORTANT_FIELDS, store=None):
+    """Compare the source locale (read from `store`, opened on demand) and IMPORTANT_FIELDS against the usage index"""
+    if source is None:
+        source = (store or LocaleStore.open()).locale(SOURCE_LANGUAGE)
+    usage = index_usage() if usage is None else usage
+
+    return {
+        "source_keys": len(source),
+        "used_keys": len(usage),
+        "unused": sorted(key for key in source if key not in usage),
+        "missing": {key: usage[key] for key in sorted(usage) if key not in source and is_well_formed(key)},
+        "malformed": {
+            "source": sorted(key for key in source if not is_well_formed(key)),
+            "usage": {key: usage[key] for key in sorted(usage) if not is_well_formed(key)},
+            "important_fields": [key for key in important_fields if is_malformed(key, source)],
+        },
+        "important_fields_missing": [key for key in important_fields
+                                     if not is_malformed(key, source) and key not in source],
+        "important_fields_unused": [key for key in important_fields if key in source and key not in usage],
+    }
+
+
+def live_keys(usage=None):
+    """Keys referenced by a page or script"""
+    usage = index_usage() if usage is None else usage
+    return set(usage)
+
+
+def has_errors(report):
+    malformed = report["malformed"]
+    return bool(report["missing"] or report["important_fields_missing"]
+                or malformed["source"] or malformed["usage"] or malformed["important_fields"])
+
+
+def print_report(report):
+    print(f"📊 {report['source_keys']} source keys, {report['used_keys']} referenced by pages or scripts")
+
+    if report["unused"]:
+        print(f"\n🗑️  Unused keys ({len(report['unused'])}):")
+        for key in report["unused"]:
+            print(f"  {key}")
+
+    if report["missing"]:
+        print(f"\n❌ Missing from {SOURCE_LANGUAGE}.json ({len(report['missing'])}):")
+        for key, places in report["missing"].items():
+            print(f"  {key}  ({', '.join(f'{file}:{line}' for file, line in places)})")
+
+    malformed = report["malformed"]
+    if malformed["source"] or malformed["usage"] or malformed["important_fields"]:
+        print("\n⚠️  Malformed keys:")
+        for key in malformed["source"]:
+            print(f"  {SOURCE_LANGUAGE}.json: {key!r}")
+        for key, places in malformed["usage"].items():
+            print(f"  {key!r}  ({', '.join(f'{file}:{line}' for file, line in places)})")
+        for key in malformed["important_fields"]:
+            print(f"  config.IMPORTANT_FIELDS: {key!r}")
+
+    if report["important_fields_missing"]:
+        print(f"\n❌ IMPORTANT_FIELDS not in {SOURCE_LANGUAGE}.json: {', '.join(report['important_fields_missing'])}")
+    if report["important_fields_unused"]:
+        print(f"\n🗑️  IMPORTANT_FIELDS not used by any page: {', '.join(report['important_fields_unused'])}")
+
+    if not has_errors(report) and not report["unused"]:
+        print("✅ Every key is used and defined")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report unused, missing and malformed translation keys")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 if any key is missing or malformed")
+
+    args = parser.parse_args()
+
+    report = analyze()
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    if args.strict and has_errors(report):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
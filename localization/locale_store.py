@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Consolidated locale store
+
+Holds every locale as one key-by-language table: keys are interned once
+and referenced by id, each language keeps its own key order, and values
+are stored as compact UTF-8 blobs. The table is persisted to a single
+snapshot file (localization/locale_store.snapshot):
+
+    magic | header length | JSON header (keys, languages, key order,
+    source file stats) | offset table (uint64) | value blobs
+
+The snapshot is memory-mapped where possible, so opening the store costs
+one small header parse instead of 32 json.load() calls, and a value is
+only decoded when it is looked up.
+
+The per-language JSON files stay the source of truth for everything else
+(translator.js, the bundles, git): they are imported into the store when
+their size or mtime no longer matches the snapshot, and export() writes
+changed languages back atomically. Scripts use the store for lookups,
+cross-language columns, diffs and bulk updates.
+
+Usage:
+    python locale_store.py                  # refresh the snapshot, print a summary
+    python locale_store.py --rebuild        # re-import every locale file
+    python locale_store.py --key nav-home   # one key in every language
+    python locale_store.py --diff it --against es
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+
+from file_utils import atomic_write_json
+from path_utils import get_locales_dir, get_localization_dir
+
+SNAPSHOT_NAME = "locale_store.snapshot"
+MAGIC = b"L10NSTORE1\n"
+HEADER_LENGTH = struct.Struct("<Q")
+
+# First byte of a value blob: a plain string, or any other JSON value
+STRING, JSON_VALUE = b"s", b"j"
+
+_MISSING = object()
+
+
+def get_snapshot_path():
+    """Get the absolute path to the locale store snapshot"""
+    return get_localization_dir() / SNAPSHOT_NAME
+
+
+def encode_value(value):
+    if isinstance(value, str):
+        return STRING + value.encode("utf-8")
+    return JSON_VALUE + json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+
+def decode_value(blob):
+    kind, payload = blob[:1], blob[1:]
+    if kind == STRING:
+        return str(payload, "utf-8")
+    return json.loads(str(payload, "utf-8"))
+
+
+def file_stat(file_path):
+    """[size, mtime_ns] of a file, the store's freshness check"""
+    stat = file_path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class LocaleStore:
+    """
+    Every locale in one table; thread-safe. Languages are served from the
+    memory-mapped snapshot until they are imported or updated, after which
+    they are held as plain dicts until the next save().
+    """
+
+    def __init__(self, locales_dir=None, snapshot_path=None):
+        self.locales_dir = Path(locales_dir) if locales_dir else get_locales_dir()
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else get_snapshot_path()
+        self.keys = []           # key id -> interned key
+        self._key_ids = {}       # key -> key id
+        self._order = {}         # lang -> [key id, ...] in the locale file's order
+        self._files = {}         # lang -> file_stat() of the JSON file the data matches
+        self._mapped = {}        # lang -> row in the snapshot's value table
+        self._loaded = {}        # lang -> {key: value} held in memory
+        self._dirty = set()      # languages changed since their JSON file was written
+        self._changed = False    # snapshot out of date
+        self._buffer = None
+        self._offsets = None
+        self._row_width = 0
+        self._blobs_start = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def open(cls, locales_dir=None, snapshot_path=None, save=True):
+        """Map the snapshot, re-import stale locale files and (with `save`) persist the result"""
+        store = cls(locales_dir, snapshot_path)
+        store.load_snapshot()
+        if store.refresh() and save:
+            store.save()
+        return store
+
+    # Snapshot I/O
+
+    def load_snapshot(self):
+        """Map the snapshot file; a missing, foreign or corrupt snapshot leaves the store empty"""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                try:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):  # Empty file or no mmap support: read it instead
+                    buffer = f.read()
+        except FileNotFoundError:
+            return False
+
+        try:
+            if buffer[:len(MAGIC)] != MAGIC:
+                raise ValueError("not a locale store snapshot")
+            start = len(MAGIC) + HEADER_LENGTH.size
+            (header_length,) = HEADER_LENGTH.unpack(buffer[len(MAGIC):start])
+            header = json.loads(bytes(buffer[start:start + header_length]))
+            if header.get("byteorder") != sys.byteorder:
+                raise ValueError("snapshot written on a different platform")
+
+            table_start = start + header_length
+            table_start += -table_start % 8
+            count = len(header["languages"]) * len(header["keys"]) + 1
+            offsets = memoryview(buffer)[table_start:table_start + count * 8].cast("Q")
+        except (ValueError, KeyError, TypeError, struct.error):
+            return False
+
+        with self._lock:
+            self._buffer = buffer
+            self._offsets = offsets
+            self._row_width = len(header["keys"])
+            self.keys = [sys.intern(key) for key in header["keys"]]
+            self._key_ids = {key: key_id for key_id, key in enumerate(self.keys)}
+            self._order = {lang: order for lang, order in header["order"].items()}
+            self._files = {lang: stat for lang, stat in header["files"].items()}
+            self._mapped = {lang: row for row, lang in enumerate(header["languages"])}
+            self._blobs_start = table_start + count * 8
+        return True
+
+    def save(self):
+        """
+        Write every language into a new snapshot and map it. Keys no language has
+        any more are left out, so the key table and rows do not grow with dead keys.
+        """
+        with self._lock:
+            languages = self.languages
+            live = sorted({key_id for lang in languages for key_id in self._order[lang]})
+            new_ids = {key_id: new_id for new_id, key_id in enumerate(live)}
+
+            blobs = bytearray()
+            offsets = array("Q", [0])
+            for lang in languages:
+                present = set(self._order[lang])
+                for key_id in live:
+                    if key_id in present:
+                        blobs += self._raw(lang, key_id)
+                    offsets.append(len(blobs))
+
+            header = json.dumps({
+                "byteorder": sys.byteorder,
+                "keys": [self.keys[key_id] for key_id in live],
+                "languages": languages,
+                "order": {lang: [new_ids[key_id] for key_id in self._order[lang]] for lang in languages},
+                "files": {lang: self._files[lang] for lang in languages if lang in self._files},
+            }, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+            prefix = MAGIC + HEADER_LENGTH.pack(len(header)) + header
+            prefix += b"\0" * (-len(prefix) % 8)
+
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(prefix)
+                f.write(offsets.tobytes())
+                f.write(blobs)
+            tmp_path.replace(self.snapshot_path)
+
+            self._loaded = {lang: values for lang, values in self._loaded.items() if lang in self._dirty}
+            self.load_snapshot()
+            self._changed = False
+
+    def _raw(self, lang, key_id):
+        """Encoded value of a key that `lang` has"""
+        if lang in self._loaded:
+            return encode_value(self._loaded[lang][self.keys[key_id]])
+        index = self._mapped[lang] * self._row_width + key_id
+        return self._buffer[self._blobs_start + self._offsets[index]:self._blobs_start + self._offsets[index + 1]]
+
+    # Import / export
+
+    def _key_id(self, key):
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = len(self.keys)
+            self.keys.append(sys.intern(key))
+            self._key_ids[key] = key_id
+        return key_id
+
+    def _set(self, lang, values):
+        """Hold `values` (a dict) as the content of `lang`"""
+        self._loaded[lang] = {sys.intern(key): value for key, value in values.items()}
+        self._order[lang] = [self._key_id(key) for key in values]
+        self._changed = True
+
+    def import_file(self, lang):
+        """(Re-)read a locale file into the store"""
+        file_path = self.locales_dir / f"{lang}.json"
+        with self._lock:
+            stat = file_stat(file_path)
+            with open(file_path, 'r', encoding='utf-8') as f:
+                self._set(lang, json.load(f))
+            self._files[lang] = stat
+            self._dirty.discard(lang)
+
+    def refresh(self):
+        """Import locale files that are new or changed since the snapshot, drop deleted ones; returns the languages touched"""
+        with self._lock:
+            on_disk = {path.stem: path for path in self.locales_dir.glob("*.json")}
+            touched = []
+            for lang, path in sorted(on_disk.items()):
+                if lang in self._dirty:
+                    continue
+                if self._files.get(lang) != file_stat(path):
+                    self.import_file(lang)
+                    touched.append(lang)
+            for lang in [lang for lang in self.languages if lang not in on_disk and lang not in self._dirty]:
+                self.drop(lang)
+                touched.append(lang)
+            return touched
+
+    def export(self, languages=None):
+        """Atomically write changed (or the given) languages back to their JSON files"""
+        with self._lock:
+            for lang in sorted(self._dirty if languages is None else languages):
+                file_path = self.locales_dir / f"{lang}.json"
+                atomic_write_json(self.locale(lang), file_path)
+                self._files[lang] = file_stat(file_path)
+                self._dirty.discard(lang)
+                self._changed = True
+
+    def close(self):
+        """Save the snapshot if anything changed since it was written"""
+        with self._lock:
+            if self._changed:
+                self.save()
+
+    # Lookups
+
+    @property
+    def languages(self):
+        return sorted(self._order)
+
+    def __contains__(self, lang):
+        return lang in self._order
+
+    def get(self, lang, key, default=None):
+        """One value, decoded on demand"""
+        with self._lock:
+            if lang in self._loaded:
+                return self._loaded[lang].get(key, default)
+            key_id = self._key_ids.get(key)
+            if lang not in self._mapped or key_id is None or key_id >= self._row_width:
+                return default
+            blob = self._raw(lang, key_id)
+            return decode_value(blob) if blob else default
+
+    def locale(self, lang):
+        """{key: value} of a language in its file order (a copy); KeyError if unknown"""
+        with self._lock:
+            if lang in self._loaded:
+                return dict(self._loaded[lang])
+            return {self.keys[key_id]: decode_value(self._raw(lang, key_id)) for key_id in self._order[lang]}
+
+    def column(self, key, languages=None):
+        """{lang: value} of one key across languages (languages without the key are left out)"""
+        column = {}
+        for lang in languages or self.languages:
+            value = self.get(lang, key, _MISSING)
+            if value is not _MISSING:
+                column[lang] = value
+        return column
+
+    def diff(self, lang, other):
+        """
+        Compare a language with another one (a language code) or with {key: value}.
+        Returns {"added": [...], "removed": [...], "changed": [...]} keys, from `lang`'s point of view.
+        """
+        current = self.locale(lang) if lang in self else {}
+        target = self.locale(other) if isinstance(other, str) else other
+        return {
+            "added": [key for key in target if key not in current],
+            "removed": [key for key in current if key not in target],
+            "changed": [key for key in target if key in current and current[key] != target[key]],
+        }
+
+    # Bulk updates
+
+    def update(self, lang, values, remove=()):
+        """Set many keys of a language at once (new keys are appended) and drop `remove`"""
+        with self._lock:
+            current = self.locale(lang) if lang in self else {}
+            current.update(values)
+            for key in remove:
+                current.pop(key, None)
+            self._set(lang, current)
+            self._dirty.add(lang)
+
+    def replace(self, lang, values):
+        """Replace a language's content entirely"""
+        with self._lock:
+            self._set(lang, values)
+            self._dirty.add(lang)
+
+    def drop(self, lang):
+        with self._lock:
+            for mapping in (self._order, self._files, self._mapped, self._loaded):
+                mapping.pop(lang, None)
+            self._dirty.discard(lang)
+            self._changed = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the consolidated locale store")
+    parser.add_argument("--rebuild", action="store_true", help="Re-import every locale file")
+    parser.add_argument("--key", help="Print one key in every language")
+    parser.add_argument("--diff", metavar="LANG", help="Print the keys LANG lacks, has extra or has different from --against")
+    parser.add_argument("--against", default="en", help="Language to diff with (default: en)")
+
+    args = parser.parse_args()
+    if args.rebuild:
+        get_snapshot_path().unlink(missing_ok=True)
+    store = LocaleStore.open()
+
+    if args.key:
+        for lang, value in store.column(args.key).items():
+            print(f"  {lang}: {json.dumps(value, ensure_ascii=False)}")
+    elif args.diff:
+        diff = store.diff(args.diff, store.locale(args.against))
+        for name in ("added", "removed"):
+            label = "missing" if name == "added" else "extra"
+            print(f"  {label}: {', '.join(diff[name]) or '-'}")
+        print(f"  {len(diff['changed'])} keys differ from {args.against}")
+    else:
+        size = store.snapshot_path.stat().st_size if store.snapshot_path.exists() else 0
+        print(f"🗄️  {len(store.languages)} languages × {len(store.keys)} keys in {store.snapshot_path} ({size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,176 @@
 #!/usr/bin/env python3
-"""Merge reviewed translations back into original files"""
-
+"""
+Merge reviewed translations back into original files
+
+Usage:
+    python merge_back.py es
+    python merge_back.py es,it,fr,de
+    python merge_back.py --all                  # every language in reviewed_fields/
+    python merge_back.py --all --workers 8 --keep-runs 20
+    python merge_back.py es --metrics-textfile /var/lib/node_exporter/l10n_merge.prom
+
+All languages are merged in one process. Each changed locale file is
+backed up into the content-addressed store (see backup_store.py; one
+backup run per invocation) and then replaced atomically, so a crash never
+leaves a half-written locale behind. Roll a language back with
+`python backup_store.py --rollback es`.
+
+Locales are read from and written back through the consolidated locale
+store (see locale_store.py). Reviewed values that lose a glossary term the current translation keeps
+(see glossary.py) are not merged. Merged keys are recorded in the source
+manifest (see source_manifest.py) as reflecting the current source, which
+also clears keys the QA gate had queued for retranslation.
+
+Time spent loading, backing up, merging and saving is written to
+localization/telemetry/merge_back.json.
+"""
+
+import argparse
 import json
-import shutil
 import sys
-from datetime import datetime
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
+from backup_store import DEFAULT_KEEP_RUNS, BackupStore
+from glossary import Glossary, format_violation
+from locale_store import LocaleStore
 from path_utils import get_locales_dir, get_localization_dir
+from source_manifest import load_manifest, record_language, save_manifest
+from telemetry import finish_run, get_telemetry, start_run
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python merge_back.py <language>")
-        print("Example: python merge_back.py es")
-        sys.exit(1)
-
-    lang = sys.argv[1]
+def merge_reviewed(original, reviewed):
+    """
+    Apply reviewed values to keys that already exist in `original` (in place).
+    Returns the list of (key, old value, new value) changes.
+    """
+    changes = []
+    for key, value in reviewed.items():
+        if key in original and original[key] != value:
+            changes.append((key, original[key], value))
+            original[key] = value
+    return changes
 
-    print(f"🔄 Merging reviewed {lang} translations...")
 
-    # Get absolute paths
-    locales_dir = get_locales_dir()
-    localization_dir = get_localization_dir()
+def record_merged(merged_keys, source_translations, manifest_path=None):
+    """Record {lang: [key, ...]} merged from a review as translated from the current source"""
+    merged_keys = {lang: keys for lang, keys in merged_keys.items() if keys}
+    if not merged_keys:
+        return
+    manifest = load_manifest(manifest_path)
+    for lang, keys in merged_keys.items():
+        record_language(manifest, lang, source_translations, keys)
+    save_manifest(manifest, manifest_path)
+
+
+def merge_language(lang, store, reviewed_dir, backups, source_translations=None, glossary=None):
+    """
+    Merge one language of a LocaleStore; the locale file is backed up into `backups`
+    (a BackupRun) before it is replaced. With a `glossary`, reviewed values that drift
+    from it are left out. Returns (changes, {key: [glossary Violation, ...]} rejected).
+    """
+    telemetry = get_telemetry()
+    original_file = store.locales_dir / f"{lang}.json"
+    reviewed_file = reviewed_dir / f"{lang}.json"
+
+    with telemetry.stage("load", lang):
+        original = store.locale(lang)
+        with open(reviewed_file, 'r', encoding='utf-8') as f:
+            reviewed = json.load(f)
+
+    with telemetry.stage("merge", lang):
+        rejected = {}
+        if glossary and source_translations:
+            reviewed, rejected = glossary.guard_review(source_translations, original, reviewed, lang)
+        changes = merge_reviewed(original, reviewed)
+    telemetry.count("changes", len(changes), lang=lang)
+    telemetry.count("glossary_rejected", len(rejected), lang=lang)
+
+    if changes:
+        with telemetry.stage("backup", lang):
+            backups.add(lang, original_file)
+        with telemetry.stage("save", lang):
+            # Atomic write-temp-then-rename of the locale file
+            store.replace(lang, original)
+            store.export([lang])
+    return changes, rejected
 
-    # File paths
-    original_file = locales_dir / f"{lang}.json"
-    reviewed_file = localization_dir / "reviewed_fields" / f"{lang}.json"
 
-    print(f"📁 Original file: {original_file}")
-    print(f"📁 Reviewed file: {reviewed_file}")
+def main():
+    parser = argparse.ArgumentParser(description="Merge reviewed translations back into the locale files")
+    parser.add_argument("languages", nargs="?", help="Comma-separated languages to merge (e.g. 'es' or 'es,it,fr')")
+    parser.add_argument("--all", action="store_true", help="Merge every language that has a reviewed_fields/ file")
+    parser.add_argument("--workers", type=int, default=4, help="Languages merged in parallel (default: 4)")
+    parser.add_argument("--keep-runs", type=int, default=DEFAULT_KEEP_RUNS, help=f"Backup runs to keep (default: {DEFAULT_KEEP_RUNS})")
+    parser.add_argument("--report", help="JSON run report (default: localization/telemetry/merge_back.json)")
+    parser.add_argument("--metrics-textfile", help="Also write the run metrics as a Prometheus textfile")
+
+    args = parser.parse_args()
+    if not args.languages and not args.all:
+        parser.error("give the languages to merge or --all")
+    start_run("merge_back")
 
-    if not original_file.exists():
-        print(f"❌ Original file not found: {original_file}")
+    # Get absolute paths
+    locales_dir = get_locales_dir()
+    reviewed_dir = get_localization_dir() / "reviewed_fields"
+
+    if args.all:
+        languages = sorted(path.stem for path in reviewed_dir.glob("*.json"))
+    else:
+        languages = [lang.strip() for lang in args.languages.split(',') if lang.strip()]
+
+    missing = [str(file_path) for lang in languages
+               for file_path in (locales_dir / f"{lang}.json", reviewed_dir / f"{lang}.json")
+               if not file_path.exists()]
+    if missing:
+        for file_path in missing:
+            print(f"❌ File not found: {file_path}")
         sys.exit(1)
 
-    if not reviewed_file.exists():
-        print(f"❌ Reviewed file not found: {reviewed_file}")
+    print(f"🔄 Merging reviewed translations for {len(languages)} languages: {', '.join(languages)}")
+    print(f"📁 Locales: {locales_dir}")
+    print(f"📁 Reviewed: {reviewed_dir}")
+
+    store = LocaleStore.open(locales_dir)
+    source_translations = store.locale("en")
+    glossary = Glossary.load()
+
+    backup_store = BackupStore()
+    backups = backup_store.begin_run("merge")
+
+    failed = []
+    merged_keys = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {lang: executor.submit(merge_language, lang, store, reviewed_dir, backups,
+                                         source_translations, glossary)
+                   for lang in languages}
+        for lang, future in futures.items():
+            try:
+                changes, rejected = future.result()
+            except (OSError, ValueError) as e:
+                print(f"  ❌ {lang}: {e}")
+                failed.append(lang)
+                continue
+            merged_keys[lang] = [key for key, _, _ in changes]
+            for key, old, new in changes:
+                print(f"  {lang} {key}: '{old}' → '{new}'")
+            for violations in rejected.values():
+                for violation in violations:
+                    print(f"  📖 {lang} kept current value, review broke the glossary: {format_violation(violation)}")
+            print(f"  {'🔄' if changes else '✅'} {lang}: {len(changes)} changes merged")
+
+    store.close()
+    record_merged(merged_keys, source_translations)
+    if backups.id:
+        removed_runs, removed_blobs = backup_store.prune(args.keep_runs)
+        print(f"📋 Backup run {backups.id}: {', '.join(sorted(backups.languages))}"
+              + (f" (pruned {removed_runs} old runs, {removed_blobs} blobs)" if removed_runs or removed_blobs else ""))
+
+    finish_run(args.report, args.metrics_textfile)
+
+    if failed:
+        print(f"⚠️  Failed languages: {', '.join(failed)}")
         sys.exit(1)
 
-    # Load files
-    with open(original_file, 'r', encoding='utf-8') as f:
-        original = json.load(f)
-
-    with open(reviewed_file, 'r', encoding='utf-8') as f:
-        reviewed = json.load(f)
-
-    # Create backup
-    backup_dir = localization_dir / "backups"
-    backup_dir.mkdir(exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = backup_dir / f"{lang}_{timestamp}.json"
-    shutil.copy2(original_file, backup_file)
-    print(f"📋 Backup created: {backup_file}")
-
-    # Merge reviewed translations into original
-    changes = 0
-    for key, value in reviewed.items():
-        if key in original and original[key] != value:
-            print(f"  {key}: '{original[key]}' → '{value}'")
-            original[key] = value
-            changes += 1
-
-    if changes == 0:
-        print("  ✅ No changes to merge")
-        return
-
-    # Save updated file
-    with open(original_file, 'w', encoding='utf-8') as f:
-        json.dump(original, f, ensure_ascii=False, indent=2)
-
-    print(f"✅ Merged {changes} changes into {original_file}")
-
 
 if __name__ == "__main__":
     main()
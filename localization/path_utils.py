@@ -2,13 +2,16 @@
 """Path utilities for localization scripts"""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def get_project_root():
     """
     Get the absolute path to the project root directory.
     This works by finding the directory containing 'index.html' and 'assets' folder.
+    The result is cached, so repeated calls in one process don't touch the filesystem.
     """
     # Start from the current script location
     current_dir = Path(__file__).parent.absolute()
@@ -41,6 +44,11 @@ def get_locales_dir():
     return get_project_root() / "assets" / "js" / "i18n" / "locales"
 
 
+def get_bundles_dir():
+    """Get the absolute path to the built (minified, content-hashed) locale bundles"""
+    return get_project_root() / "assets" / "js" / "i18n" / "dist"
+
+
 def get_localization_dir():
     """Get the absolute path to the localization directory"""
     return get_project_root() / "localization"
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+In-process localization pipeline
+
+Runs the extract → review → merge → qa → bundle → prerender stages in one Python process. Each
+(stage, language) pair is a node in a build graph (see build_graph.py):
+nodes whose input files are unchanged since their last successful run
+are skipped, and independent per-language chains run in parallel.
+
+Each locale is read at most once, from the consolidated locale store
+(see locale_store.py), and the data structures are passed directly
+between stages; the intermediate important_fields/ and
+reviewed_fields/ files are still written so every stage can also be
+inspected or run on its own. The review backend (see backends.py) is
+only created when the review stage actually sends a request.
+
+The qa stage (see validate_locales.py) is a gate: a language whose merged
+locale has errors blocks the bundle and its own pages, its broken keys are
+queued for retranslation, and every finding goes to localization/qa_report.json
+(languages whose qa node is up to date keep the findings of their last check).
+
+How long each node took is added to the run telemetry (telemetry.py) as
+stage time per language, next to the review requests themselves.
+"""
+
+import json
+import threading
+from functools import partial
+
+from backends import get_backend
+from backup_store import DEFAULT_KEEP_RUNS, BackupStore
+from build_graph import BuildGraph, Node
+from bundle_locales import MANIFEST_NAME, bundle_locales
+from config import CONTEXT
+from extract_fields import extract_important_fields, save_important_fields
+from file_utils import atomic_write_json
+from fuzzy_memory import load_hints
+from glossary import Glossary, format_violation
+from locale_store import SNAPSHOT_NAME, LocaleStore
+from merge_back import merge_reviewed, record_merged
+from path_utils import get_bundles_dir, get_locales_dir, get_localization_dir
+from prerender import SOURCE_LANGUAGE, add_render_nodes
+from rate_limiter import RateLimiter
+from review_cache import ReviewCache
+from review_with_gpt import SYSTEM_PROMPT, cache_model, review_languages
+from telemetry import get_telemetry
+from validate_locales import build_report, get_report_path, keys_to_retranslate, load_report, merge_findings, queue_retranslation, validate_locale
+
+STAGES = ("extract", "review", "merge", "qa", "bundle", "prerender")
+
+
+def load_json(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class PipelineData:
+    """Per-language data shared between stages, loaded from disk only when a stage needs it"""
+
+    def __init__(self, locales_dir=None, localization_dir=None):
+        self.locales_dir = locales_dir or get_locales_dir()
+        self.localization_dir = localization_dir or get_localization_dir()
+        self.fields_dir = self.localization_dir / "important_fields"
+        self.reviewed_dir = self.localization_dir / "reviewed_fields"
+        self.locales = {}
+        self.fields = {}
+        self.reviewed = {}
+        self.store = LocaleStore.open(self.locales_dir, self.localization_dir / SNAPSHOT_NAME)
+        # Every merge of this run is backed up into one run of the backup store
+        self.backup_store = BackupStore(self.localization_dir / "backups")
+        self.backups = self.backup_store.begin_run("pipeline")
+        self.glossary = Glossary.load(self.localization_dir / "glossary.json")
+        self.qa = {}
+        self.merged = {}  # lang -> keys whose reviewed value was merged
+        self._lock = threading.Lock()
+
+    def locale_file(self, lang):
+        return self.locales_dir / f"{lang}.json"
+
+    def fields_file(self, lang):
+        return self.fields_dir / f"{lang}.json"
+
+    def reviewed_file(self, lang):
+        return self.reviewed_dir / f"{lang}.json"
+
+    def _get(self, store, lang, file_path):
+        with self._lock:
+            if lang not in store:
+                store[lang] = load_json(file_path)
+            return store[lang]
+
+    def locale(self, lang):
+        with self._lock:
+            if lang not in self.locales:
+                self.locales[lang] = self.store.locale(lang)
+            return self.locales[lang]
+
+    def important_fields(self, lang):
+        return self._get(self.fields, lang, self.fields_file(lang))
+
+    def reviewed_fields(self, lang):
+        return self._get(self.reviewed, lang, self.reviewed_file(lang))
+
+
+def extract_language(data, lang):
+    """Extract important fields for one locale"""
+    important = extract_important_fields(data.locale(lang), source_translations=data.locale(SOURCE_LANGUAGE),
+                                         glossary=data.glossary, lang=lang)
+    data.fields_dir.mkdir(exist_ok=True)
+    save_important_fields(important, data.fields_file(lang))
+    data.fields[lang] = important
+    print(f"  🔍 {lang}: extracted {len(important)} fields")
+
+
+def review_language(data, lang, workers=8, chunk_tokens=2000, limiter=None, cache=None, backend="openai"):
+    """Review one locale's important fields with GPT"""
+    fields = data.important_fields(lang)
+    hints = load_hints().get(lang)
+    reviewed_by_language, errors, unreviewed = review_languages(
+        {lang: fields}, workers=workers, chunk_tokens=chunk_tokens, limiter=limiter, cache=cache,
+        hints={lang: hints} if hints else None, backend=get_backend(backend),
+    )
+    if lang in errors:
+        raise errors[lang]
+
+    reviewed = reviewed_by_language[lang]
+    data.reviewed_dir.mkdir(exist_ok=True)
+    with open(data.reviewed_file(lang), 'w', encoding='utf-8') as f:
+        json.dump(reviewed, f, ensure_ascii=False, indent=2)
+    data.reviewed[lang] = reviewed
+
+    changes = sum(1 for key in fields if key in reviewed and fields[key] != reviewed[key])
+    print(f"  🤖 {lang}: reviewed {len(fields)} fields, {changes} corrections")
+    if lang in unreviewed:
+        print(f"  ⚠️  {lang}: {len(unreviewed[lang])} fields not reviewed, kept as translated")
+
+
+def merge_language(data, lang):
+    """Merge one locale's reviewed fields back into its locale file (backed up first if it changes)"""
+    original_file = data.locale_file(lang)
+    reviewed = data.reviewed_fields(lang)
+    original = data.locale(lang)
+
+    # Reviews that break a glossary term the current value keeps are not merged
+    if data.glossary:
+        reviewed, rejected = data.glossary.guard_review(data.locale(SOURCE_LANGUAGE), original, reviewed, lang)
+        get_telemetry().count("glossary_rejected", len(rejected), lang=lang)
+        for violations in rejected.values():
+            for violation in violations:
+                print(f"  📖 {lang} kept current value, review broke the glossary: {format_violation(violation)}")
+
+    changes = merge_reviewed(original, reviewed)
+    data.merged[lang] = [key for key, _, _ in changes]
+    get_telemetry().count("changes", len(changes), lang=lang)
+    for key, old, new in changes:
+        print(f"  {lang} {key}: '{old}' → '{new}'")
+    if changes:
+        data.backups.add(lang, original_file)
+        data.store.replace(lang, original)
+        data.store.export([lang])
+    print(f"  🔄 {lang}: {len(changes)} changes merged")
+
+
+def qa_language(data, lang):
+    """Validate one locale against the source; raises when it has errors, blocking its bundle and pages"""
+    issues = validate_locale(lang, data.locale(SOURCE_LANGUAGE), data.locale(lang), data.glossary)
+    data.qa[lang] = issues
+    errors = sum(1 for found in issues if found["severity"] == "error")
+    get_telemetry().count("qa_errors", errors, lang=lang)
+    get_telemetry().count("qa_warnings", len(issues) - errors, lang=lang)
+    if errors:
+        raise ValueError(f"{errors} QA errors (see {get_report_path()})")
+    print(f"  🔍 {lang}: QA passed ({len(issues)} warnings)")
+
+
+def build_pipeline_graph(languages, steps=STAGES, workers=8, chunk_tokens=2000, use_cache=True, data=None,
+                         backend="openai"):
+    """One node per (stage, language); each language's chain is independent of the others"""
+    data = data or PipelineData()
+    config_file = data.localization_dir / "config.py"
+    graph = BuildGraph()
+
+    # One limiter and cache shared by every review node
+    limiter = RateLimiter(rate=None, max_concurrency=workers)
+    cache = ReviewCache(cache_model(backend), SYSTEM_PROMPT, CONTEXT) if use_cache else None
+
+    # The merge and QA nodes each language's bundle and pages have to wait for
+    gates = {}
+
+    for lang in languages:
+        previous = []
+
+        if "extract" in steps:
+            graph.add(Node(
+                f"extract:{lang}", partial(extract_language, data, lang),
+                inputs=[data.locale_file(lang), data.locale_file(SOURCE_LANGUAGE), config_file,
+                        data.localization_dir / "glossary.json"],
+                outputs=[data.fields_file(lang)],
+            ))
+            previous = [f"extract:{lang}"]
+
+        if "review" in steps:
+            graph.add(Node(
+                f"review:{lang}",
+                partial(review_language, data, lang, workers=workers, chunk_tokens=chunk_tokens,
+                        limiter=limiter, cache=cache, backend=backend),
+                inputs=[data.fields_file(lang), config_file],
+                outputs=[data.reviewed_file(lang)],
+                deps=previous,
+            ))
+            previous = [f"review:{lang}"]
+
+        if "merge" in steps:
+            graph.add(Node(
+                f"merge:{lang}", partial(merge_language, data, lang),
+                inputs=[data.reviewed_file(lang)],
+                outputs=[data.locale_file(lang)],
+                deps=previous,
+            ))
+            previous = [f"merge:{lang}"]
+
+        if "qa" in steps and lang != SOURCE_LANGUAGE:
+            graph.add(Node(
+                f"qa:{lang}", partial(qa_language, data, lang),
+                inputs=[data.locale_file(lang), data.locale_file(SOURCE_LANGUAGE),
+                        data.localization_dir / "glossary.json"],
+                deps=previous,
+            ))
+
+        gates[lang] = [name for name in (f"merge:{lang}", f"qa:{lang}") if name in graph.nodes]
+
+    if "bundle" in steps:
+        # One node rebuilds the bundles of every language once all merges passed QA
+        graph.add(Node(
+            "bundle", partial(bundle_locales, languages, data.locales_dir, store=data.store),
+            inputs=[data.locale_file(lang) for lang in languages],
+            outputs=[get_bundles_dir() / MANIFEST_NAME],
+            deps=[dep for lang in languages for dep in gates[lang]],
+        ))
+
+    if "prerender" in steps:
+        # Each language's pages only wait for that language's merge and QA
+        add_render_nodes(
+            graph, [lang for lang in languages if lang != SOURCE_LANGUAGE],
+            deps_for=lambda lang: gates[lang], store=data.store,
+        )
+
+    return graph, cache, limiter
+
+
+def node_stage(name):
+    """(stage, language) of a node name such as review:it, render:it/index.html or bundle"""
+    stage, _, target = name.partition(":")
+    return stage, target.split("/", 1)[0] or None
+
+
+def run_pipeline(languages, steps=STAGES, workers=8, chunk_tokens=2000, use_cache=True,
+                 jobs=4, force=False, backend="openai", keep_backup_runs=DEFAULT_KEEP_RUNS):
+    """
+    Run the requested stages for `languages`, `jobs` nodes at a time.
+    Up-to-date nodes are skipped unless `force` is set.
+    Returns a list of languages that failed.
+    """
+    data = PipelineData()
+    graph, cache, limiter = build_pipeline_graph(
+        languages, steps=steps, workers=workers, chunk_tokens=chunk_tokens, use_cache=use_cache,
+        data=data, backend=backend,
+    )
+    status = graph.run(workers=jobs, force=force)
+    data.store.close()
+
+    if data.backups.id:
+        removed_runs, _ = data.backup_store.prune(keep_backup_runs)
+        print(f"  📋 Backup run {data.backups.id}: {', '.join(sorted(data.backups.languages))}"
+              + (f" ({removed_runs} old runs pruned)" if removed_runs else ""))
+
+    telemetry = get_telemetry()
+    for name, seconds in graph.durations.items():
+        stage, lang = node_stage(name)
+        telemetry.add_stage_time(stage, lang, seconds)
+    for name, result in status.items():
+        telemetry.count(f"steps_{result}", lang=node_stage(name)[1])
+    telemetry.add_counters("provider", limiter.stats())
+
+    # Merged reviews reflect the current source; recorded before QA queues what is still broken
+    record_merged(data.merged, data.locale(SOURCE_LANGUAGE))
+
+    if "qa" in steps:
+        queued = {lang: keys_to_retranslate(issues) for lang, issues in data.qa.items()}
+        queued = {lang: keys for lang, keys in queued.items() if keys}
+        queue_retranslation(queued)
+        # Languages whose qa node was up to date keep their findings from the last report
+        issues, all_queued = merge_findings(load_report(), data.qa, queued, data.store.languages)
+        report = build_report(SOURCE_LANGUAGE, issues, all_queued)
+        atomic_write_json(report, get_report_path())
+        print(f"  🔍 QA: {report['errors']} errors, {report['warnings']} warnings in {len(issues)} locales "
+              f"({len(data.qa)} checked this run)"
+              + (f", {sum(len(keys) for keys in queued.values())} keys queued for retranslation" if queued else ""))
+
+    if cache:
+        cache.save()
+        telemetry.add_counters("review_cache", {"hits": cache.hits, "misses": cache.misses})
+        print(f"  🗃️  Review cache: {cache.hits} fields reused, {cache.misses} sent for review")
+
+    ran = sum(1 for result in status.values() if result == "ran")
+    skipped = sum(1 for result in status.values() if result == "skipped")
+    print(f"\n📊 {ran} steps ran, {skipped} up to date")
+
+    return sorted({node_stage(name)[1] for name, result in status.items()
+                   if ":" in name and result in ("failed", "blocked")})
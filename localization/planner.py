@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Cost/time planning, priority scheduling and budgets for translate_website.py
+
+Segments are scheduled by priority: IMPORTANT_FIELDS first (in config
+order), then every other string, shortest first, so navigation and labels
+are never left untranslated because a budget ran out on long paragraphs.
+Each language's batches are interleaved round-robin, so the highest
+priority batches of every language go out before the rest.
+
+A Budget caps the characters (or the cost) sent to the provider. Once a
+batch does not fit, it and every batch after it are skipped: the run
+finishes cleanly and the skipped keys stay pending for the next
+--changed-only run.
+
+estimate_plan() turns a translation plan into requests, characters,
+tokens, cost and expected wall time per language, for --plan.
+"""
+
+import json
+import math
+import threading
+from itertools import zip_longest
+
+from config import IMPORTANT_FIELDS
+from telemetry import estimate_text_tokens, get_report_path
+
+# List price of common MT APIs (USD per million characters); pass your own with --price-per-million-chars
+DEFAULT_PRICE_PER_MILLION_CHARS = 20.0
+
+# Assumed request latency when no earlier run report exists
+DEFAULT_REQUEST_SECONDS = 1.0
+
+
+def priority_key(important_fields=IMPORTANT_FIELDS):
+    """Sort key for segments: important fields in config order, then shortest text first"""
+    rank = {key: i for i, key in enumerate(important_fields)}
+
+    def key(segment):
+        if segment.key in rank:
+            return (0, rank[segment.key], segment.index or 0)
+        return (1, len(segment.text), 0)
+
+    return key
+
+
+def prioritize(segments, important_fields=IMPORTANT_FIELDS):
+    """Segments in scheduling order (stable for equal priorities)"""
+    return sorted(segments, key=priority_key(important_fields))
+
+
+def submission_order(batches_by_language):
+    """
+    Interleave {code: [batch, ...]} round-robin across languages.
+    Yields (code, batch) with every language's first batch before any second one.
+    """
+    rounds = zip_longest(*([(code, batch) for batch in batches] for code, batches in batches_by_language.items()))
+    for round_batches in rounds:
+        for item in round_batches:
+            if item is not None:
+                yield item
+
+
+def batch_chars(batch):
+    return sum(len(segment.text) for segment in batch)
+
+
+class Budget:
+    """Thread-safe character/cost budget; once a batch is refused, all later ones are too"""
+
+    def __init__(self, max_chars=None, max_cost=None, price_per_million_chars=DEFAULT_PRICE_PER_MILLION_CHARS):
+        self.max_chars = max_chars
+        self.max_cost = max_cost
+        self.price_per_char = price_per_million_chars / 1_000_000
+        self.used_chars = 0
+        self.exhausted = False
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return self.max_chars is not None or self.max_cost is not None
+
+    @property
+    def cost(self):
+        return self.used_chars * self.price_per_char
+
+    def reserve(self, chars):
+        """Claim `chars` characters; False (and exhausted from now on) if they do not fit"""
+        with self._lock:
+            if self.exhausted:
+                return False
+            total = self.used_chars + chars
+            if (self.max_chars is not None and total > self.max_chars) or \
+                    (self.max_cost is not None and total * self.price_per_char > self.max_cost):
+                self.exhausted = True
+                return False
+            self.used_chars = total
+            return True
+
+
+def last_request_seconds(report_path=None):
+    """Median translate request latency of the last run (telemetry.py), or a default"""
+    try:
+        with open(report_path or get_report_path("translate_website"), 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        median = report["requests"]["translate"]["latency_s"]["p50"]
+    except (FileNotFoundError, KeyError, ValueError, TypeError):
+        median = None
+    return median or DEFAULT_REQUEST_SECONDS
+
+
+def estimate_wall_time(requests, workers, rate=None, request_seconds=DEFAULT_REQUEST_SECONDS):
+    """Seconds to send `requests` with `workers` in flight and at most `rate` per second"""
+    if not requests:
+        return 0.0
+    by_concurrency = math.ceil(requests / max(1, workers)) * request_seconds
+    by_rate = requests / rate if rate else 0.0
+    return max(by_concurrency, by_rate)
+
+
+def estimate_plan(plans, workers, rate=None, price_per_million_chars=DEFAULT_PRICE_PER_MILLION_CHARS,
+                  request_seconds=None, budget=None):
+    """
+    Estimate {code: LanguagePlan} (see translate_website.plan_jobs).
+    Returns {"languages": {code: estimate}, "total": estimate}; with a `budget`,
+    each estimate also says how many of its segments fit within it.
+    """
+    request_seconds = request_seconds or last_request_seconds()
+    price_per_char = price_per_million_chars / 1_000_000
+
+    within = {code: 0 for code in plans}
+    if budget:
+        for code, batch in submission_order({code: plan.batches for code, plan in plans.items()}):
+            if budget.reserve(batch_chars(batch)):
+                within[code] += len(batch)
+
+    languages = {}
+    for code, plan in plans.items():
+        chars = sum(batch_chars(batch) for batch in plan.batches)
+        to_send = sum(len(batch) for batch in plan.batches)
+        estimate = {
+            "segments": plan.segments,
+            "unique_segments": len(plan.unique),
+            "resolved_locally": len(plan.unique) - to_send,
+            "segments_to_send": to_send,
+            "requests": len(plan.batches),
+            "chars": chars,
+            "tokens": estimate_text_tokens(chars),
+            "cost": round(chars * price_per_char, 4),
+            "wall_s": round(estimate_wall_time(len(plan.batches), workers, rate, request_seconds), 1),
+        }
+        if budget:
+            estimate["segments_within_budget"] = within[code]
+        languages[code] = estimate
+
+    total = {name: sum(estimate[name] for estimate in languages.values())
+             for name in ("segments", "unique_segments", "resolved_locally", "segments_to_send", "requests", "chars", "tokens")}
+    total["cost"] = round(total["chars"] * price_per_char, 4)
+    # All languages share one pool, so the run takes as long as all requests together
+    total["wall_s"] = round(estimate_wall_time(total["requests"], workers, rate, request_seconds), 1)
+    total["request_seconds"] = round(request_seconds, 3)
+    if budget:
+        total["segments_within_budget"] = sum(within.values())
+
+    return {"languages": languages, "total": total}
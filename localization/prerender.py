@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Pre-render translated HTML pages at build time
+
+For every locale, renders each page template that has [data-translate]
+elements to /<lang>/<page> with those elements already filled in (the
+same way translator.js applies them), <html lang/dir> set, and relative
+asset URLs rewritten so they still resolve one directory down. Templates
+with nothing to translate (portfolio-details.html, service-details.html,
+starter-page.html) are skipped rather than copied untranslated. Visitors of /<lang>/ get the
+translated text in the first paint, with no fetch-and-DOM-walk on the
+critical path.
+
+The language selector in translator.js navigates to /<lang>/<page> (or
+back to the root page for English) and remembers the choice; the root
+index.html sends a returning visitor straight to the pre-rendered copy
+of their stored language. Only languages listed in that page's redirect
+script are followed, and the list is rewritten here before the pages are
+rendered, so a stale or unsupported stored code never leads to a 404.
+
+Pages are build-graph nodes (see build_graph.py): a page is only
+re-rendered when the page template, its locale or translator.js changed.
+
+Usage:
+    python prerender.py
+    python prerender.py --languages "it,es" --force
+"""
+
+import argparse
+import html
+import re
+from functools import partial
+from html.parser import HTMLParser
+
+from build_graph import BuildGraph, Node
+from file_utils import atomic_write_text
+from locale_store import LocaleStore
+from path_utils import get_locales_dir, get_project_root
+
+PAGES = ["index.html", "portfolio-details.html", "service-details.html", "starter-page.html"]
+SOURCE_LANGUAGE = "en"
+RTL_LANGUAGES = {"ar"}  # Same as Translator.setLanguage
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+URL_ATTRIBUTES = {"href", "src", "action", "poster", "data-src"}
+TRANSLATABLE = re.compile(r"\sdata-translate\s*=")
+REDIRECT_LANGUAGES = re.compile(r"(var prerendered = )\[[^\]]*\]")
+REDIRECT_PAGE = "index.html"
+ABSOLUTE_URL = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|//|/|#|%23|\?)", re.IGNORECASE)
+CSS_URL = re.compile(r"url\((['\"]?)([^'\")]*)\1\)")
+
+
+def count_supported_languages(translator_js):
+    """Number of entries in Translator.supportedLanguages (used for {count})"""
+    return len(re.findall(r"\{\s*code:\s*'[^']+'", translator_js))
+
+
+def translatable_pages(pages=PAGES):
+    """Page templates with at least one [data-translate] element; the rest are skipped with a log line"""
+    root = get_project_root()
+    translatable = []
+    for page in pages:
+        page_file = root / page
+        if page_file.exists() and TRANSLATABLE.search(page_file.read_text(encoding='utf-8')):
+            translatable.append(page)
+        else:
+            print(f"  ⏭️  Not pre-rendering {page}: no [data-translate] elements")
+    return translatable
+
+
+def relocate_url(url, prefix, pages=PAGES):
+    """Prefix a relative URL so it resolves from the language subdirectory"""
+    value = url.strip()
+    if not value or ABSOLUTE_URL.match(value):
+        return url
+    page = value.split("#", 1)[0].split("?", 1)[0]
+    if page in pages:
+        # Links between rendered pages stay inside the language directory
+        return url
+    return prefix + value
+
+
+def relocate_css(css, prefix, pages=PAGES):
+    return CSS_URL.sub(lambda m: f"url({m.group(1)}{relocate_url(m.group(2), prefix, pages)}{m.group(1)})", css)
+
+
+class PageRenderer(HTMLParser):
+    """Streams an HTML page back out, substituting translations for [data-translate] contents"""
+
+    def __init__(self, translations, lang, language_count, url_prefix="../", pages=PAGES):
+        super().__init__(convert_charrefs=False)
+        self.translations = translations
+        self.lang = lang
+        self.language_count = language_count
+        self.url_prefix = url_prefix
+        self.pages = pages  # Pages that have a copy in the language directory
+        self.out = []
+        # While replacing an element's content: (tag name, nesting depth)
+        self.skipping = None
+        self.in_style = False
+        self.source = ""
+        self.line_starts = [0]
+
+    def render(self, source):
+        self.source = source
+        self.line_starts = [0] + [i + 1 for i, char in enumerate(source) if char == "\n"]
+        self.feed(source)
+        self.close()
+        return "".join(self.out)
+
+    def translated_content(self, key):
+        """Mirror Translator.applyTranslations: HTML values go in raw, plain text is escaped"""
+        value = self.translations.get(key)
+        if not isinstance(value, str) or not value:
+            return None
+        if key == "language-selector-header":
+            value = value.replace("{count}", str(self.language_count))
+        if "<" in value or ">" in value:
+            return value
+        return html.escape(value, quote=False)
+
+    def source_offset(self):
+        """Offset in the source of the token being handled"""
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def format_starttag(self, tag, attrs, self_closing=False):
+        parts = [tag]
+        for name, value in attrs:
+            if value is None:
+                parts.append(name)
+            else:
+                parts.append(f'{name}="{html.escape(value, quote=True)}"')
+        return "<" + " ".join(parts) + (" />" if self_closing else ">")
+
+    def rewrite_attrs(self, tag, attrs):
+        rewritten = []
+        for name, value in attrs:
+            if value is not None:
+                if name in URL_ATTRIBUTES:
+                    value = relocate_url(value, self.url_prefix, self.pages)
+                elif name == "style":
+                    value = relocate_css(value, self.url_prefix, self.pages)
+            rewritten.append((name, value))
+
+        attrs_dict = dict(rewritten)
+        if tag == "html":
+            attrs_dict["lang"] = self.lang
+            attrs_dict["dir"] = "rtl" if self.lang in RTL_LANGUAGES else "ltr"
+            # Tells translator.js the text is already rendered for this language
+            attrs_dict["data-prerendered-lang"] = self.lang
+        elif tag == "body" and self.lang in RTL_LANGUAGES:
+            classes = (attrs_dict.get("class") or "").split()
+            if "rtl" not in classes:
+                classes.append("rtl")
+            attrs_dict["class"] = " ".join(classes)
+
+        return list(attrs_dict.items())
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, self_closing=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, self_closing=True)
+
+    def _start(self, tag, attrs, self_closing):
+        if self.skipping:
+            skip_tag, depth = self.skipping
+            if tag == skip_tag and not self_closing and tag not in VOID_ELEMENTS:
+                self.skipping = (skip_tag, depth + 1)
+            return
+
+        rewritten = self.rewrite_attrs(tag, attrs)
+        if rewritten == attrs:
+            # Keep untouched tags byte-for-byte
+            self.out.append(self.get_starttag_text())
+        else:
+            self.out.append(self.format_starttag(tag, rewritten, self_closing))
+        attrs = rewritten
+        if tag == "head":
+            # Asset and locale fetches made by translator.js resolve from the site root
+            self.out.append('\n  <script>window.translatorBasePath = new URL("../", window.location.href).href;</script>')
+        if tag == "style":
+            self.in_style = True
+
+        key = dict(attrs).get("data-translate")
+        if key and not self_closing and tag not in VOID_ELEMENTS:
+            content = self.translated_content(key)
+            if content is not None:
+                self.out.append(content)
+                self.skipping = (tag, 1)
+
+    def handle_endtag(self, tag):
+        if self.skipping:
+            skip_tag, depth = self.skipping
+            if tag != skip_tag:
+                return
+            if depth > 1:
+                self.skipping = (skip_tag, depth - 1)
+                return
+            self.skipping = None
+
+        if tag == "style":
+            self.in_style = False
+        self.out.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        if self.skipping:
+            return
+        self.out.append(relocate_css(data, self.url_prefix, self.pages) if self.in_style else data)
+
+    def handle_entityref(self, name):
+        if not self.skipping:
+            # "R&D" is reported as an entity too; only re-add the ";" if the source had one
+            end = self.source_offset() + 1 + len(name)
+            terminator = ";" if self.source[end:end + 1] == ";" else ""
+            self.out.append(f"&{name}{terminator}")
+
+    def handle_charref(self, name):
+        if not self.skipping:
+            end = self.source_offset() + 2 + len(name)
+            terminator = ";" if self.source[end:end + 1] == ";" else ""
+            self.out.append(f"&#{name}{terminator}")
+
+    def handle_comment(self, data):
+        if not self.skipping:
+            self.out.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self.out.append(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self.out.append(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self.out.append(f"<![{data}]>")
+
+
+def render_page(source, translations, lang, language_count, pages=PAGES):
+    """Render one page template for one language; links to other `pages` stay in the language directory"""
+    return PageRenderer(translations, lang, language_count, pages=pages).render(source)
+
+
+def render_node(store, page_file, translator_file, output_file, lang, pages=PAGES):
+    translations = store.locale(lang)
+    language_count = count_supported_languages(translator_file.read_text(encoding='utf-8'))
+    rendered = render_page(page_file.read_text(encoding='utf-8'), translations, lang, language_count, pages)
+    atomic_write_text(rendered, output_file)
+    print(f"  🖨️  {lang}/{page_file.name}")
+
+
+def redirect_languages(store, languages):
+    """Languages of `store` that are rendered now or already have a pre-rendered root page"""
+    rendered = {path.parent.name for path in get_project_root().glob(f"*/{REDIRECT_PAGE}")}
+    return sorted(lang for lang in set(languages) | rendered if lang != SOURCE_LANGUAGE and lang in store)
+
+
+def update_redirect_languages(store, page_file, languages):
+    """Write the allow-list of pre-rendered languages into the root page's redirect script"""
+    source = page_file.read_text(encoding='utf-8')
+    listed = "[" + ", ".join(f"'{lang}'" for lang in redirect_languages(store, languages)) + "]"
+    updated = REDIRECT_LANGUAGES.sub(lambda m: m.group(1) + listed, source, count=1)
+    if updated != source:
+        atomic_write_text(updated, page_file)
+        print(f"  🔀 {page_file.name} redirects to {listed}")
+
+
+def add_render_nodes(graph, languages, pages=PAGES, deps_for=None, store=None):
+    """
+    Add one `render:<lang>/<page>` node per (language, translatable page) to `graph`,
+    after a `redirects` node that updates the root page's list of pre-rendered languages.
+    `deps_for(lang)`, when given, returns the nodes a language's pages wait for.
+    Locales are read from `store` (a LocaleStore, opened on demand).
+    """
+    pages = translatable_pages(pages)
+    root = get_project_root()
+    locales_dir = get_locales_dir()
+    store = store or LocaleStore.open(locales_dir)
+    translator_file = root / "assets" / "js" / "i18n" / "translator.js"
+
+    redirects = []
+    if REDIRECT_PAGE in pages:
+        redirect_file = root / REDIRECT_PAGE
+        graph.add(Node(
+            "redirects",
+            partial(update_redirect_languages, store, redirect_file, languages),
+            inputs=[*sorted(locales_dir.glob("*.json")), __file__],
+            outputs=[redirect_file],
+        ))
+        redirects = ["redirects"]
+
+    for lang in languages:
+        locale_file = locales_dir / f"{lang}.json"
+        for page in pages:
+            page_file = root / page
+            output_file = root / lang / page
+            graph.add(Node(
+                f"render:{lang}/{page}",
+                partial(render_node, store, page_file, translator_file, output_file, lang, pages),
+                inputs=[page_file, locale_file, translator_file, __file__],
+                outputs=[output_file],
+                deps=[*(deps_for(lang) if deps_for else ()), *(redirects if page == REDIRECT_PAGE else ())],
+            ))
+    return graph
+
+
+def build_prerender_graph(languages=None, pages=PAGES):
+    """One build node per (language, translatable page)"""
+    store = LocaleStore.open()
+    if languages is None:
+        languages = [lang for lang in store.languages if lang != SOURCE_LANGUAGE]
+    return add_render_nodes(BuildGraph(), languages, pages, store=store)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render translated HTML pages")
+    parser.add_argument("--languages", help="Comma-separated languages (default: every locale except en)")
+    parser.add_argument("--jobs", type=int, default=4, help="Pages rendered in parallel (default: 4)")
+    parser.add_argument("--force", action="store_true", help="Re-render pages even if their inputs are unchanged")
+
+    args = parser.parse_args()
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+
+    print("🖨️  Pre-rendering translated pages...")
+    status = build_prerender_graph(languages).run(workers=args.jobs, force=args.force)
+
+    pages = {name: result for name, result in status.items() if name.startswith("render:")}
+    rendered = sum(1 for result in pages.values() if result == "ran")
+    skipped = sum(1 for result in pages.values() if result == "skipped")
+    failed = [name for name, result in status.items() if result == "failed"]
+    print(f"✅ Rendered {rendered} pages, {skipped} up to date")
+
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Adaptive rate limiting for translation/review provider calls
+
+Combines a token bucket (requests per second) with an AIMD concurrency
+limit: every success slowly raises the number of requests allowed in
+flight, every 429/timeout halves it. Retryable failures are retried with
+jittered exponential backoff, and all retries/fallbacks are counted so
+runs can report them instead of silently shipping source text.
+"""
+
+import random
+import threading
+import time
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def error_status(exc):
+    """HTTP status carried by an SDK exception, if any"""
+    for attr in ("status_code", "status", "http_status", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_throttled(exc):
+    """True for 429 / rate-limit responses"""
+    if error_status(exc) == 429:
+        return True
+    message = str(exc).lower()
+    return "429" in message or "rate limit" in message or "too many requests" in message
+
+
+def is_timeout(exc):
+    """True for client or server timeouts"""
+    if isinstance(exc, TimeoutError) or "timeout" in type(exc).__name__.lower():
+        return True
+    if error_status(exc) == 408:
+        return True
+    message = str(exc).lower()
+    return "timed out" in message or "timeout" in message
+
+
+def is_retryable(exc):
+    """Throttling, timeouts and transient server errors are worth retrying"""
+    return is_throttled(exc) or is_timeout(exc) or error_status(exc) in RETRYABLE_STATUS
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class AIMDConcurrency:
+    """Concurrency limit with additive increase / multiplicative decrease"""
+
+    def __init__(self, initial, minimum=1, maximum=None, decrease_factor=0.5):
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.limit = float(max(minimum, min(initial, self.maximum)))
+        self.decrease_factor = decrease_factor
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled=False):
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            else:
+                # Roughly +1 after a full window of successes at the current limit
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """Shared limiter for provider calls: token bucket + AIMD concurrency + retries"""
+
+    def __init__(self, rate=10.0, burst=None, max_concurrency=8, max_retries=5,
+                 base_delay=0.5, max_delay=30.0):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.concurrency = AIMDConcurrency(max_concurrency, maximum=max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "throttled": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "fallbacks": 0,
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, fn, *args, **kwargs):
+        """Run `fn` under the rate limits, retrying retryable errors; re-raises the last error"""
+        attempt = 0
+        while True:
+            if self.bucket:
+                self.bucket.acquire()
+            self.concurrency.acquire()
+            self._count("requests")
+
+            throttled = False
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttled(e) or is_timeout(e)
+                if is_throttled(e):
+                    self._count("throttled")
+                elif is_timeout(e):
+                    self._count("timeouts")
+
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+            finally:
+                self.concurrency.release(throttled=throttled)
+
+            self._count("retries")
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def record_fallback(self, segments=1):
+        """Count segments that fell back to the source text"""
+        self._count("fallbacks", segments)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats["concurrency_limit"] = round(self.concurrency.limit, 2)
+        return stats
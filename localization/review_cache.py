@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Skip-if-unchanged cache for the GPT review stage
+
+Reviews are cached under a hash of everything that shapes the prompt:
+model, system prompt, context, language, the field values and any fuzzy
+match hints for them. A whole
+payload that was reviewed before is reused without any API call; when
+only some fields changed, per-field entries let review_with_gpt.py send
+just those fields.
+
+A review's output is also cached as a known-good input of its own: once
+merge_back.py applied a correction, the next run extracts the corrected
+value and finds it reviewed already.
+"""
+
+import hashlib
+import json
+import threading
+
+from file_utils import atomic_write_json
+from path_utils import get_localization_dir
+
+CACHE_NAME = "review_cache.json"
+
+
+def get_cache_path():
+    """Get the absolute path to the review cache"""
+    return get_localization_dir() / CACHE_NAME
+
+
+def prompt_hash(*parts):
+    """Hash JSON-serializable prompt inputs"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ReviewCache:
+    """JSON-backed cache of whole-payload and per-field review results"""
+
+    def __init__(self, model, system_prompt, context, path=None):
+        self.path = path or get_cache_path()
+        self.prompt_inputs = (model, system_prompt, context)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        self.payloads = data.get("payloads", {})
+        self.fields = data.get("fields", {})
+
+    def _payload_key(self, language, translations, hints=None):
+        hints = {key: hints[key] for key in translations if key in hints} if hints else None
+        # Unhinted payloads hash exactly as before hints existed
+        if hints:
+            return prompt_hash(*self.prompt_inputs, language, translations, hints)
+        return prompt_hash(*self.prompt_inputs, language, translations)
+
+    def _field_key(self, language, key, value, hint=None):
+        if hint:
+            return prompt_hash(*self.prompt_inputs, language, key, value, hint)
+        return prompt_hash(*self.prompt_inputs, language, key, value)
+
+    def get_payload(self, language, translations, hints=None):
+        """Reviewed output for exactly these fields, or None"""
+        with self._lock:
+            entry = self.payloads.get(language)
+            payload_key = self._payload_key(language, translations, hints)
+            if entry is None or payload_key not in (entry["hash"], entry.get("reviewed_hash")):
+                return None
+            self.hits += len(translations)
+            return entry["reviewed"]
+
+    def put_payload(self, language, translations, reviewed, hints=None):
+        """Remember the latest whole-payload review of a language (also matched by the reviewed output)"""
+        with self._lock:
+            self.payloads[language] = {
+                "hash": self._payload_key(language, translations, hints),
+                "reviewed_hash": self._payload_key(language, reviewed, hints),
+                "reviewed": reviewed,
+            }
+            self._dirty = True
+
+    def split_fields(self, language, translations, hints=None):
+        """Return ({key: cached reviewed value}, {key: value} still to review)"""
+        hints = hints or {}
+        cached = {}
+        pending = {}
+        with self._lock:
+            for key, value in translations.items():
+                entry = self.fields.get(self._field_key(language, key, value, hints.get(key)))
+                if entry is None:
+                    pending[key] = value
+                    self.misses += 1
+                else:
+                    cached[key] = entry["reviewed"]
+                    self.hits += 1
+        return cached, pending
+
+    def put_fields(self, language, translations, reviewed, hints=None):
+        """
+        Store the reviewed value of every field GPT returned, under its input and
+        under the reviewed value itself (a merged correction needs no second review)
+        """
+        hints = hints or {}
+        with self._lock:
+            for key, value in translations.items():
+                if key in reviewed:
+                    self.fields[self._field_key(language, key, value, hints.get(key))] = {"reviewed": reviewed[key]}
+                    self.fields[self._field_key(language, key, reviewed[key], hints.get(key))] = {"reviewed": reviewed[key]}
+            self._dirty = True
+
+    def save(self):
+        """Persist the cache if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            atomic_write_json({"payloads": self.payloads, "fields": self.fields}, self.path)
+            self._dirty = False
@@ -1,21 +1,116 @@
 #!/usr/bin/env python3
-"""Review translations with GPT"""
+"""
+Review translations with GPT
+
+Usage:
+    python review_with_gpt.py es
+    python review_with_gpt.py es,it,fr,de --workers 16
+    python review_with_gpt.py es --chunk-tokens 1500
+    python review_with_gpt.py es --no-cache
+    python review_with_gpt.py es,it --backend local   # offline, see backends.py
+
+All languages are reviewed concurrently over one pooled OpenAI client.
+Large field sets are split into token-budgeted chunks that are reviewed
+in parallel and merged back in key order. Fields whose prompt inputs
+are unchanged since their last review are served from
+localization/review_cache.json without an API call.
+
+When translate_website.py found a close earlier translation of a field's
+source text (localization/fuzzy_hints.json), that match is included in
+the prompt so the review can keep the established wording. Matches it
+reused as the translation are flagged, so the review checks them
+against the edited source.
+
+Reviews are streamed: each field is parsed, checked (it must keep the
+shape of its current value) and cached as soon as it arrives. Fields
+the response left out, garbled or got wrong are re-requested on their
+own (MAX_REVIEW_ATTEMPTS requests per chunk in total); fields that still
+fail keep their current translation and are reported, instead of the
+whole language failing.
+
+Request latency, prompt size, cache hits and review time per language
+are written to localization/telemetry/review_with_gpt.json
+(--metrics-textfile also exports them for Prometheus).
+"""
 
+import argparse
 import json
-import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from backends import get_backend
 from config import CONTEXT
-from openai import OpenAI
+from fuzzy_memory import load_hints
 from path_utils import get_localization_dir
+from rate_limiter import RateLimiter
+from review_cache import ReviewCache
+from telemetry import finish_run, get_telemetry, start_run
+
+REVIEW_MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are an expert translator. Return only corrected JSON."
+REVIEW_BACKENDS = ("openai", "local")
+# Requests per chunk: the first one plus re-requests of fields that came back missing or invalid
+MAX_REVIEW_ATTEMPTS = 3
+
+
+def cache_model(backend_name):
+    """Model name the review cache is keyed on; non-OpenAI reviews never mix with real ones"""
+    return REVIEW_MODEL if backend_name == "openai" else f"{backend_name}:{REVIEW_MODEL}"
+
+
+def estimate_tokens(value):
+    """Rough token count of a JSON value (~4 characters per token)"""
+    return len(json.dumps(value, ensure_ascii=False)) // 4 + 1
+
 
+def chunk_fields(translations, max_tokens=2000):
+    """Split {key: value} into ordered chunks of at most ~max_tokens each"""
+    chunks = []
+    current = {}
+    current_tokens = 0
 
-def review_with_gpt(translations, language):
-    """Send translations to GPT for review"""
+    for key, value in translations.items():
+        tokens = estimate_tokens({key: value})
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current)
+            current = {}
+            current_tokens = 0
 
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        current[key] = value
+        current_tokens += tokens
 
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def describe_hint(hint):
+    previous = {"previous_source": hint["source"], "previous_translation": hint["translation"]}
+    if hint.get("reused"):
+        previous["reused"] = True
+    return previous
+
+
+def format_hints(hints):
+    """Prompt section listing earlier translations of similar source text"""
+    previous = {
+        key: {f"item {index}": describe_hint(item) for index, item in hint["items"].items()}
+        if "items" in hint else describe_hint(hint)
+        for key, hint in hints.items()
+    }
+    return f"""
+For reference, earlier translations of similar source text (keep their wording where the meaning is unchanged).
+Entries marked "reused" are the current translation, copied from that earlier text without retranslating:
+check that they match the new source (numbers, negations, names) and correct them if not:
+
+{json.dumps(previous, ensure_ascii=False, indent=2)}
+"""
+
+
+def review_prompt(translations, language, hints=None):
     prompt = f"""{CONTEXT}
 
 TARGET LANGUAGE: {language}
@@ -24,61 +119,235 @@ Please review and correct these translations. Return ONLY the corrected JSON:
 
 {json.dumps(translations, ensure_ascii=False, indent=2)}
 """
+    if hints:
+        prompt += format_hints(hints)
+    return prompt
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are an expert translator. Return only corrected JSON."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.1
-    )
 
-    # Extract JSON from response
-    content = response.choices[0].message.content.strip()
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0].strip()
+def valid_review(original, reviewed):
+    """A reviewed value must keep the shape of the value it replaces"""
+    if isinstance(original, list):
+        return isinstance(reviewed, list) and len(reviewed) == len(original) and \
+            all(isinstance(item, str) for item in reviewed)
+    if isinstance(original, str):
+        return isinstance(reviewed, str) and (bool(reviewed.strip()) or not original.strip())
+    return type(reviewed) is type(original)
+
+
+def review_with_gpt(translations, language, backend=None, limiter=None, hints=None, on_field=None,
+                    attempts=MAX_REVIEW_ATTEMPTS):
+    """
+    Stream a GPT review of translations. Every valid field is passed to
+    `on_field(key, value)` as soon as it arrives; fields the response left out or
+    got wrong are re-requested on their own, up to `attempts` requests.
+    Returns {key: reviewed value} for the fields that came back valid.
+    """
+
+    backend = backend or get_backend("openai")
+    hints = hints or {}
+    telemetry = get_telemetry()
+    accepted = {}
 
-    return json.loads(content)
+    def request():
+        # Built on every call, so a retry (also the limiter's) only resends what is still missing
+        pending = {key: value for key, value in translations.items() if key not in accepted}
+        prompt = review_prompt(pending, language, {key: hints[key] for key in pending if key in hints})
+        chars = len(SYSTEM_PROMPT) + len(prompt)
+        started = time.perf_counter()
+        try:
+            for key, value in backend.review_stream(pending, prompt, SYSTEM_PROMPT, REVIEW_MODEL):
+                if key in pending and key not in accepted and valid_review(pending[key], value):
+                    accepted[key] = value
+                    if on_field:
+                        on_field(key, value)
+                else:
+                    telemetry.count("review_invalid_fields", lang=language)
+        except Exception:
+            telemetry.record_request("review", language, time.perf_counter() - started, chars, ok=False)
+            raise
+        telemetry.record_request("review", language, time.perf_counter() - started, chars)
+
+    error = None
+    for attempt in range(attempts):
+        if attempt:
+            telemetry.count("review_retried_fields", len(translations) - len(accepted), lang=language)
+        received = len(accepted)
+        try:
+            if limiter:
+                limiter.call(request)
+            else:
+                request()
+            error = None
+        except Exception as e:
+            error = e
+            if len(accepted) == received:
+                # No progress: a broken stream is worth resuming, a failing request is not
+                break
+        if len(accepted) == len(translations):
+            break
+
+    if translations and not accepted:
+        raise error or ValueError(f"no valid review field in {attempts} attempts")
+    return accepted
+
+
+def review_languages(fields_by_language, workers=8, chunk_tokens=2000, limiter=None, cache=None, hints=None,
+                     backend=None):
+    """
+    Review {lang: {key: value}} for all languages concurrently.
+    Every (language, chunk) pair is one request; at most `workers` are in flight.
+    With a `cache`, unchanged payloads and fields are reused and only the rest is sent.
+    `hints` ({lang: {key: hint}}) adds fuzzy-match references to the prompts.
+    Reviewed fields are cached as they stream in. Fields that never came back valid
+    keep their current value and are listed in `unreviewed`.
+    Returns ({lang: reviewed}, {lang: error}, {lang: [unreviewed key, ...]}) with
+    reviewed chunks merged in key order.
+    """
+    limiter = limiter or RateLimiter(rate=None, max_concurrency=workers)
+    hints = hints or {}
+    telemetry = get_telemetry()
+    started = time.perf_counter()
+
+    cached_fields = {}
+    chunks = {}
+    for lang, fields in fields_by_language.items():
+        cached_fields[lang] = {}
+        pending = fields
+        if cache:
+            payload = cache.get_payload(lang, fields, hints.get(lang))
+            if payload is not None:
+                cached_fields[lang] = payload
+                pending = {}
+            else:
+                cached_fields[lang], pending = cache.split_fields(lang, fields, hints.get(lang))
+        chunks[lang] = chunk_fields(pending, chunk_tokens)
+        telemetry.count("review_cache_hits", len(cached_fields[lang]), lang=lang)
+        telemetry.count("review_cache_misses", len(pending), lang=lang)
+
+    chunk_results = {lang: [None] * len(lang_chunks) for lang, lang_chunks in chunks.items()}
+    remaining = {lang: len(lang_chunks) for lang, lang_chunks in chunks.items()}
+    errors = {}
+    unreviewed = {}
+
+    if any(chunks.values()):
+        backend = backend or get_backend("openai")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {}
+            for lang, lang_chunks in chunks.items():
+                for index, chunk in enumerate(lang_chunks):
+                    on_field = None
+                    if cache:
+                        def on_field(key, value, lang=lang, chunk=chunk):
+                            cache.put_fields(lang, {key: chunk[key]}, {key: value}, hints.get(lang))
+                    future = executor.submit(review_with_gpt, chunk, lang, backend, limiter, hints.get(lang), on_field)
+                    futures[future] = (lang, index)
+
+            for future in as_completed(futures):
+                lang, index = futures[future]
+                remaining[lang] -= 1
+                if remaining[lang] == 0:
+                    # Wall time until the language's last chunk came back
+                    telemetry.add_stage_time("review", lang, time.perf_counter() - started)
+                try:
+                    chunk_results[lang][index] = future.result()
+                except Exception as e:
+                    errors.setdefault(lang, e)
+                    continue
+
+                missing = [key for key in chunks[lang][index] if key not in chunk_results[lang][index]]
+                if missing:
+                    unreviewed.setdefault(lang, []).extend(missing)
+                    telemetry.count("review_unreviewed_fields", len(missing), lang=lang)
+
+    reviewed = {}
+    for lang, fields in fields_by_language.items():
+        if lang in errors:
+            continue
+
+        merged = {}
+        for result in chunk_results[lang]:
+            merged.update(result)
+
+        # Keep the original field order, with cached and freshly reviewed fields interleaved;
+        # unreviewed fields keep their current value
+        ordered = {key: merged.get(key, cached_fields[lang].get(key, fields[key])) for key in fields}
+        ordered.update({key: value for key, value in merged.items() if key not in ordered})
+        reviewed[lang] = ordered
+
+        if cache and lang not in unreviewed:
+            cache.put_payload(lang, fields, ordered, hints.get(lang))
+
+    return reviewed, errors, unreviewed
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python review_with_gpt.py <language>")
-        print("Example: python review_with_gpt.py es")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Review translations with GPT")
+    parser.add_argument("languages", help="Language or comma-separated languages (e.g. 'es' or 'es,it,fr')")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum number of review requests in flight (default: 8)")
+    parser.add_argument("--chunk-tokens", type=int, default=2000, help="Approximate token budget per review request (default: 2000)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-review every field even if its inputs are unchanged")
+    parser.add_argument("--backend", choices=REVIEW_BACKENDS, default="openai", help="Review backend (default: openai)")
+    parser.add_argument("--report", help="JSON run report (default: localization/telemetry/review_with_gpt.json)")
+    parser.add_argument("--metrics-textfile", help="Also write the run metrics as a Prometheus textfile")
 
-    lang = sys.argv[1]
+    args = parser.parse_args()
+    telemetry = start_run("review_with_gpt")
+    languages = [lang.strip() for lang in args.languages.split(',') if lang.strip()]
 
-    # Check OpenAI API key
-    if not os.getenv("OPENAI_API_KEY"):
-        print("❌ Please set OPENAI_API_KEY environment variable")
+    try:
+        backend = get_backend(args.backend)
+    except (ImportError, ValueError) as e:
+        print(f"❌ {e}")
         sys.exit(1)
 
-    print(f"🤖 Reviewing {lang} translations with GPT...")
+    print(f"🤖 Reviewing {', '.join(languages)} translations with GPT...")
 
     # Get absolute paths
     localization_dir = get_localization_dir()
 
     # Load extracted translations
-    input_file = localization_dir / "important_fields" / f"{lang}.json"
-    if not input_file.exists():
-        print(f"❌ File not found: {input_file}")
-        print(f"📁 Looking in: {localization_dir / 'important_fields'}")
-        sys.exit(1)
+    fields_by_language = {}
+    failed = []
+    for lang in languages:
+        input_file = localization_dir / "important_fields" / f"{lang}.json"
+        if not input_file.exists():
+            print(f"❌ File not found: {input_file}")
+            print(f"📁 Looking in: {localization_dir / 'important_fields'}")
+            failed.append(lang)
+            continue
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        translations = json.load(f)
+        with open(input_file, 'r', encoding='utf-8') as f:
+            fields_by_language[lang] = json.load(f)
 
-    # Review with GPT
-    try:
-        reviewed = review_with_gpt(translations, lang)
+    # Review with GPT, reusing cached reviews for unchanged inputs
+    cache = None if args.no_cache else ReviewCache(cache_model(args.backend), SYSTEM_PROMPT, CONTEXT)
+    limiter = RateLimiter(rate=None, max_concurrency=args.workers)
+    reviewed_by_language, errors, unreviewed = review_languages(
+        fields_by_language, workers=args.workers, chunk_tokens=args.chunk_tokens, limiter=limiter, cache=cache,
+        hints=load_hints(), backend=backend,
+    )
+    telemetry.add_counters("provider", limiter.stats())
+    if cache:
+        cache.save()
+        telemetry.add_counters("review_cache", {"hits": cache.hits, "misses": cache.misses})
+        print(f"🗃️  Review cache: {cache.hits} fields reused, {cache.misses} sent for review")
+
+    output_dir = localization_dir / "reviewed_fields"
+    output_dir.mkdir(exist_ok=True)
+
+    for lang in fields_by_language:
+        print(f"\n🌐 {lang}")
+
+        if lang in errors:
+            print(f"❌ Error: {errors[lang]}")
+            failed.append(lang)
+            continue
+
+        translations = fields_by_language[lang]
+        reviewed = reviewed_by_language[lang]
 
         # Save reviewed translations
-        output_dir = localization_dir / "reviewed_fields"
-        output_dir.mkdir(exist_ok=True)
         output_file = output_dir / f"{lang}.json"
-
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(reviewed, f, ensure_ascii=False, indent=2)
 
@@ -94,10 +363,15 @@ def main():
         else:
             print(f"  📝 Made {changes} changes")
 
+        if lang in unreviewed:
+            print(f"  ⚠️  {len(unreviewed[lang])} fields not reviewed, kept as translated: {', '.join(unreviewed[lang])}")
+
         print(f"✅ Saved to {output_file}")
 
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    finish_run(args.report, args.metrics_textfile)
+
+    if failed:
+        print(f"\n❌ Review failed for: {', '.join(failed)}")
         sys.exit(1)
 
 
@@ -1,30 +1,57 @@
 #!/usr/bin/env python3
-"""Run the complete translation review workflow"""
-
+"""
+Run the complete translation review workflow
+
+Usage:
+    python run_all.py
+    python run_all.py es,it,fr,de
+    python run_all.py es,it --steps extract,review
+    python run_all.py es,it --steps merge --workers 16
+    python run_all.py es,it,fr,de --jobs 8 --force
+    python run_all.py es,it --steps bundle,prerender
+    python run_all.py es,it --steps qa        # validate the locales only (see validate_locales.py)
+    python run_all.py es,it --backend local   # review offline, see backends.py
+    python run_all.py es,it --metrics-textfile /var/lib/node_exporter/l10n.prom
+
+All steps run in this process (see pipeline.py); each locale is loaded once.
+Steps whose input files are unchanged since their last successful run are
+skipped, and each language's extract → review → merge → qa chain runs in
+parallel before the locale bundles for translator.js are rebuilt and the
+translated /<lang>/ pages are pre-rendered. A language that fails QA
+blocks the bundles and its own pages until it is fixed, and makes the
+run exit non-zero. Time per step and language,
+review requests and cache hits are written to
+localization/telemetry/run_all.json.
+"""
+
+import argparse
 import os
-import subprocess
 import sys
-from pathlib import Path
 
+from backup_store import DEFAULT_KEEP_RUNS
 from path_utils import get_localization_dir
-
-
-def run_script(script_name, args=[]):
-    """Run a Python script from the localization directory"""
-    localization_dir = get_localization_dir()
-    script_path = localization_dir / script_name
-
-    if not script_path.exists():
-        print(f"❌ Script not found: {script_path}")
-        return False
-
-    cmd = [sys.executable, str(script_path)] + args
-    print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd)
-    return result.returncode == 0
+from pipeline import STAGES, run_pipeline
+from review_with_gpt import REVIEW_BACKENDS
+from telemetry import finish_run, start_run
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the translation review workflow")
+    parser.add_argument("languages", nargs="?", default="es,it,fr,de", help="Comma-separated languages (default: es,it,fr,de)")
+    parser.add_argument("--steps", default=",".join(STAGES), help=f"Comma-separated steps to run (default: {','.join(STAGES)})")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum number of review requests in flight (default: 8)")
+    parser.add_argument("--chunk-tokens", type=int, default=2000, help="Approximate token budget per review request (default: 2000)")
+    parser.add_argument("--jobs", type=int, default=4, help="Maximum number of steps running in parallel (default: 4)")
+    parser.add_argument("--force", action="store_true", help="Run every step even if its inputs are unchanged")
+    parser.add_argument("--no-cache", action="store_true", help="Re-review every field even if its inputs are unchanged")
+    parser.add_argument("--backend", choices=REVIEW_BACKENDS, default="openai", help="Review backend (default: openai)")
+    parser.add_argument("--keep-backup-runs", type=int, default=DEFAULT_KEEP_RUNS, help=f"Backup runs to keep (default: {DEFAULT_KEEP_RUNS})")
+    parser.add_argument("--report", help="JSON run report (default: localization/telemetry/run_all.json)")
+    parser.add_argument("--metrics-textfile", help="Also write the run metrics as a Prometheus textfile")
+
+    args = parser.parse_args()
+    start_run("run_all")
+
     print("🚀 Translation Review Workflow")
     print("="*35)
 
@@ -32,44 +59,46 @@ def main():
     localization_dir = get_localization_dir()
     print(f"📁 Working from localization directory: {localization_dir}")
 
+    steps = [step.strip() for step in args.steps.split(',') if step.strip()]
+    unknown = [step for step in steps if step not in STAGES]
+    if unknown:
+        print(f"❌ Unknown steps: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+        sys.exit(1)
+
     # Check OpenAI API key
-    if not os.getenv("OPENAI_API_KEY"):
+    if "review" in steps and args.backend == "openai" and not os.getenv("OPENAI_API_KEY"):
         print("❌ Please set OPENAI_API_KEY environment variable")
         print("   export OPENAI_API_KEY='your-key-here'")
         sys.exit(1)
 
     # Get languages to process
-    if len(sys.argv) > 1:
-        languages = sys.argv[1].split(',')
-    else:
-        languages = ['es', 'it', 'fr', 'de']  # Default languages
+    languages = [lang.strip() for lang in args.languages.split(',') if lang.strip()]
 
     print(f"Languages: {', '.join(languages)}")
-
-    # Step 1: Extract important fields
-    print("\n1️⃣  Extracting important fields...")
-    if not run_script("extract_fields.py"):
-        print("❌ Extraction failed")
+    print(f"Steps: {', '.join(steps)}")
+
+    failed = run_pipeline(
+        languages,
+        steps=steps,
+        workers=args.workers,
+        chunk_tokens=args.chunk_tokens,
+        use_cache=not args.no_cache,
+        jobs=args.jobs,
+        force=args.force,
+        backend=args.backend,
+        keep_backup_runs=args.keep_backup_runs,
+    )
+
+    finish_run(args.report, args.metrics_textfile)
+
+    print(f"📁 Backups saved in: {localization_dir / 'backups'} (see backup_store.py --list)")
+
+    if failed:
+        # Failed merges and QA gates block their bundles and pages, so they fail the run too
+        print(f"\n❌ Failed languages: {', '.join(failed)}")
         sys.exit(1)
 
-    # Step 2: Review each language with GPT
-    print("\n2️⃣  Reviewing with GPT...")
-    for lang in languages:
-        print(f"\n   Reviewing {lang}...")
-        if not run_script("review_with_gpt.py", [lang]):
-            print(f"❌ Review failed for {lang}")
-            continue
-
-    # Step 3: Merge back into original files
-    print("\n3️⃣  Merging back...")
-    for lang in languages:
-        print(f"\n   Merging {lang}...")
-        if not run_script("merge_back.py", [lang]):
-            print(f"❌ Merge failed for {lang}")
-            continue
-
     print("\n🎉 Workflow complete!")
-    print(f"📁 Backups saved in: {localization_dir / 'backups'}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Source fingerprint manifest for incremental translation
+
+Records, for every locale, the hash of each source (en.json) value at the
+time that locale was translated. Comparing it with the current source
+tells exactly which keys were added, edited or removed since.
+
+The manifest (localization/source_manifest.json) describes the committed
+locales, so it is committed next to them: a fresh clone or a CI job gets
+the same --changed-only baseline as the machine that translated them.
+"""
+
+import hashlib
+import json
+
+from file_utils import atomic_write_json
+from path_utils import get_localization_dir
+
+MANIFEST_NAME = "source_manifest.json"
+
+
+def get_manifest_path():
+    """Get the absolute path to the source manifest"""
+    return get_localization_dir() / MANIFEST_NAME
+
+
+def fingerprint(value):
+    """Stable short hash of a source value (string or list)"""
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_manifest(path=None):
+    """Load {lang: {key: fingerprint}}; a missing manifest is empty"""
+    path = path or get_manifest_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest, path=None):
+    """Save the manifest with stable ordering so diffs stay readable"""
+    atomic_write_json(manifest, path or get_manifest_path(), sort_keys=True)
+
+
+def diff_source(source_translations, target_translations, fingerprints):
+    """
+    Compare the current source with what a locale was translated from.
+
+    A key needs translation when it is missing from the target file, or when
+    its recorded fingerprint differs from the current source value. Keys that
+    exist in the target but were never fingerprinted are assumed up to date.
+    Returns ({key: source_value} to translate, [keys removed from the source]).
+    """
+    changed = {}
+    for key, value in source_translations.items():
+        if key not in target_translations:
+            changed[key] = value
+        elif key in fingerprints and fingerprints[key] != fingerprint(value):
+            changed[key] = value
+
+    removed = [key for key in target_translations if key not in source_translations]
+    return changed, removed
+
+
+def record_language(manifest, lang, source_translations, keys=None):
+    """Record the current source fingerprints of `keys` (default: all keys) for a locale"""
+    fingerprints = manifest.setdefault(lang, {})
+    for key in (source_translations if keys is None else keys):
+        if key in source_translations:
+            fingerprints[key] = fingerprint(source_translations[key])
+
+    # Forget keys that no longer exist in the source
+    for key in [key for key in fingerprints if key not in source_translations]:
+        del fingerprints[key]
+
+    return manifest
+
+
+def mark_stale(manifest, lang, keys):
+    """Flag keys whose locale value does not reflect the source (e.g. failed translations)"""
+    fingerprints = manifest.setdefault(lang, {})
+    for key in keys:
+        # Never equal to a real fingerprint, so the next diff picks the key up again
+        fingerprints[key] = None
+    return manifest
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Structured run telemetry for the localization scripts
+
+Each script starts a run with start_run(), and the modules it uses
+record into the shared instance returned by get_telemetry():
+
+    record_request(operation, lang, seconds, chars)  one provider call
+    count(name, amount, lang)                        cache hits, fallbacks, ...
+    stage(name, lang) / add_stage_time(...)          time spent per stage and language
+    add_counters(prefix, mapping)                    run-wide stats (rate limiter, caches)
+
+At the end the script writes a JSON run report (default:
+localization/telemetry/<script>.json) and, with --metrics-textfile, a
+Prometheus textfile for node_exporter's textfile collector.
+
+Tokens are estimated as ~4 characters per token, the same heuristic the
+review chunker uses.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from file_utils import atomic_write_json, atomic_write_text
+from path_utils import get_localization_dir
+
+REPORTS_DIR = "telemetry"
+METRIC_PREFIX = "l10n"
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def estimate_text_tokens(chars):
+    """Rough token count for `chars` characters of text"""
+    return chars // 4 + 1 if chars else 0
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def get_report_path(script):
+    """Get the absolute path to a script's latest run report"""
+    return get_localization_dir() / REPORTS_DIR / f"{script}.json"
+
+
+class RequestStats:
+    """Latency samples and payload counters of one (operation, language)"""
+
+    def __init__(self):
+        self.latencies = []
+        self.chars = 0
+        self.tokens = 0
+        self.failures = 0
+
+    def bucket_counts(self):
+        """Cumulative counts per LATENCY_BUCKETS bound, as Prometheus expects"""
+        return [sum(1 for latency in self.latencies if latency <= bound) for bound in LATENCY_BUCKETS]
+
+    def summary(self):
+        return {
+            "requests": len(self.latencies),
+            "failures": self.failures,
+            "chars": self.chars,
+            "tokens": self.tokens,
+            "seconds": round(sum(self.latencies), 3),
+            "latency_s": {
+                name: round(value, 4) if value is not None else None
+                for name, value in (("p50", percentile(self.latencies, 0.50)),
+                                    ("p95", percentile(self.latencies, 0.95)),
+                                    ("p99", percentile(self.latencies, 0.99)),
+                                    ("max", max(self.latencies, default=None)))
+            },
+            "histogram": dict(zip((str(bound) for bound in LATENCY_BUCKETS), self.bucket_counts())),
+        }
+
+
+class RunTelemetry:
+    """Thread-safe collector for one script run"""
+
+    def __init__(self, script=None):
+        self.script = script
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self.requests = defaultdict(RequestStats)   # (operation, lang) -> RequestStats
+        self.counters = defaultdict(int)            # (name, lang) -> value
+        self.stages = defaultdict(float)            # (stage, lang) -> seconds
+        self.run_counters = {}                      # prefix -> {name: value}
+        self._lock = threading.Lock()
+
+    def record_request(self, operation, lang, seconds, chars=0, ok=True):
+        """Record one provider call (including any retries the limiter made)"""
+        with self._lock:
+            stats = self.requests[(operation, lang)]
+            stats.latencies.append(seconds)
+            stats.chars += chars
+            stats.tokens += estimate_text_tokens(chars)
+            if not ok:
+                stats.failures += 1
+
+    def count(self, name, amount=1, lang=None):
+        with self._lock:
+            self.counters[(name, lang)] += amount
+
+    def add_stage_time(self, name, lang, seconds):
+        with self._lock:
+            self.stages[(name, lang)] += seconds
+
+    @contextmanager
+    def stage(self, name, lang=None):
+        """Time a block as part of a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, lang, time.perf_counter() - started)
+
+    def add_counters(self, prefix, mapping):
+        """Attach run-wide numbers, e.g. RateLimiter.stats() or TranslationMemory.stats()"""
+        with self._lock:
+            self.run_counters[prefix] = {name: value for name, value in mapping.items()
+                                         if isinstance(value, (int, float))}
+
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def report(self):
+        """The run as a JSON-serializable dict, with per-language breakdowns"""
+        with self._lock:
+            languages = defaultdict(lambda: {"requests": {}, "counters": {}, "stages": {}})
+            totals = defaultdict(RequestStats)
+
+            for (operation, lang), stats in sorted(self.requests.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+                languages[lang or "all"]["requests"][operation] = stats.summary()
+                total = totals[operation]
+                total.latencies.extend(stats.latencies)
+                total.chars += stats.chars
+                total.tokens += stats.tokens
+                total.failures += stats.failures
+
+            for (name, lang), value in self.counters.items():
+                languages[lang or "all"]["counters"][name] = value
+            for (name, lang), seconds in self.stages.items():
+                languages[lang or "all"]["stages"][name] = round(seconds, 3)
+
+            return {
+                "script": self.script,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_s": round(self.elapsed(), 3),
+                "requests": {operation: stats.summary() for operation, stats in totals.items()},
+                "languages": {lang: languages[lang] for lang in sorted(languages)},
+                "run": dict(self.run_counters),
+            }
+
+    def slowest_languages(self, limit=3):
+        """[(lang, seconds)] with the most time spent in provider calls"""
+        with self._lock:
+            seconds = defaultdict(float)
+            for (_, lang), stats in self.requests.items():
+                if lang:
+                    seconds[lang] += sum(stats.latencies)
+        return sorted(seconds.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def write_report(self, path=None):
+        path = path or get_report_path(self.script or "run")
+        atomic_write_json(self.report(), path)
+        return path
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        script = self.script or "run"
+
+        def labels(**values):
+            pairs = [f'{name}="{value}"' for name, value in values.items() if value is not None]
+            return "{" + ",".join(pairs) + "}"
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for suffix, sample_labels, value in samples:
+                lines.append(f"{METRIC_PREFIX}_{name}{suffix}{labels(script=script, **sample_labels)} {value}")
+
+        with self._lock:
+            requests = sorted(self.requests.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+            histogram = []
+            for (operation, lang), stats in requests:
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts()):
+                    histogram.append(("_bucket", {"operation": operation, "lang": lang, "le": bound}, count))
+                histogram.append(("_bucket", {"operation": operation, "lang": lang, "le": "+Inf"}, len(stats.latencies)))
+                histogram.append(("_sum", {"operation": operation, "lang": lang}, round(sum(stats.latencies), 6)))
+                histogram.append(("_count", {"operation": operation, "lang": lang}, len(stats.latencies)))
+            metric("request_duration_seconds", "histogram", "Provider call latency, including retries", histogram)
+
+            for name, attribute, help_text in (("request_chars_total", "chars", "Characters sent to the provider"),
+                                               ("request_tokens_total", "tokens", "Estimated tokens sent to the provider"),
+                                               ("request_failures_total", "failures", "Provider calls that failed after retries")):
+                metric(name, "counter", help_text,
+                       [("", {"operation": operation, "lang": lang}, getattr(stats, attribute))
+                        for (operation, lang), stats in requests])
+
+            metric("events_total", "counter", "Cache hits, fallbacks and other per-language events",
+                   [("", {"event": name, "lang": lang}, value)
+                    for (name, lang), value in sorted(self.counters.items(), key=lambda item: (item[0][0], item[0][1] or ""))])
+            metric("stage_seconds", "gauge", "Time spent in each stage",
+                   [("", {"stage": name, "lang": lang}, round(seconds, 6))
+                    for (name, lang), seconds in sorted(self.stages.items(), key=lambda item: (item[0][0], item[0][1] or ""))])
+            metric("run_counter", "gauge", "Run-wide counters (rate limiter, caches)",
+                   [("", {"source": prefix, "name": name}, value)
+                    for prefix, values in sorted(self.run_counters.items()) for name, value in sorted(values.items())])
+
+        metric("run_duration_seconds", "gauge", "Wall time of the run", [("", {}, round(self.elapsed(), 3))])
+        metric("run_timestamp_seconds", "gauge", "Start of the run (Unix time)", [("", {}, int(self.started_at.timestamp()))])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Atomic, so the textfile collector never scrapes a half-written file
+        atomic_write_text(self.prometheus_text(), path)
+        return path
+
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def start_run(script):
+    """Start collecting for a new run of `script`; returns the shared collector"""
+    global _current
+    with _current_lock:
+        _current = RunTelemetry(script)
+        return _current
+
+
+def get_telemetry():
+    """The collector of the current run (created on first use when no run was started)"""
+    global _current
+    with _current_lock:
+        if _current is None:
+            _current = RunTelemetry()
+        return _current
+
+
+def finish_run(report_path=None, metrics_textfile=None):
+    """Write the JSON report (and the Prometheus textfile, if asked) and print where they went"""
+    telemetry = get_telemetry()
+    path = telemetry.write_report(report_path)
+    print(f"📈 Run report: {path}")
+    slowest = telemetry.slowest_languages()
+    if slowest:
+        print(f"🐢 Most provider time: {', '.join(f'{lang} {seconds:.1f}s' for lang, seconds in slowest)}")
+    if metrics_textfile:
+        telemetry.write_prometheus(metrics_textfile)
+        print(f"📈 Prometheus metrics: {metrics_textfile}")
+    return path
@@ -0,0 +1,11 @@
+"""
+Tests for the localization scripts. They import the scripts as top-level
+modules, like the scripts import each other, and only use the local backend.
+
+    cd localization && python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+import pytest
+
+from backends import JSONObjectStream, LocalBackend, LocalBackendError, parse_json_response, review_response_format
+
+
+def feed_in_pieces(text, size):
+    stream = JSONObjectStream()
+    members = []
+    for start in range(0, len(text), size):
+        members.extend(stream.feed(text[start:start + size]))
+    return stream, members
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000])
+def test_stream_yields_every_member_however_the_text_is_split(size):
+    text = '```json\n{"a": "x, {y}", "b": ["1", "2"], "c": {"d": "]"}, "e": "say \\"hi\\""}\n```'
+    stream, members = feed_in_pieces(text, size)
+    assert members == [("a", "x, {y}"), ("b", ["1", "2"]), ("c", {"d": "]"}), ("e", 'say "hi"')]
+    assert stream.done
+    assert stream.invalid == 0
+
+
+def test_stream_yields_members_before_the_object_is_closed():
+    stream = JSONObjectStream()
+    assert stream.feed('{"a": "1", "b"') == [("a", "1")]
+    assert not stream.done
+    assert stream.feed(': "2"}') == [("b", "2")]
+    assert stream.done
+
+
+def test_stream_skips_and_counts_malformed_members():
+    stream, members = feed_in_pieces('{"a": "1", "b": oops, "c": "3"}', 4)
+    assert members == [("a", "1"), ("c", "3")]
+    assert stream.invalid == 1
+
+
+def test_stream_ignores_text_after_the_object():
+    stream = JSONObjectStream()
+    assert stream.feed('{"a": "1"} {"b": "2"}') == [("a", "1")]
+    assert stream.feed('{"c": "3"}') == []
+
+
+def test_truncated_stream_is_not_done():
+    stream, members = feed_in_pieces('{"a": "1", "b": "tru', 3)
+    assert members == [("a", "1")]
+    assert not stream.done
+
+
+def test_parse_json_response_accepts_a_fence():
+    assert parse_json_response('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse_json_response(' {"a": 1} ') == {"a": 1}
+
+
+def test_review_response_format_by_model():
+    translations = {"title": "Titolo", "items": ["a", "b"]}
+    schema = review_response_format("gpt-4o-mini", translations)
+    assert schema["type"] == "json_schema"
+    assert schema["json_schema"]["schema"]["required"] == ["title", "items"]
+    assert schema["json_schema"]["schema"]["properties"]["items"] == {"type": "array", "items": {"type": "string"}}
+
+    assert review_response_format("gpt-4o", {f"k{i}": "v" for i in range(101)}) == {"type": "json_object"}
+    assert review_response_format("gpt-3.5-turbo", translations) == {"type": "json_object"}
+    assert review_response_format("some-other-model", translations) is None
+
+
+def test_local_backend_translates_and_reviews():
+    backend = LocalBackend()
+    assert backend.translate_batch(["Hello", "World"], "en-US", "it-IT") == ["[it-IT] Hello", "[it-IT] World"]
+    assert backend.review({"a": "x"}, "prompt", "system", "model") == {"a": "x"}
+    assert list(backend.review_stream({"a": "x"}, "prompt", "system", "model")) == [("a", "x")]
+    assert backend.requests == 3
+
+
+def test_local_backend_injects_failures():
+    with pytest.raises(LocalBackendError) as raised:
+        LocalBackend(error_rate=1.0).translate_batch(["Hello"], "en-US", "it-IT")
+    assert raised.value.status_code == 503
+
+    with pytest.raises(LocalBackendError) as raised:
+        LocalBackend(throttle_rate=1.0).translate_batch(["Hello"], "en-US", "it-IT")
+    assert raised.value.status_code == 429
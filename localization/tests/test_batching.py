@@ -0,0 +1,54 @@
+from batching import Segment, dedupe_segments, flatten_segments, pack_batches, rebuild_content
+
+
+def test_flatten_segments_splits_lists_and_skips_preserved_keys():
+    items = {
+        "title": "Hello",
+        "tags": ["One", 2, "Three"],
+        "multilingual-typed": ["Ciao", "Hola"],
+        "count": 3,
+    }
+    assert flatten_segments(items) == [
+        Segment("title", None, "Hello"),
+        Segment("tags", 0, "One"),
+        Segment("tags", 2, "Three"),
+    ]
+
+
+def test_dedupe_segments_keeps_the_first_of_each_normalized_text():
+    segments = [
+        Segment("a", None, "Send message"),
+        Segment("b", None, "Send  message "),
+        Segment("c", 1, "Send message"),
+        Segment("d", None, "Other"),
+    ]
+    unique, copies = dedupe_segments(segments)
+    assert unique == [segments[0], segments[3]]
+    assert copies == {segments[0]: [segments[1], segments[2]]}
+
+
+def test_pack_batches_respects_segment_and_character_limits():
+    segments = [Segment(f"k{i}", None, "x" * 10) for i in range(7)]
+    assert [len(batch) for batch in pack_batches(segments, max_segments=3, max_chars=1000)] == [3, 3, 1]
+    assert [len(batch) for batch in pack_batches(segments, max_segments=50, max_chars=25)] == [2, 2, 2, 1]
+
+
+def test_pack_batches_gives_an_oversized_segment_its_own_batch():
+    segments = [Segment("a", None, "x" * 5), Segment("b", None, "y" * 100), Segment("c", None, "z" * 5)]
+    assert [[segment.key for segment in batch] for batch in pack_batches(segments, max_chars=20)] == [["a"], ["b"], ["c"]]
+    assert pack_batches([]) == []
+
+
+def test_rebuild_content_round_trips_and_keeps_untranslated_values():
+    items = {"title": "Hello", "tags": ["One", "Two"], "count": 3, "untouched": "Same"}
+    translations = {("title", None): "Ciao", ("tags", 1): "Due"}
+    assert rebuild_content(items, translations) == {
+        "title": "Ciao",
+        "tags": ["One", "Due"],
+        "count": 3,
+        "untouched": "Same",
+    }
+
+    segments = flatten_segments(items)
+    translated = {(segment.key, segment.index): segment.text.upper() for segment in segments}
+    assert rebuild_content(items, translated) == {"title": "HELLO", "tags": ["ONE", "TWO"], "count": 3, "untouched": "SAME"}
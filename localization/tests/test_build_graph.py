@@ -0,0 +1,116 @@
+import pytest
+
+from build_graph import BuildGraph, Node
+
+
+def copy_node(name, source, target, runs, deps=()):
+    def action():
+        runs.append(name)
+        target.write_text(source.read_text())
+    return Node(name, action, inputs=[source], outputs=[target], deps=deps)
+
+
+def test_skips_nodes_whose_files_are_unchanged(tmp_path):
+    source, target = tmp_path / "a.txt", tmp_path / "b.txt"
+    source.write_text("one")
+    runs = []
+
+    def build():
+        graph = BuildGraph(state_path=tmp_path / "state.json")
+        graph.add(copy_node("copy", source, target, runs))
+        return graph.run(workers=2)
+
+    assert build() == {"copy": "ran"}
+    assert build() == {"copy": "skipped"}
+
+    source.write_text("two")
+    assert build() == {"copy": "ran"}
+    assert target.read_text() == "two"
+    assert runs == ["copy", "copy"]
+
+
+def test_reruns_when_an_output_was_changed_or_deleted(tmp_path):
+    source, target = tmp_path / "a.txt", tmp_path / "b.txt"
+    source.write_text("one")
+    runs = []
+
+    def build():
+        graph = BuildGraph(state_path=tmp_path / "state.json")
+        graph.add(copy_node("copy", source, target, runs))
+        return graph.run()["copy"]
+
+    build()
+    target.write_text("edited by hand")
+    assert build() == "ran"
+    target.unlink()
+    assert build() == "ran"
+    assert target.read_text() == "one"
+
+
+def test_force_reruns_up_to_date_nodes(tmp_path):
+    source, target = tmp_path / "a.txt", tmp_path / "b.txt"
+    source.write_text("one")
+    graph = BuildGraph(state_path=tmp_path / "state.json")
+    graph.add(copy_node("copy", source, target, []))
+    graph.run()
+    assert graph.run(force=True) == {"copy": "ran"}
+
+
+def test_failed_node_blocks_its_dependents_and_is_retried(tmp_path):
+    source, middle, target = tmp_path / "a.txt", tmp_path / "b.txt", tmp_path / "c.txt"
+    source.write_text("one")
+    fail = [True]
+    runs = []
+
+    def flaky():
+        runs.append("first")
+        if fail[0]:
+            raise ValueError("broken")
+        middle.write_text(source.read_text())
+
+    def build():
+        graph = BuildGraph(state_path=tmp_path / "state.json")
+        graph.add(Node("first", flaky, inputs=[source], outputs=[middle]))
+        graph.add(copy_node("second", middle, target, runs, deps=["first"]))
+        return graph.run()
+
+    assert build() == {"first": "failed", "second": "blocked"}
+    fail[0] = False
+    # A failure is never recorded as up to date, so the node runs again with unchanged inputs
+    assert build() == {"first": "ran", "second": "ran"}
+    assert runs == ["first", "first", "second"]
+
+
+def test_a_dep_rewriting_an_input_is_seen_in_the_same_run(tmp_path):
+    source, middle, target = tmp_path / "a.txt", tmp_path / "b.txt", tmp_path / "c.txt"
+    source.write_text("one")
+    runs = []
+
+    def build():
+        graph = BuildGraph(state_path=tmp_path / "state.json")
+        graph.add(copy_node("first", source, middle, runs))
+        graph.add(copy_node("second", middle, target, runs, deps=["first"]))
+        return graph.run()
+
+    build()
+    source.write_text("two")
+    assert build() == {"first": "ran", "second": "ran"}
+    assert target.read_text() == "two"
+
+
+def test_rejects_duplicates_unknown_deps_and_cycles(tmp_path):
+    graph = BuildGraph(state_path=tmp_path / "state.json")
+    graph.add(Node("a", lambda: None))
+    with pytest.raises(ValueError):
+        graph.add(Node("a", lambda: None))
+
+    graph = BuildGraph(state_path=tmp_path / "state.json")
+    graph.add(Node("a", lambda: None, deps=["missing"]))
+    with pytest.raises(ValueError, match="unknown"):
+        graph.run()
+
+    graph = BuildGraph(state_path=tmp_path / "state.json")
+    graph.add(Node("a", lambda: None, deps=["b"]))
+    graph.add(Node("b", lambda: None, deps=["a"]))
+    with pytest.raises(ValueError, match="cycle"):
+        graph.run()
@@ -0,0 +1,59 @@
+import pytest
+
+from fuzzy_memory import FuzzyIndex, FuzzyMatcher
+from translation_memory import TranslationMemory
+
+SOURCE = "I scaled training to more than 1,000 GPUs across two clusters"
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite3", engine="local")
+    yield memory
+    memory.close()
+
+
+def test_index_finds_close_matches_only():
+    index = FuzzyIndex(threshold=0.7)
+    index.add(SOURCE, "tradotto")
+    index.add("Something else entirely", "altro")
+    found = index.query(SOURCE.replace("two", "three"))
+    assert found.translation == "tradotto"
+    assert 0.7 <= found.similarity < 1
+    assert index.query("Nothing like it at all") is None
+
+
+def test_matcher_reuses_near_identical_text_and_hints_weaker_matches(memory):
+    memory.store(SOURCE, "en-US", "it-IT", "tradotto")
+    fuzzy = FuzzyMatcher(memory, reuse_threshold=0.9, hint_threshold=0.5)
+
+    reused, hint = fuzzy.match(SOURCE + ".", "en-US", "it-IT")
+    assert reused == "tradotto" and hint.source == SOURCE
+
+    reused, hint = fuzzy.match(SOURCE.replace("more than 1,000", "about 200"), "en-US", "it-IT")
+    assert reused is None and hint.translation == "tradotto"
+
+    # Exact matches are the translation memory's job
+    assert fuzzy.match(SOURCE, "en-US", "it-IT") == (None, None)
+    assert (fuzzy.reused, fuzzy.hinted) == (1, 1)
+
+
+def test_refresh_picks_up_entries_stored_after_the_index_was_built(memory):
+    fuzzy = FuzzyMatcher(memory, reuse_threshold=0.9)
+    assert fuzzy.match(SOURCE + ".", "en-US", "it-IT") == (None, None)
+
+    memory.store(SOURCE, "en-US", "it-IT", "tradotto")
+    assert fuzzy.match(SOURCE + ".", "en-US", "it-IT") == (None, None)
+    fuzzy.refresh("en-US", ["it-IT"])
+    assert fuzzy.match(SOURCE + ".", "en-US", "it-IT")[0] == "tradotto"
+
+
+def test_hints_of_list_items_are_kept_per_item(memory):
+    memory.store(SOURCE, "en-US", "it-IT", "tradotto")
+    fuzzy = FuzzyMatcher(memory)
+    _, found = fuzzy.match(SOURCE + ".", "en-US", "it-IT")
+    fuzzy.add_hint("it", "title", found, reused=True)
+    fuzzy.add_hint("it", "tags", found, index=2)
+    assert fuzzy.hints["it"]["title"]["reused"] is True
+    assert fuzzy.hints["it"]["tags"]["items"]["2"]["translation"] == "tradotto"
+    assert "reused" not in fuzzy.hints["it"]["tags"]["items"]["2"]
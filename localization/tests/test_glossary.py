@@ -0,0 +1,66 @@
+import pytest
+
+from glossary import Glossary, TermMatcher, Violation
+
+TERMS = ["Python", "NumPy", "GPT", "Lara", "Lara Grande", "Translated", "vLLM"]
+
+
+@pytest.fixture
+def matcher():
+    return TermMatcher(TERMS, case_sensitive=TERMS)
+
+
+@pytest.mark.parametrize("text, found", [
+    ("I write Python.", {"Python"}),
+    ("Pythons are snakes", {"Python"}),               # inflection suffix
+    ("Translatednél dolgozom", {"Translated"}),
+    ("のNumPyライブラリ", {"NumPy"}),                   # no word boundary between scripts
+    ("ReNumPy", set()),                                 # glued to a word of the same script
+    ("GPT4 and GPT-4", {"GPT"}),
+    ("GPT_4", set()),                                   # digits and underscores glue on
+    ("python", set()),                                  # case-sensitive term
+    ("Lara Grande and Lara", {"Lara", "Lara Grande"}),
+    ("served with vLLM", {"vLLM"}),
+])
+def test_term_boundaries(matcher, text, found):
+    assert matcher.find(text) == found
+
+
+def test_finditer_reports_positions_of_overlapping_terms(matcher):
+    assert list(matcher.finditer("Lara Grande")) == [(0, 4, "Lara"), (0, 11, "Lara Grande")]
+
+
+def test_matching_ignores_case_for_other_terms():
+    matcher = TermMatcher(["machine translation"])
+    assert matcher.find("Machine Translation at scale") == {"machine translation"}
+    assert not TermMatcher([])
+
+
+@pytest.fixture
+def glossary():
+    return Glossary({"*": ["PyTorch", "Lara"]}, {"it": {"machine translation": "traduzione automatica"}})
+
+
+def test_resolve_only_exact_terms(glossary):
+    assert glossary.resolve(" PyTorch ", "it") == " PyTorch "
+    assert glossary.resolve("Machine translation", "it") == "traduzione automatica"
+    assert glossary.resolve("PyTorch models", "it") is None
+    assert glossary.resolve("machine translation", "es") is None
+
+
+def test_check_locale_reports_lost_and_mistranslated_terms(glossary):
+    source = {"a": "Built with PyTorch", "b": ["Lara", "machine translation"], "c": "Nothing here"}
+    translation = {"a": "Costruito con Torch", "b": ["Lara", "traduzione meccanica"], "c": "Niente"}
+    assert glossary.check_locale(source, translation, "it") == [
+        Violation("a", "PyTorch", "PyTorch"),
+        Violation("b", "machine translation", "traduzione automatica"),
+    ]
+
+
+def test_guard_review_keeps_current_value_when_a_review_loses_a_term(glossary):
+    source = {"a": "Built with PyTorch", "b": "Hello"}
+    original = {"a": "Costruito con PyTorch", "b": "Ciao"}
+    reviewed = {"a": "Costruito con Torch", "b": "Salve"}
+    accepted, rejected = glossary.guard_review(source, original, reviewed, "it")
+    assert accepted == {"b": "Salve"}
+    assert list(rejected) == ["a"]
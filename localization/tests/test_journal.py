@@ -0,0 +1,54 @@
+from batching import Segment
+from journal import TranslationJournal
+
+
+def test_resume_replays_finished_segments(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    segments = [Segment("title", None, "Hello"), Segment("tags", 1, "Two")]
+    journal = TranslationJournal(path)
+    journal.append("it", segments, ["Ciao", "Due"])
+    journal.close()
+
+    resumed = TranslationJournal(path, resume=True)
+    assert len(resumed) == 2
+    assert resumed.lookup("it", segments[0]) == "Ciao"
+    assert resumed.lookup("it", segments[1]) == "Due"
+    assert resumed.lookup("es", segments[0]) is None
+    resumed.close()
+
+
+def test_an_edited_source_is_not_resumed(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.append("it", [Segment("title", None, "Hello")], ["Ciao"])
+    journal.close()
+
+    resumed = TranslationJournal(path, resume=True)
+    assert resumed.lookup("it", Segment("title", None, "Hello there")) is None
+    resumed.close()
+
+
+def test_a_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.append("it", [Segment("a", None, "One")], ["Uno"])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"lang": "it", "key": "b", "ind')
+
+    resumed = TranslationJournal(path, resume=True)
+    assert len(resumed) == 1
+    resumed.close()
+
+
+def test_a_fresh_run_starts_a_new_journal_and_discard_removes_it(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.append("it", [Segment("a", None, "One")], ["Uno"])
+    journal.close()
+
+    fresh = TranslationJournal(path)
+    assert len(fresh) == 0
+    assert path.read_text() == ""
+    fresh.close(discard=True)
+    assert not path.exists()
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from locale_store import MAGIC, LocaleStore, decode_value, encode_value
+
+
+def write_locale(locales_dir, lang, values):
+    (locales_dir / f"{lang}.json").write_text(json.dumps(values, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def locales_dir(tmp_path):
+    path = tmp_path / "locales"
+    path.mkdir()
+    write_locale(path, "en", {"title": "Hello", "tags": ["One", "Two"], "count": 3})
+    write_locale(path, "it", {"tags": ["Uno", "Due"], "title": "Ciao — ü"})
+    return path
+
+
+def open_store(locales_dir):
+    return LocaleStore.open(locales_dir, locales_dir.parent / "store.snapshot")
+
+
+def test_values_round_trip_through_the_encoding():
+    for value in ["", "Ciao — ü", ["a", "b"], 3, None, {"nested": [1]}]:
+        assert decode_value(bytes(encode_value(value))) == value
+
+
+def test_snapshot_round_trip_keeps_values_and_key_order(locales_dir):
+    open_store(locales_dir).close()
+    snapshot = locales_dir.parent / "store.snapshot"
+    assert snapshot.read_bytes().startswith(MAGIC)
+
+    store = open_store(locales_dir)
+    # Served from the snapshot, not re-imported from the JSON files
+    assert not store._loaded
+    assert store.languages == ["en", "it"]
+    assert list(store.locale("it")) == ["tags", "title"]
+    assert store.locale("it") == {"tags": ["Uno", "Due"], "title": "Ciao — ü"}
+    assert store.get("en", "count") == 3
+    assert store.get("it", "count", "missing") == "missing"
+    assert store.column("title") == {"en": "Hello", "it": "Ciao — ü"}
+
+
+def test_changed_new_and_deleted_files_are_picked_up(locales_dir):
+    open_store(locales_dir).close()
+
+    write_locale(locales_dir, "it", {"title": "Salve"})
+    os.utime(locales_dir / "it.json", ns=(1, 1))  # a different mtime even on a coarse clock
+    write_locale(locales_dir, "es", {"title": "Hola"})
+    (locales_dir / "en.json").unlink()
+
+    store = open_store(locales_dir)
+    assert store.languages == ["es", "it"]
+    assert store.locale("it") == {"title": "Salve"}
+
+
+def test_update_export_and_diff(locales_dir):
+    store = open_store(locales_dir)
+    store.update("it", {"count": 3, "new": "Nuovo"}, remove=["tags"])
+    assert store.diff("en", "it") == {"added": ["new"], "removed": ["tags"], "changed": ["title"]}
+
+    store.export()
+    assert json.loads((locales_dir / "it.json").read_text(encoding="utf-8")) == {
+        "title": "Ciao — ü", "count": 3, "new": "Nuovo",
+    }
+    store.close()
+    assert open_store(locales_dir).locale("it") == {"title": "Ciao — ü", "count": 3, "new": "Nuovo"}
+
+
+def test_save_drops_keys_no_language_uses(locales_dir):
+    store = open_store(locales_dir)
+    store.replace("en", {"title": "Hello"})
+    store.replace("it", {"title": "Ciao"})
+    store.export()
+    store.close()
+
+    store = open_store(locales_dir)
+    assert store.keys == ["title"]
+    assert store.locale("en") == {"title": "Hello"}
+
+
+def test_a_corrupt_snapshot_is_rebuilt_from_the_files(locales_dir):
+    snapshot = locales_dir.parent / "store.snapshot"
+    snapshot.write_bytes(b"not a snapshot")
+    store = open_store(locales_dir)
+    assert store.locale("en")["title"] == "Hello"
+    assert snapshot.read_bytes().startswith(MAGIC)
@@ -0,0 +1,63 @@
+import pytest
+
+from batching import Segment
+from planner import Budget, estimate_plan, estimate_wall_time, prioritize, submission_order
+from translate_website import plan_jobs
+
+
+def test_important_fields_go_first_then_shortest():
+    segments = [
+        Segment("long", None, "x" * 50),
+        Segment("short", None, "x"),
+        Segment("nav-about", None, "About me, a long label"),
+        Segment("nav-home", None, "Home"),
+    ]
+    ordered = prioritize(segments, important_fields=["nav-home", "nav-about"])
+    assert [segment.key for segment in ordered] == ["nav-home", "nav-about", "short", "long"]
+
+
+def test_submission_order_is_round_robin():
+    order = list(submission_order({"it": ["i1", "i2", "i3"], "es": ["e1"], "fr": ["f1", "f2"]}))
+    assert order == [("it", "i1"), ("es", "e1"), ("fr", "f1"), ("it", "i2"), ("fr", "f2"), ("it", "i3")]
+
+
+def test_budget_refuses_everything_after_the_first_batch_that_does_not_fit():
+    budget = Budget(max_chars=100)
+    assert budget
+    assert budget.reserve(60)
+    assert not budget.reserve(50)
+    assert not budget.reserve(1)
+    assert budget.used_chars == 60
+
+    budget = Budget(max_cost=1.0, price_per_million_chars=1_000_000)
+    assert budget.reserve(1)
+    assert not budget.reserve(1)
+    assert budget.cost == pytest.approx(1.0)
+
+    assert not Budget()
+    assert Budget().reserve(10 ** 9)
+
+
+def test_wall_time_is_bound_by_concurrency_or_rate():
+    assert estimate_wall_time(0, 4) == 0.0
+    assert estimate_wall_time(10, 4, request_seconds=2.0) == 6.0
+    assert estimate_wall_time(10, 100, rate=2, request_seconds=1.0) == 5.0
+
+
+def test_estimate_plan_counts_requests_and_the_segments_within_budget():
+    jobs = {
+        "it": {"a": "x" * 10, "b": "y" * 10, "c": "x" * 10},
+        "es": {"a": "x" * 10},
+    }
+    plans = plan_jobs(jobs, "en", batch_size=1)
+    estimate = estimate_plan(plans, workers=2, price_per_million_chars=1_000_000, request_seconds=1.0,
+                             budget=Budget(max_chars=25))
+
+    italian = estimate["languages"]["it"]
+    assert (italian["segments"], italian["unique_segments"], italian["segments_to_send"]) == (3, 2, 2)
+    assert (italian["requests"], italian["chars"], italian["cost"]) == (2, 20, 20.0)
+    # Round-robin: it's first batch, es' only batch, then the budget runs out
+    assert italian["segments_within_budget"] == 1
+    assert estimate["languages"]["es"]["segments_within_budget"] == 1
+    assert estimate["total"]["requests"] == 3
+    assert estimate["total"]["wall_s"] == 2.0
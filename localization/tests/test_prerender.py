@@ -0,0 +1,57 @@
+from prerender import count_supported_languages, relocate_url, render_page
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><link href="assets/css/main.css" rel="stylesheet"><style>.hero { background: url('assets/img/bg.jpg'); }</style></head>
+<body>
+  <h1 data-translate="title">Hello <em>world</em></h1>
+  <p data-translate="intro">Plain &amp; simple</p>
+  <span data-translate="language-selector-header">{count} languages</span>
+  <p data-translate="missing">Kept</p>
+  <a href="index.html#about">About</a> <a href="https://example.com/">Out</a> <img src="/logo.png">
+  R&D stays as written
+</body>
+</html>
+"""
+
+TRANSLATIONS = {
+    "title": "Ciao <em>mondo</em>",
+    "intro": "Semplice & chiaro",
+    "language-selector-header": "{count} lingue",
+}
+
+
+def test_render_page_fills_translations_like_translator_js():
+    rendered = render_page(PAGE, TRANSLATIONS, "it", 31)
+    assert '<html lang="it" dir="ltr" data-prerendered-lang="it">' in rendered
+    assert '<h1 data-translate="title">Ciao <em>mondo</em></h1>' in rendered
+    assert '<p data-translate="intro">Semplice &amp; chiaro</p>' in rendered
+    assert "31 lingue" in rendered
+    assert '<p data-translate="missing">Kept</p>' in rendered
+    assert "R&D stays as written" in rendered
+
+
+def test_render_page_rewrites_relative_urls_for_the_language_directory():
+    rendered = render_page(PAGE, TRANSLATIONS, "it", 31)
+    assert 'href="../assets/css/main.css"' in rendered
+    assert "url('../assets/img/bg.jpg')" in rendered
+    assert 'href="index.html#about"' in rendered
+    assert 'href="https://example.com/"' in rendered
+    assert 'src="/logo.png"' in rendered
+
+
+def test_right_to_left_languages():
+    rendered = render_page(PAGE, TRANSLATIONS, "ar", 31)
+    assert 'dir="rtl"' in rendered
+    assert '<body class="rtl">' in rendered
+
+
+def test_only_rendered_pages_stay_inside_the_language_directory():
+    assert relocate_url("index.html", "../", pages=["index.html"]) == "index.html"
+    assert relocate_url("starter-page.html", "../", pages=["index.html"]) == "../starter-page.html"
+    assert relocate_url("#top", "../") == "#top"
+    assert relocate_url("mailto:me@example.com", "../") == "mailto:me@example.com"
+
+
+def test_count_supported_languages():
+    assert count_supported_languages("[{ code: 'en', name: 'English' }, {code: 'it', name: 'Italiano'}]") == 2
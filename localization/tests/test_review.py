@@ -0,0 +1,91 @@
+from backends import Backend, LocalBackend
+from review_cache import ReviewCache
+from review_with_gpt import review_languages, review_with_gpt
+
+FIELDS = {"it": {"title": "Ciao", "tags": ["Uno", "Due"]}, "es": {"title": "Hola"}}
+
+
+class CorrectingBackend(LocalBackend):
+    """Local backend whose reviewer rewrites every string"""
+
+    def review(self, translations, prompt, system_prompt, model):
+        self._request(len(translations))
+        return {key: [item + "!" for item in value] if isinstance(value, list) else value + "!"
+                for key, value in translations.items()}
+
+
+class PartialBackend(Backend):
+    """Answers the first request with one valid field, one wrong-shaped field and one left out"""
+
+    name = "partial"
+
+    def __init__(self):
+        self.requests = []
+
+    def review_stream(self, translations, prompt, system_prompt, model):
+        self.requests.append(sorted(translations))
+        for key, value in translations.items():
+            if len(self.requests) == 1 and key == "tags":
+                yield key, "not a list"
+            elif len(self.requests) == 1 and key == "footer":
+                continue
+            else:
+                yield key, value
+
+
+def test_missing_and_invalid_fields_are_requested_again():
+    backend = PartialBackend()
+    translations = {"title": "Ciao", "tags": ["Uno"], "footer": "Piè"}
+    received = []
+    reviewed = review_with_gpt(translations, "it", backend, on_field=lambda key, value: received.append(key))
+    assert reviewed == translations
+    assert backend.requests == [["footer", "tags", "title"], ["footer", "tags"]]
+    assert received == ["title", "tags", "footer"]
+
+
+def test_unchanged_fields_are_reviewed_once(tmp_path):
+    def review():
+        cache = ReviewCache("model", "system", "context", path=tmp_path / "cache.json")
+        backend = LocalBackend()
+        reviewed, errors, unreviewed = review_languages(FIELDS, workers=2, cache=cache, backend=backend)
+        cache.save()
+        return reviewed, errors, unreviewed, backend.requests, cache
+
+    reviewed, errors, unreviewed, requests, _ = review()
+    assert reviewed == FIELDS and errors == {} and unreviewed == {}
+    assert requests == 2
+
+    reviewed, _, _, requests, cache = review()
+    assert reviewed == FIELDS
+    assert requests == 0
+    assert cache.hits == 3
+
+
+def test_a_merged_correction_is_not_sent_again(tmp_path):
+    cache = ReviewCache("model", "system", "context", path=tmp_path / "cache.json")
+    reviewed, _, _ = review_languages(FIELDS, cache=cache, backend=CorrectingBackend())
+    assert reviewed["it"] == {"title": "Ciao!", "tags": ["Uno!", "Due!"]}
+
+    # The next run extracts the corrected values, which count as reviewed already
+    backend = CorrectingBackend()
+    again, _, _ = review_languages(reviewed, cache=cache, backend=backend)
+    assert again == reviewed
+    assert backend.requests == 0
+
+    # Also field by field, when only one field of the payload changed
+    edited = {"it": {**reviewed["it"], "title": "Salve"}}
+    again, _, _ = review_languages(edited, cache=cache, backend=backend)
+    assert again["it"] == {"title": "Salve!", "tags": ["Uno!", "Due!"]}
+    assert backend.requests == 1
+
+
+def test_a_failing_language_does_not_block_the_others():
+    class FailingItalian(LocalBackend):
+        def review(self, translations, prompt, system_prompt, model):
+            if "tags" in translations:
+                raise ValueError("broken response")
+            return super().review(translations, prompt, system_prompt, model)
+
+    reviewed, errors, _ = review_languages(FIELDS, backend=FailingItalian())
+    assert list(reviewed) == ["es"]
+    assert list(errors) == ["it"]
@@ -0,0 +1,30 @@
+from source_manifest import diff_source, fingerprint, load_manifest, mark_stale, record_language, save_manifest
+
+
+def test_diff_source_finds_added_edited_and_removed_keys():
+    source = {"a": "One", "b": "Two edited", "c": "Three", "d": "New"}
+    fingerprints = {"a": fingerprint("One"), "b": fingerprint("Two"), "gone": fingerprint("x")}
+    target = {"a": "Uno", "b": "Due", "c": "Tre", "gone": "Via"}
+    changed, removed = diff_source(source, target, fingerprints)
+    # "c" was never fingerprinted, so it is assumed up to date
+    assert changed == {"b": "Two edited", "d": "New"}
+    assert removed == ["gone"]
+
+
+def test_stale_keys_are_retranslated_until_recorded(tmp_path):
+    source = {"a": "One", "b": "Two"}
+    manifest = record_language({}, "it", source)
+    mark_stale(manifest, "it", ["b"])
+    save_manifest(manifest, tmp_path / "manifest.json")
+
+    manifest = load_manifest(tmp_path / "manifest.json")
+    assert diff_source(source, {"a": "Uno", "b": "Due"}, manifest["it"])[0] == {"b": "Two"}
+    record_language(manifest, "it", {"a": "One", "b": "Two"}, ["b"])
+    assert diff_source(source, {"a": "Uno", "b": "Due"}, manifest["it"])[0] == {}
+
+
+def test_record_language_forgets_keys_removed_from_the_source():
+    manifest = record_language({}, "it", {"a": "One", "b": "Two"})
+    record_language(manifest, "it", {"a": "One"}, ["a"])
+    assert list(manifest["it"]) == ["a"]
+    assert load_manifest("/nonexistent/manifest.json") == {}
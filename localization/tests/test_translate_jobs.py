@@ -0,0 +1,77 @@
+from backends import LocalBackend
+from glossary import Glossary
+from journal import TranslationJournal
+from planner import Budget
+from rate_limiter import RateLimiter
+from translate_website import translate_jobs
+from translation_memory import TranslationMemory
+
+JOBS = {
+    "it": {
+        "title": "Hello",
+        "button": "Send",
+        "footer-button": "Send",
+        "tags": ["PyTorch", "Fast", "Send"],
+        "multilingual-typed": ["Ciao", "Hola"],
+    },
+}
+
+
+def test_translates_every_segment_once_and_fans_out_copies():
+    backend = LocalBackend()
+    done = {}
+    results = translate_jobs(backend, JOBS, "en-US", workers=2, batch_size=2,
+                             on_language_done=lambda code, *args: done.setdefault(code, args),
+                             glossary=Glossary({"*": ["PyTorch"]}))
+    assert results["it"] == {
+        "title": "[it-IT] Hello",
+        "button": "[it-IT] Send",
+        "footer-button": "[it-IT] Send",
+        "tags": ["PyTorch", "[it-IT] Fast", "[it-IT] Send"],
+        "multilingual-typed": ["Ciao", "Hola"],
+    }
+    # Hello, Send and Fast in batches of two; PyTorch is resolved from the glossary
+    assert backend.requests == 2
+    assert done["it"] == (results["it"], set(), set())
+
+
+def test_memory_and_journal_resolve_the_second_run_locally(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite3", engine="local")
+    journal = TranslationJournal(tmp_path / "journal.jsonl")
+    first = translate_jobs(LocalBackend(), JOBS, "en-US", memory=memory, journal=journal)
+    journal.close()
+
+    backend = LocalBackend()
+    assert translate_jobs(backend, JOBS, "en-US", memory=memory) == first
+    assert backend.requests == 0
+    memory.close()
+
+    resumed = TranslationJournal(tmp_path / "journal.jsonl", resume=True)
+    assert translate_jobs(backend, JOBS, "en-US", journal=resumed) == first
+    assert backend.requests == 0
+    resumed.close()
+
+
+def test_failed_batches_fall_back_to_the_source_and_are_reported(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite3", engine="local")
+    limiter = RateLimiter(rate=None, max_retries=0)
+    done = {}
+    results = translate_jobs(LocalBackend(error_rate=1.0), {"it": {"title": "Hello", "tags": ["Fast"]}}, "en-US",
+                             memory=memory, limiter=limiter,
+                             on_language_done=lambda code, *args: done.setdefault(code, args))
+    assert results["it"] == {"title": "Hello", "tags": ["Fast"]}
+    assert done["it"][1] == {"title", "tags"}
+    assert limiter.stats()["fallbacks"] == 2
+    # Fallbacks are never cached
+    assert memory.stats()["entries"] == 0
+    memory.close()
+
+
+def test_batches_over_budget_are_skipped():
+    done = {}
+    jobs = {"it": {"a": "x" * 10, "b": "y" * 30}}
+    translate_jobs(LocalBackend(), jobs, "en-US", batch_size=1, budget=Budget(max_chars=15),
+                   on_language_done=lambda code, *args: done.setdefault(code, args))
+    translated, failed, skipped = done["it"]
+    assert translated == {"a": "[it-IT] " + "x" * 10, "b": "y" * 30}
+    assert (failed, skipped) == (set(), {"b"})
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from translation_memory import TranslationMemory, normalize_text
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite3", engine="local")
+    yield memory
+    memory.close()
+
+
+def test_normalize_text_ignores_cosmetic_whitespace():
+    assert normalize_text("  Send\n message ") == "Send message"
+
+
+def test_lookup_hits_stored_translations(memory):
+    assert memory.lookup("Hello", "en-US", "it-IT") is None
+    memory.store("Hello", "en-US", "it-IT", "Ciao", key="title")
+    assert memory.lookup("Hello  ", "en-US", "it-IT") == "Ciao"
+    assert memory.lookup("Hello", "en-US", "es-ES") is None
+    stats = memory.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["entries"]) == (1, 2, 1, 1)
+
+
+def test_invalidating_any_key_of_a_shared_text_drops_its_entry(memory):
+    memory.store_many([("Send", "Invia", ["form-send", "contact-send"]), ("Other", "Altro", "other")], "en-US", "it-IT")
+    assert memory.invalidate(key="contact-send") == 1
+    assert memory.lookup("Send", "en-US", "it-IT") is None
+    assert memory.lookup("Other", "en-US", "it-IT") == "Altro"
+
+
+def test_a_lookup_records_the_keys_that_reused_an_entry(memory):
+    memory.store("Send", "en-US", "it-IT", "Invia", key="form-send")
+    memory.lookup("Send", "en-US", "it-IT", keys=["footer-send"])
+    assert memory.invalidate(key="footer-send") == 1
+
+
+def test_invalidate_by_language_and_entries(memory):
+    memory.store("Hello", "en-US", "it-IT", "Ciao")
+    memory.store("Hello", "en-US", "es-ES", "Hola")
+    assert memory.entries("en-US", "es-ES") == [("Hello", "Hola")]
+    assert memory.invalidate(language="it") == 1
+    assert memory.entries("en-US", "it-IT") == []
+    with pytest.raises(ValueError):
+        memory.invalidate()
+
+
+def test_evict_keeps_the_most_recently_used_entries(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite3", engine="local", max_entries=1)
+    memory.store("Old", "en-US", "it-IT", "Vecchio")
+    time.sleep(0.01)
+    memory.store("New", "en-US", "it-IT", "Nuovo")
+    time.sleep(0.01)
+    memory.lookup("Old", "en-US", "it-IT")
+    assert memory.evict() == 1
+    assert memory.entries("en-US", "it-IT") == [("Old", "Vecchio")]
+    memory.close()
+
+
+def test_recency_of_hits_survives_reopening(tmp_path):
+    path = tmp_path / "memory.sqlite3"
+    memory = TranslationMemory(path, engine="local")
+    memory.store("Old", "en-US", "it-IT", "Vecchio")
+    time.sleep(0.01)
+    memory.store("New", "en-US", "it-IT", "Nuovo")
+    time.sleep(0.01)
+    memory.lookup("Old", "en-US", "it-IT")
+    memory.close()
+
+    reopened = TranslationMemory(path, engine="local", max_entries=1)
+    reopened.evict()
+    assert reopened.entries("en-US", "it-IT") == [("Old", "Vecchio")]
+    reopened.close()
@@ -0,0 +1,47 @@
+from validate_locales import check_value, keys_to_retranslate, length_outliers, merge_findings, validate_locale
+
+
+def checks(issues):
+    return [(found["key"], found["check"], found["index"]) for found in issues]
+
+
+def test_check_value_reports_broken_markup_and_placeholders():
+    assert checks(check_value("a", "<strong>Lara:</strong> text", "Lara: testo")) == [("a", "html", None)]
+    assert checks(check_value("a", "<b>x</b>", "<b>x")) == [("a", "html", None)]
+    assert checks(check_value("a", "{count} languages", "lingue")) == [("a", "placeholder", None)]
+    assert checks(check_value("a", ["<br>one", "two"], ["<br>uno", "<i>due"])) == [("a", "html", 1)]
+    assert checks(check_value("a", ["one", "two"], ["uno"])) == [("a", "list_length", None)]
+    assert checks(check_value("a", ["one"], "uno")) == [("a", "type", None)]
+    assert check_value("a", "<a href='x'>Link</a><br/>", '<a href="y">Collegamento</a><br>') == []
+
+
+def test_validate_locale_checks_key_parity_and_queues_broken_values():
+    source = {"a": "<b>One</b>", "b": "Two", "c": "Three"}
+    translation = {"a": "Uno", "b": "Due", "extra": "Extra"}
+    issues = validate_locale("it", source, translation)
+    assert checks(issues) == [("a", "html", None), ("c", "missing_key", None), ("extra", "extra_key", None)]
+    assert keys_to_retranslate(issues) == ["a"]
+
+
+def test_length_outliers_are_warnings_relative_to_the_language():
+    source = {f"k{i}": "x" * 40 for i in range(5)}
+    translation = {f"k{i}": "y" * 30 for i in range(5)}
+    translation["k4"] = "y" * 300
+    issues = length_outliers(source, translation)
+    assert checks(issues) == [("k4", "length_ratio", None)]
+    assert issues[0]["severity"] == "warning"
+
+
+def test_merge_findings_keeps_languages_not_checked_this_time():
+    previous = {
+        "languages": {
+            "it": {"issues": ["old it"]},
+            "es": {"issues": ["old es"]},
+            "gone": {"issues": ["old gone"]},
+        },
+        "queued": {"it": ["a"], "es": ["b"]},
+    }
+    issues, queued = merge_findings(previous, {"it": []}, {}, ["it", "es"])
+    assert issues == {"es": ["old es"], "it": []}
+    assert queued == {"es": ["b"]}
+    assert merge_findings({}, {"it": ["new"]}, {"it": ["c"]}, ["it"]) == ({"it": ["new"]}, {"it": ["c"]})
@@ -8,6 +8,7 @@ Prerequisites:
 2. Set environment variables:
    - LARA_ACCESS_KEY_ID
    - LARA_ACCESS_KEY_SECRET
+(or pick another backend from backends.py with --backend)
 
 Usage:
     # Full translation (replaces entire file)
@@ -19,37 +20,100 @@ Usage:
     python translate_website.py --missing-only --target it
     python translate_website.py --missing-only --languages "es,fr,de"
     python translate_website.py --missing-only --source en --target pt
+
+    # Translate only keys added or edited in the source since each locale was
+    # last translated, and drop keys removed from the source
+    python translate_website.py --changed-only --languages "es,fr,de"
+
+    # Continue a crashed or interrupted run without re-requesting finished segments
+    python translate_website.py --languages "es,fr,de" --resume
+
+    # Provider calls are throttled (token bucket + adaptive concurrency) and
+    # 429/timeouts are retried with jittered exponential backoff
+    python translate_website.py --target it --rate 5 --max-retries 8 --timeout-ms 10000
+
+    # Keep more requests in flight across keys and languages (default: 8)
+    python translate_website.py --languages "es,fr,de" --workers 16
+
+    # Tune how many segments / characters are packed into one request
+    python translate_website.py --target it --batch-size 50 --batch-chars 4000
+
+    # Unchanged strings are served from localization/translation_memory.sqlite3;
+    # bypass it or expire old entries with:
+    python translate_website.py --target it --no-cache
+    python translate_website.py --target it --cache-ttl-days 90
+
+    # Lightly edited strings reuse a close earlier translation (similarity >= 0.95);
+    # those and weaker matches (>= 0.7) are saved to localization/fuzzy_hints.json for the reviewer
+    python translate_website.py --changed-only --target it --fuzzy-reuse 0.9 --fuzzy-hint 0.6
+    python translate_website.py --changed-only --target it --no-fuzzy
+
+    # Run offline against the deterministic local backend (see backends.py),
+    # e.g. with 50 ms latency and 5% injected 429s
+    LOCAL_BACKEND_LATENCY_MS=50 LOCAL_BACKEND_THROTTLE_RATE=0.05 python translate_website.py --backend local
+
+    # Strings that are exactly a glossary term (localization/glossary.json, see glossary.py)
+    # are resolved locally; every translation is checked for do-not-translate and forced terms
+    python translate_website.py --languages "es,fr,de" --glossary my_glossary.json
+    python translate_website.py --languages "es,fr,de" --no-glossary
+
+    # Skip keys no page or script references (see key_usage.py)
+    python translate_website.py --languages "es,fr,de" --live-only
+
+    # Estimate requests, characters/tokens, cost and wall time per language
+    # (after the translation memory, journal and fuzzy matches) without calling the API
+    python translate_website.py --languages "es,fr,de" --changed-only --plan
+
+    # Important fields go out first; stop cleanly at a character or cost budget
+    # (skipped keys stay pending for the next --changed-only run)
+    python translate_website.py --languages "es,fr,de" --max-chars 200000
+    python translate_website.py --languages "es,fr,de" --max-cost 5 --price-per-million-chars 20
+
+    # Keep running: on every save of en.json (or a page) retranslate just the edited
+    # keys for all languages with the already-connected client, then rebuild the
+    # bundles and pre-rendered pages (inotify with `pip install inotify_simple`,
+    # polling otherwise)
+    python translate_website.py --languages "es,fr,de" --watch
+    python translate_website.py --languages "es,fr,de" --watch --debounce-ms 500 --poll-interval 0.25
+
+    # Every run writes localization/telemetry/translate_website.json (per-request
+    # latency, characters/tokens sent, cache hits, retries, fallbacks and stage
+    # times per language); also export it for Prometheus' textfile collector
+    python translate_website.py --languages "es,fr,de" --metrics-textfile /var/lib/node_exporter/l10n.prom
 """
 
 import argparse
 import json
 import logging
-import os
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from lara_sdk import Credentials, Translator
-
+from backends import BACKENDS, get_backend
+from batching import dedupe_segments, flatten_segments, pack_batches, rebuild_content
+from bundle_locales import bundle_locales
+from fuzzy_memory import FuzzyMatcher, update_language_hints
+from glossary import Glossary, format_violation
+from journal import TranslationJournal
+from key_usage import html_files, live_keys
+from locale_store import LocaleStore
 # Import our path utilities for absolute path resolution
 from path_utils import get_locales_dir
+from planner import DEFAULT_PRICE_PER_MILLION_CHARS, Budget, estimate_plan, prioritize, submission_order
+from prerender import build_prerender_graph
+from rate_limiter import RateLimiter
+from source_manifest import diff_source, load_manifest, mark_stale, record_language, save_manifest
+from telemetry import finish_run, get_telemetry, start_run
+from translation_memory import TranslationMemory
+from validate_locales import keys_to_retranslate, queue_retranslation, validate_locales
+from watch import FileWatcher, watch
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def setup_lara():
-    """Initialize Lara SDK with credentials"""
-    access_key_id = os.getenv("LARA_ACCESS_KEY_ID")
-    access_key_secret = os.getenv("LARA_ACCESS_KEY_SECRET")
-
-    if not access_key_id or not access_key_secret:
-        raise ValueError("Please set LARA_ACCESS_KEY_ID and LARA_ACCESS_KEY_SECRET")
-
-    credentials = Credentials(access_key_id=access_key_id, access_key_secret=access_key_secret)
-    return Translator(credentials)
-
-
 def load_translations(file_path):
     """Load translations from JSON file"""
     try:
@@ -60,54 +124,41 @@ def load_translations(file_path):
         return {}
 
 
-def save_translations(translations, file_path):
-    """Save translations to JSON file"""
-    # Ensure directory exists
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(translations, f, ensure_ascii=False, indent=2)
-
-
-def translate_text(lara, text, source_lang, target_lang):
-    """Translate a single text string"""
-    try:
-        # Add small delay to avoid rate limiting
-        time.sleep(0.1)
-        print(f"Translating {text} from {source_lang} to {target_lang}")
-        result = lara.translate(
-            text,
-            source=source_lang,
-            target=target_lang,
-            content_type='text/plain',
-            timeout_ms=5000,
-            use_cache=False
-        )
-
-        return result.translation
+def load_locale(store, lang):
+    """A locale from the locale store; a language without a file yet starts empty"""
+    if lang not in store:
+        logger.info(f"No {lang}.json yet, will create new translation file")
+        return {}
+    return store.locale(lang)
 
-    except Exception as e:
-        logger.warning(f"Translation failed for '{text[:30]}...': {e}")
-        return text  # Return original on failure
 
+def call_provider(limiter, fn, *args, **kwargs):
+    """Run a provider call through the shared rate limiter, if any"""
+    if limiter is None:
+        return fn(*args, **kwargs)
+    return limiter.call(fn, *args, **kwargs)
 
-def translate_content(lara, content, source_lang, target_lang, key):
-    """Translate content (string, list, or other)"""
-    # Preserve multilingual content
-    if key == "multilingual-typed":
-        return content
 
-    if isinstance(content, str):
-        return translate_text(lara, content, source_lang, target_lang)
+def timed_provider_call(limiter, target_lang, texts, fn, *args, **kwargs):
+    """call_provider for a translation request, recorded in the run telemetry"""
+    # Telemetry is labelled with the short code ("it" for "it-IT") like the locale files
+    lang = target_lang.split('-')[0]
+    chars = sum(len(text) for text in texts)
+    started = time.perf_counter()
+    try:
+        result = call_provider(limiter, fn, *args, **kwargs)
+    except Exception:
+        get_telemetry().record_request("translate", lang, time.perf_counter() - started, chars, ok=False)
+        raise
+    get_telemetry().record_request("translate", lang, time.perf_counter() - started, chars)
+    return result
 
-    elif isinstance(content, list):
-        return [
-            translate_text(lara, item, source_lang, target_lang) if isinstance(item, str) else item
-            for item in content
-        ]
 
-    else:
-        return content
+def request_batch(backend, texts, source_lang, target_lang, limiter=None, timeout_ms=5000):
+    """Translate a list of strings with a single request; raises on failure"""
+    print(f"Translating {len(texts)} segments from {source_lang} to {target_lang}")
+    return timed_provider_call(limiter, target_lang, texts, backend.translate_batch,
+                               texts, source_lang, target_lang, timeout_ms=timeout_ms)
 
 
 def convert_language_code(lang_code):
@@ -146,15 +197,548 @@ def merge_translations(existing_translations, new_translations):
     return merged
 
 
+# One language's translation plan: `segments` is the total segment count, `unique`
+# the deduplicated segments and `copies` their duplicates (see dedupe_segments),
+# `resolved` is {(key, index): text} answered locally, `batches` what remains to send
+LanguagePlan = namedtuple("LanguagePlan", ["segments", "unique", "copies", "resolved", "batches"])
+
+
+def fan_out(copies, batch, translations):
+    """Expand a batch and its translations to include every copy of each segment"""
+    segments, texts = list(batch), list(translations)
+    for segment, text in zip(batch, translations):
+        for copy in copies.get(segment, ()):
+            segments.append(copy)
+            texts.append(text)
+    return segments, texts
+
+
+def segment_keys(copies, segment):
+    """Keys of a segment and of every copy that reuses its translation"""
+    return list(dict.fromkeys([segment.key] + [copy.key for copy in copies.get(segment, ())]))
+
+
+def plan_jobs(jobs, source_lang, batch_size=50, batch_chars=4000, memory=None, journal=None, fuzzy=None,
+              glossary=None):
+    """
+    Plan {target_lang_code: {key: value}} jobs without sending anything.
+    String values and list items are flattened into segments; segments with the same
+    normalized text are planned once per language (the translation is copied to every
+    key that uses it). Segments that are exactly a `glossary` term, already completed
+    in a resumed `journal`, found in the translation `memory` or, with a `fuzzy`
+    matcher, closely matching an earlier translation are resolved locally; those and
+    weaker fuzzy matches are kept as reviewer hints.
+    The rest is put in priority order (see planner.py) and packed into requests of at
+    most `batch_size` segments and `batch_chars` characters.
+    Returns {code: LanguagePlan}.
+    """
+    telemetry = get_telemetry()
+    plans = {}
+    total_segments = 0
+
+    for code, items in jobs.items():
+        target_lang = convert_language_code(code)
+        segments = flatten_segments(items)
+        unique, copies = dedupe_segments(segments)
+        total_segments += len(segments)
+        telemetry.count("segments", len(segments), lang=code)
+        telemetry.count("unique_segments", len(unique), lang=code)
+
+        resolved = {}
+
+        def resolve(segment, text):
+            for copy, copy_text in zip(*fan_out(copies, [segment], [text])):
+                resolved[(copy.key, copy.index)] = copy_text
+
+        lookup_started = time.perf_counter()
+        pending = unique
+
+        if glossary:
+            remaining = []
+            for segment in pending:
+                term = glossary.resolve(segment.text, code)
+                if term is None:
+                    remaining.append(segment)
+                else:
+                    resolve(segment, term)
+            if len(remaining) < len(pending):
+                logger.info(f"{code}: {len(pending) - len(remaining)} segments resolved from the glossary")
+            telemetry.count("glossary_hits", len(pending) - len(remaining), lang=code)
+            pending = remaining
+
+        if journal is not None:
+            remaining = []
+            for segment in pending:
+                done = journal.lookup(code, segment)
+                if done is None:
+                    remaining.append(segment)
+                else:
+                    resolve(segment, done)
+            if len(remaining) < len(pending):
+                logger.info(f"{code}: resumed {len(pending) - len(remaining)}/{len(pending)} segments from the journal")
+            telemetry.count("journal_hits", len(pending) - len(remaining), lang=code)
+            pending = remaining
+
+        if memory:
+            remaining = []
+            for segment in pending:
+                cached = memory.lookup(segment.text, source_lang, target_lang, keys=segment_keys(copies, segment))
+                if cached is None:
+                    remaining.append(segment)
+                else:
+                    resolve(segment, cached)
+            logger.info(f"{code}: {len(pending) - len(remaining)}/{len(pending)} segments from translation memory")
+            telemetry.count("memory_hits", len(pending) - len(remaining), lang=code)
+            telemetry.count("memory_misses", len(remaining), lang=code)
+            pending = remaining
+
+        if fuzzy and pending:
+            remaining = []
+            for segment in pending:
+                reused, hint = fuzzy.match(segment.text, source_lang, target_lang)
+                if hint is not None:
+                    # Every key (and list item) sharing the text gets the hint; reused ones are
+                    # flagged, since their old translation was never checked against the new source
+                    for copy in fan_out(copies, [segment], [None])[0]:
+                        fuzzy.add_hint(code, copy.key, hint, index=copy.index, reused=reused is not None)
+                if reused is None:
+                    remaining.append(segment)
+                else:
+                    resolve(segment, reused)
+            if len(remaining) < len(pending):
+                logger.info(f"{code}: {len(pending) - len(remaining)} segments reused from close matches")
+            telemetry.count("fuzzy_reused", len(pending) - len(remaining), lang=code)
+            pending = remaining
+
+        telemetry.add_stage_time("lookup", code, time.perf_counter() - lookup_started)
+        telemetry.count("segments_sent", len(pending), lang=code)
+
+        batches = pack_batches(prioritize(pending), batch_size, batch_chars)
+        plans[code] = LanguagePlan(len(segments), unique, copies, resolved, batches)
+
+    unique_segments = sum(len(plan.unique) for plan in plans.values())
+    if unique_segments:
+        logger.info(f"🧮 Plan: {total_segments} segments, {unique_segments} unique "
+                    f"(dedupe ratio {total_segments / unique_segments:.2f}, "
+                    f"{total_segments - unique_segments} segments not sent)")
+
+    return plans
+
+
+def translate_jobs(backend, jobs, source_lang, workers=1, on_language_done=None,
+                   batch_size=50, batch_chars=4000, memory=None, journal=None, limiter=None,
+                   timeout_ms=5000, fuzzy=None, budget=None, glossary=None):
+    """
+    Translate {target_lang_code: {key: value}} jobs with up to `workers` requests in flight.
+    Jobs are planned up front with plan_jobs(): duplicates, glossary terms, journaled,
+    memorized and close-match segments are resolved locally, the rest is packed into prioritized
+    multi-segment requests. Batches of every language share one pool and are submitted
+    round-robin, so the important fields of every language go out first and a slow
+    language never idles the others. Every newly translated segment is stored in the
+    memory and appended to the journal as soon as its batch finishes.
+    Provider calls go through the shared `limiter`, which throttles and retries them.
+    With a `budget` (planner.Budget), batches that no longer fit are skipped instead of sent.
+    Results keep the source key order; `on_language_done(code, translated, failed_keys, skipped_keys)`
+    fires as soon as the last batch of a language finishes, where `failed_keys` are keys
+    that fell back to the source text and `skipped_keys` keys left out by the budget.
+    Per-language segment counts, lookup hits, fallbacks and stage times go to the
+    run telemetry (see telemetry.py).
+    """
+    telemetry = get_telemetry()
+    plans = plan_jobs(jobs, source_lang, batch_size=batch_size, batch_chars=batch_chars,
+                      memory=memory, journal=journal, fuzzy=fuzzy, glossary=glossary)
+    results = {code: dict(plan.resolved) for code, plan in plans.items()}
+    failed_keys = {code: set() for code in jobs}
+    skipped_keys = {code: set() for code in jobs}
+    remaining = {}
+    submitted_at = {}
+
+    def finish(code):
+        translated = rebuild_content(jobs[code], results[code])
+        if on_language_done:
+            with telemetry.stage("save", code):
+                on_language_done(code, translated, failed_keys[code], skipped_keys[code])
+        return translated
+
+    def run_batch(code, target_lang, batch):
+        """Returns (translations, True) on success, (source texts, False) on failure, (source texts, None) if over budget"""
+        texts = [segment.text for segment in batch]
+        if budget and not budget.reserve(sum(len(text) for text in texts)):
+            return texts, None
+        try:
+            return request_batch(backend, texts, source_lang, target_lang, limiter=limiter, timeout_ms=timeout_ms), True
+        except Exception as e:
+            logger.warning(f"Batch translation failed for {len(texts)} segments: {e}")
+            if limiter:
+                limiter.record_fallback(len(texts))
+            telemetry.count("fallbacks", len(texts), lang=code)
+            return texts, False  # Fall back to the source text, never cached or journaled
+
+    translated_jobs = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for code, plan in plans.items():
+            if not plan.batches:
+                translated_jobs[code] = finish(code)
+            else:
+                remaining[code] = len(plan.batches)
+                submitted_at[code] = time.perf_counter()
+
+        futures = {}
+        for code, batch in submission_order({code: plan.batches for code, plan in plans.items()}):
+            target_lang = convert_language_code(code)
+            future = executor.submit(run_batch, code, target_lang, batch)
+            futures[future] = (code, target_lang, batch)
+
+        total = len(futures)
+        for done, future in enumerate(as_completed(futures), 1):
+            code, target_lang, batch = futures[future]
+            translations, ok = future.result()
+            segments, texts = fan_out(plans[code].copies, batch, translations)
+
+            if ok is None:
+                skipped_keys[code].update(segment.key for segment in segments)
+            else:
+                for segment, text in zip(segments, texts):
+                    results[code][(segment.key, segment.index)] = text
+
+            if ok is False:
+                failed_keys[code].update(segment.key for segment in segments)
+            elif ok:
+                if memory:
+                    # Every key sharing a deduplicated text is recorded with its entry
+                    memory.store_many([(segment.text, text, segment_keys(plans[code].copies, segment))
+                                       for segment, text in zip(batch, translations)],
+                                      source_lang, target_lang)
+                if journal is not None:
+                    journal.append(code, segments, texts)
+
+            remaining[code] -= 1
+            status = "skipped (over budget)" if ok is None else f"{len(batch)} segments"
+            logger.info(f"[{done}/{total}] {code}: {status} ({batch[0].key} … {batch[-1].key})")
+            if remaining[code] == 0:
+                # Wall time from the language's first submitted batch to its last result
+                telemetry.add_stage_time("translate", code, time.perf_counter() - submitted_at[code])
+                translated_jobs[code] = finish(code)
+    except BaseException:
+        # Ctrl-C or a failed save: drop queued batches instead of draining them
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    if budget and budget.exhausted:
+        skipped = sum(len(keys) for keys in skipped_keys.values())
+        logger.warning(f"💰 Budget reached after {budget.used_chars} characters (~${budget.cost:.2f}); "
+                       f"{skipped} keys left for the next run")
+        telemetry.count("budget_skipped_keys", skipped)
+
+    return {code: translated_jobs[code] for code in jobs}
+
+
+def run_translation(args, mode, target_languages, source_file, locales_dir, backend=None, memory=None,
+                    fuzzy=None, limiter=None, glossary=None):
+    """
+    Translate (or with args.plan, only plan) `target_languages` as configured by the
+    command line `args`, and save every finished locale. Returns the languages saved.
+    """
+    # Every finished segment is journaled, so an interrupted run can be resumed
+    # (a plan only reads the journal of the run it would resume)
+    journal = None
+    if not args.plan or args.resume:
+        journal = TranslationJournal(resume=args.resume)
+    if args.resume:
+        logger.info(f"⏯️  Resuming with {len(journal)} journaled segments from {journal.path}")
+
+    # Every locale comes from the consolidated store (one snapshot instead of a
+    # json.load per file and step); saved locales are written back through it
+    store = LocaleStore.open(locales_dir)
+
+    # Load source translations
+    logger.info(f"Loading source translations from {source_file}")
+    if source_file.resolve() == (locales_dir / f"{args.source}.json").resolve():
+        source_translations = load_locale(store, args.source)
+    else:
+        source_translations = load_translations(source_file)
+    logger.info(f"Loaded {len(source_translations)} source translation keys")
+
+    # Convert language codes
+    source_lang = convert_language_code(args.source)
+
+    # Source fingerprints recorded for each locale on previous runs
+    manifest = load_manifest()
+
+    # Collect the keys to translate for each target language
+    jobs = {}
+    removed_keys = {}
+    for target_lang_code in target_languages:
+        target_lang = convert_language_code(target_lang_code)
+        output_file = locales_dir / f"{target_lang_code}.json"
+
+        logger.info(f"\n{'='*40}")
+        logger.info(f"Translating {source_lang} → {target_lang}")
+        logger.info(f"Mode: {mode}")
+        logger.info(f"Output: {output_file}")
+        logger.info(f"{'='*40}")
+
+        if args.missing_only:
+            # Load existing target translations
+            existing_translations = load_locale(store, target_lang_code)
+            logger.info(f"Loaded {len(existing_translations)} existing translations")
+
+            # Find missing keys
+            missing_keys = find_missing_keys(source_translations, existing_translations)
+
+            if not missing_keys:
+                logger.info(f"✅ No missing keys found for {target_lang_code}. Translation is up to date!")
+                continue
+
+            logger.info(f"Found {len(missing_keys)} missing keys to translate")
+            jobs[target_lang_code] = missing_keys
+        elif args.changed_only:
+            existing_translations = load_locale(store, target_lang_code)
+            fingerprints = manifest.get(target_lang_code, {})
+            changed_keys, removed = diff_source(source_translations, existing_translations, fingerprints)
+
+            # Keys translated before the manifest existed become the baseline for later diffs
+            untracked = [key for key in existing_translations
+                         if key in source_translations and key not in fingerprints and key not in changed_keys]
+            if untracked and not args.plan:
+                record_language(manifest, target_lang_code, source_translations, untracked)
+                save_manifest(manifest)
+                logger.info(f"Recorded source fingerprints for {len(untracked)} existing keys")
+
+            if not changed_keys and not removed:
+                logger.info(f"✅ No source changes for {target_lang_code}. Translation is up to date!")
+                continue
+
+            logger.info(f"Found {len(changed_keys)} added/edited keys to translate and {len(removed)} removed keys")
+            jobs[target_lang_code] = changed_keys
+            removed_keys[target_lang_code] = removed
+        else:
+            # Full translation mode
+            jobs[target_lang_code] = source_translations
+
+    if args.live_only:
+        live = live_keys()
+        for target_lang_code, keys in jobs.items():
+            jobs[target_lang_code] = {key: value for key, value in keys.items() if key in live}
+        unused = [key for key in source_translations if key not in live]
+        if unused:
+            logger.info(f"🗑️  Skipping {len(unused)} unused keys: {', '.join(unused)}")
+
+    if args.plan:
+        plans = plan_jobs(jobs, source_lang, batch_size=args.batch_size, batch_chars=args.batch_chars,
+                          memory=memory, journal=journal, fuzzy=fuzzy, glossary=glossary)
+        budget = Budget(args.max_chars, args.max_cost, args.price_per_million_chars)
+        estimate = estimate_plan(plans, args.workers, rate=args.rate,
+                                 price_per_million_chars=args.price_per_million_chars, budget=budget)
+        print_plan(estimate, budget)
+        if journal is not None:
+            journal.close()
+        store.close()
+        return []
+
+    saved = []
+
+    def save_language(target_lang_code, translated, failed_keys, skipped_keys):
+        output_file = locales_dir / f"{target_lang_code}.json"
+        existing_translations = load_locale(store, target_lang_code)
+
+        # Keys left out by the budget or still failing after every retry keep their current
+        # translation; only keys with no translation yet fall back to the source text
+        pending_keys = failed_keys | skipped_keys
+        if pending_keys:
+            translated = {key: existing_translations[key] if key in pending_keys and key in existing_translations else value
+                          for key, value in translated.items()}
+        if skipped_keys:
+            logger.warning(f"💰 {len(skipped_keys)} keys in {target_lang_code} skipped by the budget")
+
+        # Handle saving based on mode
+        if args.missing_only or args.changed_only:
+            # Merge with existing translations
+            final_translations = merge_translations(existing_translations, translated)
+            logger.info(f"Merged {len(translated)} new translations with {len(existing_translations)} existing ones")
+
+            for key in removed_keys.get(target_lang_code, []):
+                final_translations.pop(key, None)
+            if removed_keys.get(target_lang_code):
+                logger.info(f"Dropped {len(removed_keys[target_lang_code])} keys removed from the source")
+        elif args.live_only:
+            # Full replacement of the live keys; keys no page uses keep their current value
+            final_translations = {key: translated[key] if key in translated else existing_translations[key]
+                                  for key in source_translations
+                                  if key in translated or key in existing_translations}
+        else:
+            # Full replacement
+            final_translations = translated
+
+        # Save translated file (write-temp-then-rename, so an interrupted run never leaves a truncated locale)
+        store.replace(target_lang_code, final_translations)
+        store.export([target_lang_code])
+        logger.info(f"✅ Saved translation to {output_file}")
+
+        # Remember which source values this locale now reflects; keys that failed
+        # or were skipped stay pending for the next --changed-only run
+        if failed_keys:
+            fallback = [key for key in failed_keys if key not in existing_translations]
+            logger.warning(f"⚠️  {len(failed_keys)} keys in {target_lang_code} failed; "
+                           f"{len(failed_keys) - len(fallback)} kept their current translation, "
+                           f"{len(fallback)} fell back to the source text")
+        record_language(manifest, target_lang_code, source_translations,
+                        [key for key in translated if key not in pending_keys])
+        mark_stale(manifest, target_lang_code, pending_keys)
+        save_manifest(manifest)
+
+        if fuzzy:
+            update_language_hints(target_lang_code, fuzzy.hints.get(target_lang_code, {}), translated)
+
+        # Term drift is reported, not fixed: the reviewer or a glossary entry decides
+        if glossary:
+            violations = glossary.check_locale(source_translations, translated, target_lang_code)
+            get_telemetry().count("glossary_violations", len(violations), lang=target_lang_code)
+            for violation in violations:
+                logger.warning(f"📖 {target_lang_code} {format_violation(violation)}")
+        saved.append(target_lang_code)
+
+    # Translate all languages through one bounded worker pool, throttled by the shared limiter
+    logger.info(f"Translating with up to {args.workers} concurrent requests")
+    budget = Budget(args.max_chars, args.max_cost, args.price_per_million_chars)
+    try:
+        translate_jobs(backend, jobs, source_lang, workers=args.workers, on_language_done=save_language,
+                       batch_size=args.batch_size, batch_chars=args.batch_chars, memory=memory,
+                       journal=journal, limiter=limiter, timeout_ms=args.timeout_ms, fuzzy=fuzzy,
+                       budget=budget, glossary=glossary)
+    except BaseException:
+        journal.close()
+        store.close()
+        logger.error(f"⏸️  Run interrupted; finished segments are kept in {journal.path}. Re-run with --resume to continue.")
+        raise
+    journal.close(discard=True)
+    store.close()
+    return saved
+
+
+def watch_translations(args, mode, target_languages, source_file, locales_dir, backend=None, memory=None,
+                       fuzzy=None, limiter=None, glossary=None):
+    """
+    Bring the locales up to date, then keep watching the source locale and the pages.
+    Every burst of saves retranslates only the changed keys of every language over the
+    same warm client, runs the QA gate (see validate_locales.py) on the updated languages,
+    then rebuilds the bundles and pre-rendered pages of those that passed. A language that
+    fails QA keeps its last bundle and pages until a later pass fixes it. Runs until interrupted.
+    """
+    source_file = source_file.resolve()
+    pages = {path.resolve() for path in html_files()}
+    watcher = FileWatcher([source_file, *pages], poll_interval=args.poll_interval)
+    held = set()  # Languages whose saved locale failed QA
+
+    def on_change(changed):
+        started = time.perf_counter()
+        pages_changed = bool(changed & pages)
+        try:
+            saved = []
+            if source_file in changed or (args.live_only and pages_changed):
+                saved = run_translation(args, mode, target_languages, source_file, locales_dir,
+                                        backend=backend, memory=memory, fuzzy=fuzzy, limiter=limiter,
+                                        glossary=glossary)
+                if fuzzy and saved:
+                    # Later passes match against the segments this one stored
+                    fuzzy.refresh(args.source, saved)
+                if saved:
+                    issues = validate_locales(saved, args.source, locales_dir, glossary)
+                    failed = {lang: issues[lang] for lang in saved
+                              if any(found["severity"] == "error" for found in issues[lang])}
+                    queue_retranslation({lang: keys_to_retranslate(found) for lang, found in failed.items()})
+                    for lang, found in failed.items():
+                        errors = [found_issue for found_issue in found if found_issue["severity"] == "error"]
+                        logger.error(f"❌ {lang} failed QA ({len(errors)} errors, first: {errors[0]['check']} "
+                                     f"{errors[0]['key']}); keeping its previous bundle and pages")
+                    held.difference_update(saved)
+                    held.update(failed)
+                    saved = [lang for lang in saved if lang not in failed]
+                if saved:
+                    bundle_locales([args.source, *saved], locales_dir)
+            if saved or pages_changed:
+                build_prerender_graph([lang for lang in target_languages if lang not in held]).run(workers=args.workers)
+        except Exception as e:
+            # An editor may have saved half a file; the next save triggers another attempt
+            logger.error(f"❌ Update failed: {e}")
+            return
+        finally:
+            # A resumed journal only applies to the first pass
+            args.resume = False
+        logger.info(f"⚡ {len(saved)} languages updated in {time.perf_counter() - started:.1f}s")
+
+    on_change({source_file})
+    logger.info(f"👀 Watching {source_file.name} and {len(pages)} pages ({watcher.method}), Ctrl-C to stop")
+    try:
+        watch(watcher, on_change, debounce=args.debounce_ms / 1000)
+    except KeyboardInterrupt:
+        logger.info("👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def print_plan(estimate, budget=None):
+    """Print a planner.estimate_plan() result, one line per language"""
+    for code, lang in estimate["languages"].items():
+        line = (f"  {code}: {lang['segments_to_send']}/{lang['unique_segments']} unique segments to send "
+                f"({lang['resolved_locally']} resolved locally), {lang['requests']} requests, "
+                f"{lang['chars']} chars (~{lang['tokens']} tokens), ${lang['cost']:.2f}, ~{lang['wall_s']}s alone")
+        if budget:
+            line += f", {lang['segments_within_budget']} segments within budget"
+        logger.info(line)
+
+    total = estimate["total"]
+    logger.info(f"📋 Plan: {total['requests']} requests, {total['chars']} chars (~{total['tokens']} tokens), "
+                f"${total['cost']:.2f}, ~{total['wall_s']}s wall time "
+                f"(at {total['request_seconds']}s per request)")
+    if budget:
+        logger.info(f"💰 Budget covers {total['segments_within_budget']}/{total['segments_to_send']} segments")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Translate website content using Lara SDK")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="lara", help="Translation backend (default: lara)")
     parser.add_argument("--source", default="en", help="Source language (default: en)")
     parser.add_argument("--target", help="Single target language (e.g., 'it')")
     parser.add_argument("--languages", help="Comma-separated target languages (e.g., 'es,it,fr')")
     parser.add_argument("--source-file", help="Source translation file")
-    parser.add_argument("--missing-only", action="store_true", help="Only translate missing keys (preserves existing translations)")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--missing-only", action="store_true", help="Only translate missing keys (preserves existing translations)")
+    modes.add_argument("--changed-only", action="store_true", help="Only translate keys added or edited in the source since the last run, and drop removed keys")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum number of translation requests in flight (default: 8)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Maximum segments per translation request (default: 50)")
+    parser.add_argument("--batch-chars", type=int, default=4000, help="Maximum characters per translation request (default: 4000)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Maximum provider requests per second (default: 10, 0 = unlimited)")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries for throttled, timed-out or 5xx requests (default: 5)")
+    parser.add_argument("--timeout-ms", type=int, default=5000, help="Per-request provider timeout in milliseconds (default: 5000)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from the translation journal")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local translation memory")
+    parser.add_argument("--cache-ttl-days", type=float, help="Ignore and evict translation memory entries older than this")
+    parser.add_argument("--fuzzy-reuse", type=float, default=0.95, help="Reuse an earlier translation whose source is at least this similar (default: 0.95)")
+    parser.add_argument("--fuzzy-hint", type=float, default=0.7, help="Save matches at least this similar as reviewer hints (default: 0.7)")
+    parser.add_argument("--no-fuzzy", action="store_true", help="Disable fuzzy translation memory matches")
+    parser.add_argument("--glossary", help="Glossary of do-not-translate and forced terms (default: localization/glossary.json)")
+    parser.add_argument("--no-glossary", action="store_true", help="Neither resolve nor check glossary terms")
+    parser.add_argument("--live-only", action="store_true", help="Only translate keys referenced by a page or script")
+    parser.add_argument("--plan", action="store_true", help="Only estimate requests, characters, cost and wall time; send nothing")
+    parser.add_argument("--max-chars", type=int, help="Stop sending once this many characters were sent")
+    parser.add_argument("--max-cost", type=float, help="Stop sending once this cost would be exceeded")
+    parser.add_argument("--price-per-million-chars", type=float, default=DEFAULT_PRICE_PER_MILLION_CHARS,
+                        help=f"Provider price for cost estimates and --max-cost (default: {DEFAULT_PRICE_PER_MILLION_CHARS})")
+    parser.add_argument("--watch", action="store_true", help="Keep running and retranslate keys as soon as en.json or a page changes (implies --changed-only)")
+    parser.add_argument("--debounce-ms", type=int, default=300, help="With --watch, wait this long after the last save before translating (default: 300)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="With --watch and no inotify, seconds between file checks (default: 0.5)")
+    parser.add_argument("--report", help="JSON run report (default: localization/telemetry/translate_website.json)")
+    parser.add_argument("--metrics-textfile", help="Also write the run metrics as a Prometheus textfile")
 
     args = parser.parse_args()
+    if args.watch:
+        if args.plan or args.missing_only:
+            parser.error("--watch cannot be combined with --plan or --missing-only")
+        args.changed_only = True
+    telemetry = start_run("translate_website")
 
     # Determine target languages
     if args.target:
@@ -169,73 +753,73 @@ def main():
     source_file = Path(args.source_file) if args.source_file else locales_dir / f"{args.source}.json"
 
     try:
-        mode = "missing keys only" if args.missing_only else "full translation"
-        logger.info(f"🌍 Starting {mode} with Lara SDK")
+        if args.missing_only:
+            mode = "missing keys only"
+        elif args.changed_only:
+            mode = "changed keys only"
+        else:
+            mode = "full translation"
+        logger.info(f"🌍 {'Planning' if args.plan else 'Starting'} {mode} with the {args.backend} backend")
         logger.info(f"📁 Using locales directory: {locales_dir}")
 
-        # Initialize Lara
-        lara = setup_lara()
-        logger.info("✅ Lara SDK initialized")
-
-        # Load source translations
-        logger.info(f"Loading source translations from {source_file}")
-        source_translations = load_translations(source_file)
-        logger.info(f"Loaded {len(source_translations)} source translation keys")
-
-        # Convert language codes
-        source_lang = convert_language_code(args.source)
-
-        # Translate to each target language
-        for target_lang_code in target_languages:
-            target_lang = convert_language_code(target_lang_code)
-            output_file = locales_dir / f"{target_lang_code}.json"
-
-            logger.info(f"\n{'='*40}")
-            logger.info(f"Translating {source_lang} → {target_lang}")
-            logger.info(f"Mode: {mode}")
-            logger.info(f"Output: {output_file}")
-            logger.info(f"{'='*40}")
-
-            if args.missing_only:
-                # Load existing target translations
-                existing_translations = load_translations(output_file)
-                logger.info(f"Loaded {len(existing_translations)} existing translations")
-
-                # Find missing keys
-                missing_keys = find_missing_keys(source_translations, existing_translations)
-
-                if not missing_keys:
-                    logger.info(f"✅ No missing keys found for {target_lang_code}. Translation is up to date!")
-                    continue
-
-                logger.info(f"Found {len(missing_keys)} missing keys to translate")
-                translations_to_process = missing_keys
-            else:
-                # Full translation mode
-                translations_to_process = source_translations
-
-            # Translate the keys
-            translated = {}
-            total = len(translations_to_process)
-
-            for i, (key, value) in enumerate(translations_to_process.items(), 1):
-                logger.info(f"[{i}/{total}] {key}")
-                translated[key] = translate_content(lara, value, source_lang, target_lang, key)
-
-            # Handle saving based on mode
-            if args.missing_only:
-                # Merge with existing translations
-                existing_translations = load_translations(output_file)
-                final_translations = merge_translations(existing_translations, translated)
-                logger.info(f"Merged {len(translated)} new translations with {len(existing_translations)} existing ones")
-            else:
-                # Full replacement
-                final_translations = translated
-
-            # Save translated file
-            save_translations(final_translations, output_file)
-            logger.info(f"✅ Saved translation to {output_file}")
-
+        # One shared backend client for every worker thread (a plan needs no credentials)
+        backend = None
+        if not args.plan:
+            backend = get_backend(args.backend)
+            logger.info(f"✅ {args.backend} backend initialized")
+
+        # Open the local translation memory (entries are kept per backend)
+        memory = None
+        if not args.no_cache:
+            memory = TranslationMemory(engine=args.backend, ttl_days=args.cache_ttl_days)
+            logger.info(f"📚 Using translation memory: {memory.db_path}")
+
+        # Close matches from the memory for lightly edited source strings
+        fuzzy = None
+        if memory and not args.no_fuzzy:
+            fuzzy = FuzzyMatcher(memory, reuse_threshold=args.fuzzy_reuse, hint_threshold=args.fuzzy_hint)
+
+        # Exact glossary terms never reach the provider (a missing glossary file is empty)
+        glossary = None
+        if not args.no_glossary:
+            glossary = Glossary.load(args.glossary)
+            logger.info(f"📖 Glossary: {len(glossary)} terms")
+
+        limiter = None
+        if not args.plan:
+            limiter = RateLimiter(rate=args.rate, max_concurrency=args.workers, max_retries=args.max_retries)
+
+        if args.watch:
+            watch_translations(args, mode, target_languages, source_file, locales_dir,
+                               backend=backend, memory=memory, fuzzy=fuzzy, limiter=limiter, glossary=glossary)
+        else:
+            run_translation(args, mode, target_languages, source_file, locales_dir,
+                            backend=backend, memory=memory, fuzzy=fuzzy, limiter=limiter, glossary=glossary)
+
+        if args.plan:
+            if memory:
+                memory.close()
+            return
+
+        stats = limiter.stats()
+        telemetry.add_counters("provider", stats)
+        logger.info(f"📡 Provider: {stats['requests']} requests, {stats['retries']} retries "
+                    f"({stats['throttled']} throttled, {stats['timeouts']} timeouts), "
+                    f"{stats['failures']} failures, {stats['fallbacks']} segments fell back to source")
+
+        if fuzzy:
+            telemetry.add_counters("fuzzy", {"reused": fuzzy.reused, "hinted": fuzzy.hinted})
+            logger.info(f"🔎 Fuzzy matches: {fuzzy.reused} segments reused, {fuzzy.hinted} saved as reviewer hints")
+
+        if memory:
+            memory.evict()
+            stats = memory.stats()
+            telemetry.add_counters("translation_memory", stats)
+            logger.info(f"📚 Translation memory: {stats['hits']} hits, {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%} hit rate), {stats['stores']} new entries")
+            memory.close()
+
+        finish_run(args.report, args.metrics_textfile)
         logger.info(f"\n🎉 Translation complete! Translated to: {', '.join(target_languages)}")
 
     except Exception as e:
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Persistent translation memory for translate_website.py
+
+Stores every provider translation in a local SQLite file, keyed by a hash of
+the normalized source text, the language pair and the translation engine, so
+unchanged strings are never paid for twice. Every key whose value used a
+text is recorded with it (deduplicated segments share one entry), so
+invalidating a key drops the entry of each of its texts.
+
+Usage:
+    python translation_memory.py --stats
+    python translation_memory.py --invalidate-key about-intro
+    python translation_memory.py --invalidate-lang it
+    python translation_memory.py --evict --ttl-days 90 --max-entries 50000
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from path_utils import get_localization_dir
+
+DEFAULT_DB_NAME = "translation_memory.sqlite3"
+# Recency updates of cache hits are committed in batches of this many (and on close)
+TOUCH_COMMIT_INTERVAL = 256
+
+
+def normalize_text(text):
+    """Normalize source text so cosmetic whitespace edits still hit the cache"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def as_keys(keys):
+    """A key, a list of keys or None as a list"""
+    if keys is None:
+        return []
+    if isinstance(keys, str):
+        return [keys]
+    return list(dict.fromkeys(keys))
+
+
+def memory_key(text, source_lang, target_lang, engine):
+    """Hash identifying one (source text, language pair, engine) entry"""
+    raw = "\0".join([engine, source_lang, target_lang, normalize_text(text)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite-backed translation memory with hit/miss stats, TTL and size-based eviction"""
+
+    def __init__(self, db_path=None, engine="lara", ttl_days=None, max_entries=None):
+        self.db_path = db_path or get_localization_dir() / DEFAULT_DB_NAME
+        self.engine = engine
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._touches = 0
+
+        # Worker threads share one connection; the lock serializes access
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                hash TEXT PRIMARY KEY,
+                source_text TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                key TEXT,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        # Every key that uses an entry's text; translations.key only holds the first one
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translation_keys (
+                hash TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (hash, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_key ON translations (key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_target ON translations (target_lang)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translation_keys_key ON translation_keys (key)")
+        # Memories written before the keys table existed
+        self._conn.execute(
+            "INSERT OR IGNORE INTO translation_keys (hash, key) SELECT hash, key FROM translations WHERE key IS NOT NULL"
+        )
+        self._conn.commit()
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def lookup(self, text, source_lang, target_lang, keys=None):
+        """Return the stored translation, or None on a miss; a hit is recorded for `keys` too"""
+        entry_hash = memory_key(text, source_lang, target_lang, self.engine)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation, created_at FROM translations WHERE hash = ?", (entry_hash,)
+            ).fetchone()
+
+            if row is None or self._is_expired(row[1], now):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE translations SET last_used_at = ?, hit_count = hit_count + 1 WHERE hash = ?",
+                (now, entry_hash),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO translation_keys (hash, key) VALUES (?, ?)",
+                [(entry_hash, key) for key in as_keys(keys)],
+            )
+            # Recency drives LRU eviction, so it must reach the file, but not one commit per hit
+            self._touches += 1
+            if self._touches >= TOUCH_COMMIT_INTERVAL:
+                self._conn.commit()
+                self._touches = 0
+            self.hits += 1
+            return row[0]
+
+    def entries(self, source_lang, target_lang):
+        """All unexpired (source text, translation) pairs for a language pair"""
+        cutoff = time.time() - self.ttl_seconds if self.ttl_seconds is not None else 0
+        with self._lock:
+            return self._conn.execute(
+                """
+                SELECT source_text, translation FROM translations
+                WHERE source_lang = ? AND target_lang = ? AND engine = ? AND created_at >= ?
+                """,
+                (source_lang, target_lang, self.engine, cutoff),
+            ).fetchall()
+
+    def store(self, text, source_lang, target_lang, translation, key=None):
+        """Store (or refresh) a translation"""
+        self.store_many([(text, translation, key)], source_lang, target_lang)
+
+    def store_many(self, entries, source_lang, target_lang):
+        """
+        Store [(text, translation, key or [keys]), ...] for one language pair in a
+        single transaction
+        """
+        now = time.time()
+        rows = []
+        key_rows = []
+        for text, translation, keys in entries:
+            entry_hash = memory_key(text, source_lang, target_lang, self.engine)
+            keys = as_keys(keys)
+            rows.append((entry_hash, text, source_lang, target_lang, self.engine, translation,
+                         keys[0] if keys else None, now, now))
+            key_rows.extend((entry_hash, key) for key in keys)
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO translations
+                    (hash, source_text, source_lang, target_lang, engine, translation, key, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO translation_keys (hash, key) VALUES (?, ?)", key_rows)
+            self._conn.commit()
+            self._touches = 0
+            self.stores += len(rows)
+
+    def invalidate(self, key=None, language=None):
+        """Delete entries for a key and/or a target language ('it' or 'it-IT'); returns the count"""
+        clauses = []
+        params = []
+        if key:
+            clauses.append("hash IN (SELECT hash FROM translation_keys WHERE key = ?)")
+            params.append(key)
+        if language:
+            clauses.append("(target_lang = ? OR target_lang LIKE ?)")
+            params.extend([language, f"{language}-%"])
+        if not clauses:
+            raise ValueError("Specify a key and/or a language to invalidate")
+
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM translations WHERE {' AND '.join(clauses)}", params)
+            self._drop_orphan_keys()
+            self._conn.commit()
+            self._touches = 0
+            return cursor.rowcount
+
+    def _drop_orphan_keys(self):
+        """Delete key rows of deleted entries; call with the lock held"""
+        self._conn.execute("DELETE FROM translation_keys WHERE hash NOT IN (SELECT hash FROM translations)")
+
+    def evict(self):
+        """Apply the TTL and max-entries policies; returns the number of evicted entries"""
+        evicted = 0
+
+        with self._lock:
+            if self.ttl_seconds is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                )
+                evicted += cursor.rowcount
+
+            if self.max_entries is not None:
+                # Least recently used entries go first
+                cursor = self._conn.execute(
+                    """
+                    DELETE FROM translations WHERE hash IN (
+                        SELECT hash FROM translations ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+                evicted += cursor.rowcount
+
+            self._drop_orphan_keys()
+            self._conn.commit()
+            self._touches = 0
+
+        return evicted
+
+    def stats(self):
+        """Session hit/miss counters plus stored entries per target language"""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            per_language = dict(self._conn.execute(
+                "SELECT target_lang, COUNT(*) FROM translations GROUP BY target_lang ORDER BY target_lang"
+            ).fetchall())
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": total,
+            "entries_per_language": per_language,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            # Keep the recency of this session's hits
+            self._conn.commit()
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and maintain the translation memory")
+    parser.add_argument("--db", help=f"Database file (default: localization/{DEFAULT_DB_NAME})")
+    parser.add_argument("--stats", action="store_true", help="Show stored entries per language")
+    parser.add_argument("--invalidate-key", help="Delete the entries of every text a translation key used")
+    parser.add_argument("--invalidate-lang", help="Delete all entries for a target language")
+    parser.add_argument("--evict", action="store_true", help="Apply the TTL / max-entries policies")
+    parser.add_argument("--ttl-days", type=float, help="Entries older than this are evicted")
+    parser.add_argument("--max-entries", type=int, help="Keep at most this many entries (least recently used go first)")
+
+    args = parser.parse_args()
+
+    memory = TranslationMemory(args.db, ttl_days=args.ttl_days, max_entries=args.max_entries)
+
+    if args.invalidate_key or args.invalidate_lang:
+        removed = memory.invalidate(key=args.invalidate_key, language=args.invalidate_lang)
+        print(f"🗑️  Invalidated {removed} entries")
+
+    if args.evict:
+        print(f"🧹 Evicted {memory.evict()} entries")
+
+    if args.stats or not (args.invalidate_key or args.invalidate_lang or args.evict):
+        stats = memory.stats()
+        print(f"📚 Translation memory: {memory.db_path}")
+        print(f"   {stats['entries']} entries")
+        for language, count in stats["entries_per_language"].items():
+            print(f"   {language}: {count}")
+
+    memory.close()
+
+
+if __name__ == "__main__":
+    main()
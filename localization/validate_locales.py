@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Cross-locale QA gate
+
+Checks every locale file against the source (en.json):
+
+    missing_key / extra_key   key parity
+    type                      a string where the source has a list, or the reverse
+    placeholder               {count}-style placeholders differ from the source
+    html                      unbalanced tags, or tags that differ from the source
+                              (translator.js injects values with innerHTML)
+    list_length               list values (e.g. multilingual-typed) differ in length
+    length_ratio              translation much longer/shorter than the language's usual ratio
+    glossary                  a do-not-translate or forced term was lost (see glossary.py)
+
+The first six are errors: the run exits non-zero and, unless --no-queue,
+the keys with a broken value are marked stale in the source manifest, so
+the next `translate_website.py --changed-only` retranslates just those
+keys. Length outliers and glossary drift are warnings (errors with
+--strict). Files are checked in parallel worker processes, and a
+machine-readable report is written to localization/qa_report.json;
+languages not checked this time keep their findings from the last report.
+
+Usage:
+    python validate_locales.py
+    python validate_locales.py --languages es,it,fr --workers 4
+    python validate_locales.py --strict --report /tmp/qa.json --no-queue
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+
+from file_utils import atomic_write_json
+from glossary import Glossary, format_violation
+from locale_store import LocaleStore
+from path_utils import get_locales_dir, get_localization_dir
+from source_manifest import load_manifest, mark_stale, save_manifest
+
+REPORT_NAME = "qa_report.json"
+
+PLACEHOLDER = re.compile(r"\{[A-Za-z0-9_]+\}")
+TAG = re.compile(r"<\s*(/?)\s*([A-Za-z][A-Za-z0-9-]*)\b[^>]*?(/?)\s*>")
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# Broken values that a retranslation fixes; missing keys are picked up by
+# --changed-only and extra keys dropped by it anyway
+RETRANSLATE_CHECKS = ("type", "placeholder", "html", "list_length")
+
+# Length ratios are only judged for source strings at least this long
+MIN_RATIO_CHARS = 20
+DEFAULT_MAX_RATIO_DEVIATION = 2.5
+
+
+def get_report_path():
+    """Get the absolute path to the QA report"""
+    return get_localization_dir() / REPORT_NAME
+
+
+def placeholders(text):
+    return Counter(PLACEHOLDER.findall(text))
+
+
+def html_tags(text):
+    """(Counter of opening tag names, problem or None) for the tags in `text`"""
+    opened = Counter()
+    stack = []
+    for closing, name, self_closing in TAG.findall(text):
+        name = name.lower()
+        if name in VOID_TAGS or self_closing:
+            opened[name] += not closing
+            continue
+        if not closing:
+            opened[name] += 1
+            stack.append(name)
+        elif not stack or stack[-1] != name:
+            return opened, f"unexpected </{name}>"
+        else:
+            stack.pop()
+    if stack:
+        return opened, f"<{stack[-1]}> is never closed"
+    return opened, None
+
+
+def issue(key, check, message, severity="error", index=None):
+    """One finding; `index` is the position inside a list value, else None"""
+    return {"key": key, "check": check, "severity": severity, "message": message, "index": index}
+
+
+def check_text(key, source, translation, index=None):
+    """Placeholder and HTML issues of one translated string"""
+    issues = []
+    if placeholders(source) != placeholders(translation):
+        expected = sorted(placeholders(source).elements())
+        found = sorted(placeholders(translation).elements())
+        issues.append(issue(key, "placeholder", f"placeholders {found} != source {expected}", index=index))
+
+    source_tags, _ = html_tags(source)
+    tags, problem = html_tags(translation)
+    if problem:
+        issues.append(issue(key, "html", problem, index=index))
+    elif tags != source_tags:
+        issues.append(issue(key, "html", f"tags {sorted(tags.elements())} != source {sorted(source_tags.elements())}",
+                            index=index))
+    return issues
+
+
+def check_value(key, source, value):
+    """Every error-level issue of one locale value against its source value"""
+    if isinstance(source, list) != isinstance(value, list):
+        return [issue(key, "type", f"{type(value).__name__} where the source has a {type(source).__name__}")]
+
+    if isinstance(source, list) and len(source) != len(value):
+        return [issue(key, "list_length", f"{len(value)} items, source has {len(source)}")]
+
+    issues = []
+    if isinstance(source, list):
+        for index, (source_item, item) in enumerate(zip(source, value)):
+            if isinstance(source_item, str) and isinstance(item, str):
+                issues.extend(check_text(key, source_item, item, index))
+    elif isinstance(source, str) and isinstance(value, str):
+        issues.extend(check_text(key, source, value))
+    return issues
+
+
+def length_outliers(source_translations, translations, max_deviation=DEFAULT_MAX_RATIO_DEVIATION):
+    """
+    Keys whose length ratio to the source is more than `max_deviation` times above or
+    below the language's median ratio (scripts like Chinese are simply shorter)
+    """
+    ratios = {}
+    for key, source in source_translations.items():
+        value = translations.get(key)
+        if isinstance(source, str) and isinstance(value, str) and len(source) >= MIN_RATIO_CHARS:
+            ratios[key] = len(value) / len(source)
+    if not ratios:
+        return []
+
+    usual = median(ratios.values())
+    issues = []
+    for key, ratio in ratios.items():
+        deviation = ratio / usual if usual else 1.0
+        if not ratio or deviation > max_deviation or deviation < 1 / max_deviation:
+            issues.append(issue(key, "length_ratio", f"length ratio {ratio:.2f} vs usual {usual:.2f}",
+                                severity="warning"))
+    return issues
+
+
+def validate_locale(lang, source_translations, translations, glossary=None,
+                    max_deviation=DEFAULT_MAX_RATIO_DEVIATION, strict=False):
+    """All issues of one locale, in source key order"""
+    issues = []
+    for key, source in source_translations.items():
+        if key not in translations:
+            issues.append(issue(key, "missing_key", "missing from the locale"))
+        else:
+            issues.extend(check_value(key, source, translations[key]))
+    issues.extend(issue(key, "extra_key", "not in the source") for key in translations if key not in source_translations)
+
+    issues.extend(length_outliers(source_translations, translations, max_deviation))
+
+    if glossary:
+        for violation in glossary.check_locale(source_translations, translations, lang):
+            issues.append(issue(violation.key, "glossary", format_violation(violation).split(": ", 1)[1],
+                                severity="warning"))
+
+    if strict:
+        for found in issues:
+            found["severity"] = "error"
+    return issues
+
+
+def validate_snapshot(lang, source, locales_dir, snapshot_path, glossary=None,
+                      max_deviation=DEFAULT_MAX_RATIO_DEVIATION, strict=False):
+    """
+    validate_locale() for one language of a saved locale store; runs in a worker
+    process, which maps the same snapshot instead of being sent the locales
+    """
+    store = LocaleStore(locales_dir, snapshot_path)
+    store.load_snapshot()
+    return validate_locale(lang, store.locale(source), store.locale(lang), glossary, max_deviation, strict)
+
+
+def keys_to_retranslate(issues):
+    """Keys whose current value is broken (see RETRANSLATE_CHECKS)"""
+    return sorted({found["key"] for found in issues if found["check"] in RETRANSLATE_CHECKS})
+
+
+def queue_retranslation(failing_keys, manifest_path=None):
+    """Mark {lang: [key, ...]} stale, so the next --changed-only run retranslates them"""
+    failing_keys = {lang: keys for lang, keys in failing_keys.items() if keys}
+    if not failing_keys:
+        return
+    manifest = load_manifest(manifest_path)
+    for lang, keys in failing_keys.items():
+        mark_stale(manifest, lang, keys)
+    save_manifest(manifest, manifest_path)
+
+
+def load_report(path=None):
+    """The last QA report, or {} if there is none"""
+    try:
+        with open(path or get_report_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def merge_findings(previous, issues_by_language, queued, languages):
+    """
+    Findings of the `previous` report, with the languages validated now replaced by
+    their new `issues_by_language` and `queued` keys. Earlier findings are only kept
+    for `languages` that still exist. Returns (issues_by_language, queued).
+    """
+    kept = {lang for lang in previous.get("languages", {}) if lang in languages and lang not in issues_by_language}
+    issues = {lang: previous["languages"][lang]["issues"] for lang in kept}
+    issues.update(issues_by_language)
+    merged_queued = {lang: keys for lang, keys in previous.get("queued", {}).items() if lang in kept}
+    merged_queued.update({lang: keys for lang, keys in queued.items() if keys})
+    return issues, merged_queued
+
+
+def build_report(source, issues_by_language, queued):
+    languages = {}
+    for lang, issues in sorted(issues_by_language.items()):
+        languages[lang] = {
+            "errors": sum(1 for found in issues if found["severity"] == "error"),
+            "warnings": sum(1 for found in issues if found["severity"] == "warning"),
+            "issues": issues,
+        }
+    return {
+        "source": source,
+        "errors": sum(result["errors"] for result in languages.values()),
+        "warnings": sum(result["warnings"] for result in languages.values()),
+        "failed_languages": [lang for lang, result in languages.items() if result["errors"]],
+        "queued": queued,
+        "languages": languages,
+    }
+
+
+def validate_locales(languages, source="en", locales_dir=None, glossary=None, workers=None,
+                     max_deviation=DEFAULT_MAX_RATIO_DEVIATION, strict=False):
+    """Validate locales in parallel worker processes; returns {lang: [issue, ...]}"""
+    store = LocaleStore.open(locales_dir)
+    source_translations = store.locale(source)
+    missing = {lang: [issue(None, "file", f"no {lang}.json in {store.locales_dir}")]
+               for lang in languages if lang not in store}
+    languages = [lang for lang in languages if lang in store]
+
+    workers = min(workers or os.cpu_count() or 1, len(languages) or 1)
+    if workers <= 1:
+        results = {lang: validate_locale(lang, source_translations, store.locale(lang), glossary, max_deviation, strict)
+                   for lang in languages}
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {lang: executor.submit(validate_snapshot, lang, source, store.locales_dir, store.snapshot_path,
+                                             glossary, max_deviation, strict)
+                       for lang in languages}
+            results = {lang: future.result() for lang, future in futures.items()}
+    return {**results, **missing}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every locale file against the source locale")
+    parser.add_argument("--languages", help="Comma-separated languages (default: every locale file)")
+    parser.add_argument("--source", default="en", help="Source language (default: en)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--max-ratio-deviation", type=float, default=DEFAULT_MAX_RATIO_DEVIATION,
+                        help=f"Flag length ratios this many times off the language's median (default: {DEFAULT_MAX_RATIO_DEVIATION})")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings (length outliers, glossary drift) as errors")
+    parser.add_argument("--no-glossary", action="store_true", help="Skip the glossary check")
+    parser.add_argument("--no-queue", action="store_true", help="Do not mark failing keys for retranslation")
+    parser.add_argument("--report", help="JSON report (default: localization/qa_report.json)")
+
+    args = parser.parse_args()
+    locales_dir = get_locales_dir()
+
+    if args.languages:
+        languages = [lang.strip() for lang in args.languages.split(',') if lang.strip()]
+    else:
+        languages = sorted(path.stem for path in locales_dir.glob("*.json") if path.stem != args.source)
+
+    glossary = None if args.no_glossary else Glossary.load()
+    print(f"🔍 Validating {len(languages)} locales against {args.source}.json")
+    issues_by_language = validate_locales(languages, args.source, locales_dir, glossary, args.workers,
+                                          args.max_ratio_deviation, args.strict)
+
+    queued = {lang: keys_to_retranslate(issues) for lang, issues in issues_by_language.items()}
+    queued = {lang: keys for lang, keys in queued.items() if keys}
+    if queued and not args.no_queue:
+        queue_retranslation(queued)
+
+    # Languages not validated this time keep their findings from the last report
+    report_path = args.report or get_report_path()
+    all_issues, all_queued = merge_findings(load_report(report_path), issues_by_language,
+                                            queued if not args.no_queue else {},
+                                            [path.stem for path in locales_dir.glob("*.json")])
+    atomic_write_json(build_report(args.source, all_issues, all_queued), report_path)
+
+    report = build_report(args.source, issues_by_language, queued)
+    for lang, result in report["languages"].items():
+        if not result["issues"]:
+            continue
+        print(f"  {'❌' if result['errors'] else '⚠️ '} {lang}: {result['errors']} errors, {result['warnings']} warnings")
+        for found in result["issues"]:
+            where = f"{found['key']}[{found['index']}]" if found["index"] is not None else found["key"]
+            print(f"     {found['severity']:7} {found['check']:12} {where}: {found['message']}")
+
+    print(f"📄 Report: {report_path}")
+    if queued and not args.no_queue:
+        print(f"🔁 Queued {sum(len(keys) for keys in queued.values())} keys for retranslation: "
+              f"python translate_website.py --changed-only --languages {','.join(queued)}")
+
+    if report["errors"]:
+        print(f"❌ {report['errors']} errors in {len(report['failed_languages'])} locales")
+        sys.exit(1)
+    print(f"✅ All locales passed ({report['warnings']} warnings)")
+
+
+if __name__ == "__main__":
+    main()
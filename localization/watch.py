@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+File watching for translate_website.py --watch
+
+FileWatcher waits for changes to a set of files. It uses inotify when the
+optional `inotify_simple` package is installed (pip install inotify_simple)
+and falls back to polling modification times otherwise. Parent directories
+are watched rather than the files themselves, so editors that save by
+writing a temp file and renaming it over the original are still seen.
+
+watch() debounces bursts of events (an editor's save, a formatter run
+right after it) into one callback with every path that changed.
+"""
+
+import time
+from pathlib import Path
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # Optional: polling is used without it
+    INotify = None
+
+
+class FileWatcher:
+    """Blocks until one of `paths` is written, created or renamed into place"""
+
+    def __init__(self, paths, poll_interval=0.5, use_inotify=True):
+        self.paths = {Path(path).resolve() for path in paths}
+        self.poll_interval = poll_interval
+        self._inotify = None
+        self._directories = {}
+
+        if INotify and use_inotify:
+            self._inotify = INotify()
+            mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+            for directory in sorted({path.parent for path in self.paths}):
+                self._directories[self._inotify.add_watch(str(directory), mask)] = directory
+        else:
+            self._stats = self._snapshot()
+
+    @property
+    def method(self):
+        return "inotify" if self._inotify else "polling"
+
+    def _snapshot(self):
+        stats = {}
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                stats[path] = None
+        return stats
+
+    def _wait_inotify(self, deadline):
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            events = self._inotify.read(timeout=None if remaining is None else int(remaining * 1000))
+            changed = {self._directories[event.wd] / event.name for event in events
+                       if event.wd in self._directories} & self.paths
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def _wait_polling(self, deadline):
+        while True:
+            current = self._snapshot()
+            changed = {path for path in self.paths if current[path] != self._stats[path]}
+            self._stats = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.monotonic())
+            time.sleep(max(0.0, delay))
+
+    def wait(self, timeout=None):
+        """Paths that changed, as soon as any did; an empty set if `timeout` seconds pass first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._inotify:
+            return self._wait_inotify(deadline)
+        return self._wait_polling(deadline)
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+
+
+def watch(watcher, on_change, debounce=0.3):
+    """
+    Call `on_change(changed_paths)` for every burst of changes, once no further
+    change arrived for `debounce` seconds. Runs until interrupted.
+    """
+    while True:
+        changed = watcher.wait()
+        while True:
+            more = watcher.wait(timeout=debounce)
+            if not more:
+                break
+            changed |= more
+        on_change(changed)